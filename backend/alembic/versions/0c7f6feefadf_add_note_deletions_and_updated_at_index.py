@@ -0,0 +1,33 @@
+"""add note deletions and updated_at index
+
+Revision ID: 0c7f6feefadf
+Revises: 5ff7e1979411
+Create Date: 2026-10-17 21:09:39.741955
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c7f6feefadf'
+down_revision = '5ff7e1979411'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Ordering of the changes feed, so a resync is an index range scan
+    op.create_index('ix_notes_updated_at_id', 'notes', ['updated_at', 'id'], unique=False)
+    op.create_table('note_deletions',
+    sa.Column('note_id', sa.Uuid(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('note_id')
+    )
+    op.create_index('ix_note_deletions_deleted_at_note_id', 'note_deletions', ['deleted_at', 'note_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_note_deletions_deleted_at_note_id', table_name='note_deletions')
+    op.drop_table('note_deletions')
+    op.drop_index('ix_notes_updated_at_id', table_name='notes')
@@ -0,0 +1,52 @@
+"""add list and category link indexes
+
+Revision ID: 3056774476b6
+Revises: 0c7f6feefadf
+Create Date: 2026-10-17 21:29:42.158379
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3056774476b6'
+down_revision = '0c7f6feefadf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filtered list pages (archived=...) ordered by (created_at DESC, id DESC);
+    # supersedes the single-column is_archived index
+    op.create_index(
+        'ix_notes_is_archived_created_at_id',
+        'notes',
+        ['is_archived', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+    op.drop_index('ix_notes_is_archived', table_name='notes')
+    # Count and latest update of active notes, behind the list ETag
+    op.create_index(
+        'ix_notes_active_updated_at_id',
+        'notes',
+        ['updated_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('is_archived = false'),
+        sqlite_where=sa.text('is_archived = 0')
+    )
+    # Links by category (category filter, category deletes); the primary key
+    # only serves lookups by note
+    op.create_index(
+        'ix_note_categories_category_id_note_id',
+        'note_categories',
+        ['category_id', 'note_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_note_categories_category_id_note_id', table_name='note_categories')
+    op.drop_index('ix_notes_active_updated_at_id', table_name='notes')
+    op.create_index('ix_notes_is_archived', 'notes', ['is_archived'], unique=False)
+    op.drop_index('ix_notes_is_archived_created_at_id', table_name='notes')
@@ -0,0 +1,25 @@
+"""add notes keyset pagination index
+
+Revision ID: 31f3a65875b6
+Revises: d89e95d9e461
+Create Date: 2026-10-17 20:41:04.318484
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '31f3a65875b6'
+down_revision = 'd89e95d9e461'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches the ORDER BY of the notes list so each page is an index range scan
+    op.create_index('ix_notes_created_at_id', 'notes', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_created_at_id', table_name='notes')
@@ -0,0 +1,42 @@
+"""add category note counts
+
+Revision ID: 5ff7e1979411
+Revises: 733ccb668d0f
+Create Date: 2026-10-17 20:58:14.652849
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5ff7e1979411'
+down_revision = '733ccb668d0f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('category_note_counts',
+    sa.Column('category_id', sa.Uuid(), nullable=False),
+    sa.Column('active_count', sa.Integer(), nullable=False),
+    sa.Column('archived_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('category_id')
+    )
+    # Backfill from the existing links
+    op.execute(
+        """
+        INSERT INTO category_note_counts (category_id, active_count, archived_count)
+        SELECT nc.category_id,
+               SUM(CASE WHEN n.is_archived THEN 0 ELSE 1 END),
+               SUM(CASE WHEN n.is_archived THEN 1 ELSE 0 END)
+        FROM note_categories nc
+        JOIN notes n ON n.id = nc.note_id
+        GROUP BY nc.category_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('category_note_counts')
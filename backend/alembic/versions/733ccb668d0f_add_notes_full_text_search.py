@@ -0,0 +1,76 @@
+"""add notes full text search
+
+Revision ID: 733ccb668d0f
+Revises: 31f3a65875b6
+Create Date: 2026-10-17 20:45:47.036276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '733ccb668d0f'
+down_revision = '31f3a65875b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            ALTER TABLE notes ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(content, '')), 'B')
+            ) STORED
+            """
+        )
+        op.execute("CREATE INDEX ix_notes_search_vector ON notes USING GIN (search_vector)")
+    elif op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE notes_fts USING fts5(
+                title, content, content='notes', content_rowid='rowid'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_fts(rowid, title, content)
+                VALUES (new.rowid, new.title, new.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER notes_fts_delete AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_fts(notes_fts, rowid, title, content)
+                VALUES ('delete', old.rowid, old.title, old.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN
+                INSERT INTO notes_fts(notes_fts, rowid, title, content)
+                VALUES ('delete', old.rowid, old.title, old.content);
+                INSERT INTO notes_fts(rowid, title, content)
+                VALUES (new.rowid, new.title, new.content);
+            END
+            """
+        )
+        op.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_notes_search_vector", table_name="notes")
+        op.drop_column("notes", "search_vector")
+    elif op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS notes_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS notes_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS notes_fts_insert")
+        op.execute("DROP TABLE IF EXISTS notes_fts")
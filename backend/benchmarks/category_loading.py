@@ -0,0 +1,135 @@
+"""
+Category loading benchmark: joined vs selectin vs noload for Note.categories.
+
+For notes carrying 0, 5 and 20 categories each, loads a page of notes and a
+single note with every strategy and reports the statements issued, the size
+of the result sets the database sent back and the best wall-clock time.
+Joined loading repeats each note row (content included) once per category,
+which is what the result size column makes visible.
+
+Result sizes are measured by replaying the captured statements on the raw
+DBAPI connection and summing the length of every value fetched, so they
+approximate the payload on the wire without protocol overhead.
+
+Usage (from the backend directory):
+    python -m benchmarks.category_loading [NOTES]
+    
+NOTES (notes per page, default 200). DATABASE_URL is honoured; without it a
+throwaway SQLite database is used. Existing notes and categories are deleted.
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Tuple
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="category_loading_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'category_loading.db')}"
+
+from sqlalchemy import delete, insert
+
+from config.database import SessionLocal, engine, init_db
+from config.instrumentation import QueryCounter
+from models import Category, Note, note_categories
+from repositories.note_repository import NoteRepository
+
+
+CATEGORIES_PER_NOTE = [0, 5, 20]
+STRATEGIES = ["joined", "selectin", "noload"]
+CONTENT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 32
+REPEAT = 5
+
+
+def _value_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return len(str(value).encode())
+
+
+def result_bytes(counter: QueryCounter) -> int:
+    """Replay recorded statements on a raw connection and sum the size of their results"""
+    total = 0
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for statement, parameters in zip(counter.statements, counter.parameters):
+            cursor.execute(statement, parameters)
+            total += sum(_value_size(value) for row in cursor.fetchall() for value in row)
+        cursor.close()
+    finally:
+        connection.close()
+    return total
+
+
+def seed(db, notes: int, per_note: int) -> List[uuid.UUID]:
+    """Replace all data with `notes` notes linked to `per_note` categories each"""
+    db.execute(delete(note_categories))
+    db.execute(delete(Note))
+    db.execute(delete(Category))
+    categories = [
+        {"id": uuid.uuid4(), "name": f"Category {i}", "color": "#336699"}
+        for i in range(per_note)
+    ]
+    if categories:
+        db.execute(insert(Category), categories)
+    start = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": f"Note {i}",
+            "content": CONTENT,
+            "is_archived": False,
+            "created_at": start - timedelta(seconds=i),
+            "updated_at": start - timedelta(seconds=i),
+        }
+        for i in range(notes)
+    ]
+    db.execute(insert(Note), rows)
+    links = [{"note_id": row["id"], "category_id": category["id"]} for row in rows for category in categories]
+    if links:
+        db.execute(insert(note_categories), links)
+    db.commit()
+    return [row["id"] for row in rows]
+
+
+def measure(db, load: Callable) -> Tuple[int, int, float]:
+    """Statements, result bytes and best time (ms) of a load"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        db.expunge_all()
+        with QueryCounter(engine) as counter:
+            started = time.perf_counter()
+            load()
+            best = min(best, time.perf_counter() - started)
+    return counter.count, result_bytes(counter), best * 1000
+
+
+def main(argv: List[str]) -> int:
+    notes = int(argv[0]) if argv else 200
+    init_db()
+    print(f"{'query':<10} {'cats/note':>9} {'strategy':<9} {'stmts':>5} {'result KiB':>10} {'best ms':>8}")
+    with SessionLocal() as db:
+        repo = NoteRepository(db)
+        for per_note in CATEGORIES_PER_NOTE:
+            note_ids = seed(db, notes, per_note)
+            for strategy in STRATEGIES:
+                queries = [
+                    (f"page {notes}", lambda: repo.get_page(limit=notes, loading=strategy)),
+                    ("one note", lambda: repo.get_by_id(note_ids[0], loading=strategy)),
+                ]
+                for name, load in queries:
+                    statements, size, elapsed = measure(db, load)
+                    print(
+                        f"{name:<10} {per_note:>9} {strategy:<9} {statements:>5} "
+                        f"{size / 1024:>10.1f} {elapsed:>8.2f}"
+                    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
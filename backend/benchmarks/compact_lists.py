@@ -0,0 +1,92 @@
+"""
+Compact list benchmark: embedded categories versus include=categories.
+
+Seeds a dataset where notes share a small set of categories (see
+benchmarks.seed) and renders one page holding all notes both ways, in the
+full and the summary view:
+
+  embedded  get_page_rows() (notes LEFT JOIN categories) -> note_payloads()
+            -> every note carries full category objects
+  compact   get_page_rows() without categories + get_category_links() +
+            CategoryRepository.get_rows_by_ids()
+            -> category_ids per note, each category sent once
+            
+Reports the best end-to-end time (queries, payload building, orjson) and
+the body size of each.
+
+Usage (from the backend directory):
+    python -m benchmarks.compact_lists [NOTES ...]
+    
+NOTES defaults to 1000 10000. DATABASE_URL is honoured; without it a
+throwaway SQLite database is used. Existing notes and categories are deleted.
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="compact_lists_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'compact_lists.db')}"
+
+from benchmarks.seed import seed
+from config.database import SessionLocal, init_db
+from repositories.category_repository import CategoryRepository
+from repositories.note_repository import NoteRepository
+from routers.responses import ORJSONResponse
+from services.note_service import NoteService
+from services.payloads import NOTE_VIEWS, note_payloads
+
+
+DEFAULT_SIZES = [1000, 10000]
+CATEGORIES = 20
+REPEAT = 5
+
+
+def render_embedded(db, size: int, view: str) -> bytes:
+    """Render the page with categories embedded in every note"""
+    fields = NOTE_VIEWS[view]
+    notes = note_payloads(NoteRepository(db).get_page_rows(limit=size, fields=fields), fields)
+    return ORJSONResponse(NoteService.page_payload(notes, size, None, None)).body
+
+
+def render_compact(db, size: int, view: str) -> bytes:
+    """Render the page with include=categories"""
+    repo = NoteRepository(db)
+    fields = tuple(field for field in NOTE_VIEWS[view] if field != "categories")
+    page = NoteService.page_payload(note_payloads(repo.get_page_rows(limit=size, fields=fields), fields), size, None, None)
+    links = repo.get_category_links([note["id"] for note in page["notes"]])
+    category_rows = CategoryRepository(db).get_rows_by_ids({category_id for _, category_id in links})
+    return ORJSONResponse(NoteService.compact_page(page, links, category_rows)).body
+
+
+def timed(render: Callable, db, size: int, view: str) -> Tuple[float, int]:
+    """Best wall-clock time of REPEAT runs, and the body size"""
+    best, body = float("inf"), b""
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        body = render(db, size, view)
+        best = min(best, time.perf_counter() - started)
+    return best, len(body)
+
+
+def main(argv: List[str]) -> int:
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    init_db()
+    print(f"{'notes':>7} {'view':<8} {'embedded ms':>12} {'compact ms':>11} {'embedded KiB':>13} {'compact KiB':>12}")
+    with SessionLocal() as db:
+        for size in sizes:
+            seed(db, size, CATEGORIES)
+            for view in NOTE_VIEWS:
+                embedded_time, embedded_size = timed(render_embedded, db, size, view)
+                compact_time, compact_size = timed(render_compact, db, size, view)
+                print(
+                    f"{size:>7} {view:<8} {embedded_time * 1000:>12.1f} {compact_time * 1000:>11.1f} "
+                    f"{embedded_size / 1024:>13.0f} {compact_size / 1024:>12.0f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
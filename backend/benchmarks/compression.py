@@ -0,0 +1,90 @@
+"""
+Response compression benchmark: CPU cost against bytes saved.
+
+Seeds a dataset (see benchmarks.seed), renders GET /api/notes pages of
+several sizes exactly as the API does, and compresses each with every
+available coding at a few levels. Reports the compressed size, ratio,
+best compression time and the CPU spent per KiB saved. br and zstd are
+only measured when the brotli / zstandard packages are installed.
+
+Usage (from the backend directory):
+    python -m benchmarks.compression [NOTES]
+    
+NOTES defaults to 2000. DATABASE_URL is honoured; without it a throwaway
+SQLite database is used. Existing notes and categories are deleted.
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="compression_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'compression.db')}"
+
+from benchmarks.seed import seed
+from config.compression import build_encoders
+from config.database import SessionLocal, init_db
+from repositories.note_repository import NoteRepository
+from routers.responses import ORJSONResponse
+from services.note_service import NoteService
+from services.payloads import NOTE_VIEWS
+
+
+CATEGORIES = 30
+PAGES = [("full", 20), ("full", 50), ("full", 200), ("full", 500), ("summary", 200)]
+# (coding, levels) measured; the middleware's defaults are gzip 6, br 4, zstd 3
+LEVELS = [("gzip", [1, 6, 9]), ("br", [1, 4, 11]), ("zstd", [1, 3, 19])]
+REPEAT = 7
+
+
+def page_body(db, view: str, limit: int) -> bytes:
+    """Body of a list page as GET /api/notes?view=...&limit=... renders it"""
+    fields = NOTE_VIEWS[view]
+    rows = NoteRepository(db).get_page_rows(limit=limit + 1, fields=fields)
+    payload = NoteService.list_payload(rows, fields, limit, None, None)
+    return ORJSONResponse(payload).body
+
+
+def compress(coding: str, level: int, body: bytes) -> tuple:
+    """Compressed size and best time (ms)"""
+    encoder_factory = build_encoders([coding], gzip_level=level, brotli_quality=level, zstd_level=level)[coding]
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        encoder = encoder_factory()
+        compressed = encoder.compress(body) + encoder.finish()
+        best = min(best, time.perf_counter() - started)
+    return len(compressed), best * 1000
+
+
+def main(argv: List[str]) -> int:
+    notes = int(argv[0]) if argv else 2000
+    init_db()
+    available = build_encoders([coding for coding, _ in LEVELS], 6, 4, 3)
+    with SessionLocal() as db:
+        seed(db, notes, CATEGORIES)
+        bodies = [(view, limit, page_body(db, view, limit)) for view, limit in PAGES]
+    
+    missing = [coding for coding, _ in LEVELS if coding not in available]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+    print(f"{'page':<13} {'coding':<8} {'raw KiB':>8} {'out KiB':>8} {'ratio':>6} {'ms':>7} {'MB/s':>7} {'us/KiB saved':>12}")
+    for view, limit, body in bodies:
+        for coding, levels in LEVELS:
+            if coding not in available:
+                continue
+            for level in levels:
+                size, elapsed = compress(coding, level, body)
+                saved_kib = (len(body) - size) / 1024
+                print(
+                    f"{view + ' ' + str(limit):<13} {coding + ' ' + str(level):<8} {len(body) / 1024:>8.1f} "
+                    f"{size / 1024:>8.1f} {len(body) / size:>6.1f} {elapsed:>7.3f} "
+                    f"{len(body) / 1e6 / (elapsed / 1000):>7.0f} {elapsed * 1000 / saved_kib:>12.2f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
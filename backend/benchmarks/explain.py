@@ -0,0 +1,144 @@
+"""
+Query plan report: EXPLAIN every repository query against a seeded dataset.
+
+Seeds notes, categories and tombstones (see benchmarks.seed), then calls each repository method, records the
+statements it sends and prints the plan of each one. Every call runs in a
+savepoint that is rolled back before its statements are explained, so writes
+are explained against the same data they ran on and never persist.
+
+On PostgreSQL plans come from EXPLAIN (ANALYZE, BUFFERS), so they show real
+row counts and timings; on SQLite from EXPLAIN QUERY PLAN. Look for
+sequential scans and sorts on the list, version and category queries.
+
+Usage (from the backend directory):
+    python -m benchmarks.explain [NOTES]
+    
+NOTES defaults to 20000. DATABASE_URL is honoured; without it a throwaway
+SQLite database is used. Existing notes and categories are deleted.
+"""
+import os
+import re
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="explain_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'explain.db')}"
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from benchmarks.seed import seed
+from config.database import SessionLocal, engine, init_db
+from config.instrumentation import QueryCounter
+from repositories.category_repository import CategoryRepository
+from repositories.note_repository import NoteRepository
+from services.payloads import NOTE_VIEWS
+
+
+CATEGORIES = 20
+# Transaction control emitted around each call; not worth explaining
+SKIPPED = re.compile(r"^\s*(SAVEPOINT|RELEASE|ROLLBACK|COMMIT|BEGIN)\b", re.IGNORECASE)
+
+
+def scenarios(note_ids: List[uuid.UUID], category_ids: List[uuid.UUID]) -> List[Tuple[str, Callable]]:
+    """(name, call) for every repository query; calls receive (notes, categories) repositories"""
+    note_id, other_id = note_ids[len(note_ids) // 2], note_ids[len(note_ids) // 3 + 1]
+    category_id = category_ids[0]
+    middle = datetime.now(timezone.utc) - timedelta(days=182)
+    summary = NOTE_VIEWS["summary"]
+    return [
+        ("get note", lambda notes, categories: notes.get_by_id(note_id)),
+        ("note version", lambda notes, categories: notes.get_version(note_id, lock=True)),
+        ("list page", lambda notes, categories: notes.get_page_rows(limit=51)),
+        ("list page, next", lambda notes, categories: notes.get_page_rows(limit=51, after=(middle, note_id))),
+        ("list page, active", lambda notes, categories: notes.get_page_rows(archived=False, limit=51)),
+        ("list page, archived", lambda notes, categories: notes.get_page_rows(archived=True, limit=51)),
+        ("list page, category", lambda notes, categories: notes.get_page_rows(category_id=category_id, limit=51)),
+        ("list page, summary", lambda notes, categories: notes.get_page_rows(limit=51, fields=summary)),
+        ("list page, orm", lambda notes, categories: notes.get_page(archived=False, limit=50)),
+        ("list version", lambda notes, categories: notes.get_list_version()),
+        ("list version, active", lambda notes, categories: notes.get_list_version(archived=False)),
+        ("list version, archived", lambda notes, categories: notes.get_list_version(archived=True)),
+        ("list version, category", lambda notes, categories: notes.get_list_version(category_id=category_id)),
+        ("count, active", lambda notes, categories: notes.count(archived=False)),
+        ("count, archived", lambda notes, categories: notes.count(archived=True)),
+        ("changes", lambda notes, categories: notes.get_changed_rows(limit=501)),
+        ("changes, next", lambda notes, categories: notes.get_changed_rows(after=(middle, note_id), limit=501)),
+        ("deletions", lambda notes, categories: notes.get_deletions(limit=501)),
+        ("search", lambda notes, categories: notes.search("lorem", archived=False)),
+        ("existing ids", lambda notes, categories: notes.existing_ids(note_ids[:100])),
+        ("update note", lambda notes, categories: notes.update(note_id, title="Renamed")),
+        ("archive note", lambda notes, categories: notes.archive(other_id)),
+        ("add category", lambda notes, categories: notes.add_category(note_id, categories.get_by_id(category_ids[-1]))),
+        ("remove category", lambda notes, categories: notes.remove_category(note_id, categories.get_by_id(category_id))),
+        ("delete note", lambda notes, categories: notes.delete(note_id)),
+        ("categories", lambda notes, categories: categories.get_all()),
+        ("categories with counts", lambda notes, categories: categories.get_all_with_counts()),
+        ("category note ids", lambda notes, categories: categories.note_ids(category_id)),
+        ("update category", lambda notes, categories: categories.update(category_id, name="Renamed")),
+        ("delete category", lambda notes, categories: categories.delete(category_id)),
+    ]
+
+
+def explain(connection, statement: str, parameters) -> List[str]:
+    """Plan of one statement, run in a savepoint that is rolled back"""
+    if connection.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    savepoint = connection.begin_nested()
+    try:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).fetchall()
+    finally:
+        savepoint.rollback()
+    if connection.dialect.name == "postgresql":
+        return [row[0] for row in rows]
+    # SQLite: (id, parent, notused, detail); indent by depth
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+def main(argv: List[str]) -> int:
+    notes = int(argv[0]) if argv else 20000
+    init_db()
+    with SessionLocal() as db:
+        dataset = seed(db, notes, CATEGORIES, tombstones=notes // 10)
+        # Fresh statistics, as autovacuum would eventually collect
+        db.execute(text("ANALYZE"))
+        db.commit()
+    print(f"Seeded {notes} notes, {CATEGORIES} categories ({engine.dialect.name})")
+    
+    with engine.connect() as connection:
+        outer = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        for name, call in scenarios(dataset.note_ids, dataset.category_ids):
+            savepoint = connection.begin_nested()
+            with QueryCounter(engine) as counter:
+                call(NoteRepository(db), CategoryRepository(db))
+            # End the session's own savepoint (left open by reads) first
+            db.rollback()
+            savepoint.rollback()
+            db.expunge_all()
+            
+            print(f"\n== {name} ==")
+            for statement, parameters in zip(counter.statements, counter.parameters):
+                if SKIPPED.match(statement):
+                    continue
+                print("-- " + " ".join(statement.split())[:200])
+                for line in explain(connection, statement, parameters):
+                    print("   " + line)
+        db.close()
+        outer.rollback()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,324 @@
+"""
+Load test: drive every API endpoint with concurrent clients and record
+latency percentiles, throughput and SQL statements per request.
+
+Seeds a reproducible dataset (see benchmarks.seed), then runs one phase per
+endpoint: `--concurrency` workers share `--requests` requests, sent with
+httpx.AsyncClient straight into the ASGI app (no network, no server process).
+Only one endpoint runs at a time, so the statements counted on the engine
+during a phase all belong to that endpoint.
+
+Results are written as JSON; pass a previous file with --compare to print the
+change per endpoint, e.g. between two commits:
+
+    python -m benchmarks.load_test --output before.json
+    git checkout other-branch
+    python -m benchmarks.load_test --compare before.json
+    
+Usage (from the backend directory):
+    python -m benchmarks.load_test [--notes N] [--categories M]
+        [--concurrency C] [--requests R] [--seed S] [--only NAME,...]
+        [--output FILE] [--compare FILE]
+        
+DATABASE_URL, DATABASE_MODE, CACHE_BACKEND and CATEGORY_COUNTERS are
+honoured; without DATABASE_URL a throwaway SQLite database is used. Existing
+notes and categories are deleted. Requires httpx (see requirements-dev.txt).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Lists only carry an ETag once their latest write is older than the
+# transaction lag; the phases write continuously, so conditional list GETs
+# need it off
+os.environ.setdefault("CHANGES_MAX_TXN_LAG", "0")
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="load_test_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'load_test.db')}"
+
+import httpx
+
+from benchmarks.seed import Dataset, seed
+from config import settings
+from config.database import SessionLocal, async_engine, engine, init_db
+from config.instrumentation import QueryCounter
+from main import app
+
+
+@dataclass
+class Fixture:
+    """Seeded ids plus pools of rows that destructive endpoints may consume"""
+    dataset: Dataset
+    rng: random.Random
+    disposable_notes: List[str] = field(default_factory=list)
+    disposable_categories: List[str] = field(default_factory=list)
+    etags: Dict[str, str] = field(default_factory=dict)
+    
+    def note(self) -> str:
+        return str(self.rng.choice(self.dataset.note_ids))
+    
+    def notes(self, count: int) -> List[str]:
+        return [str(note_id) for note_id in self.rng.sample(self.dataset.note_ids, count)]
+    
+    def category(self) -> str:
+        return str(self.rng.choice(self.dataset.category_ids))
+
+
+Request = Callable[[httpx.AsyncClient, Fixture], Awaitable[httpx.Response]]
+Prepare = Callable[[httpx.AsyncClient, Fixture, int], Awaitable[None]]
+
+
+@dataclass
+class Endpoint:
+    """One load phase: `request` is sent repeatedly, after `prepare` ran once"""
+    name: str
+    request: Request
+    prepare: Optional[Prepare] = None
+    # Fraction of --requests to send (for expensive endpoints such as export)
+    share: float = 1.0
+
+
+async def _create_disposable_notes(client: httpx.AsyncClient, fixture: Fixture, count: int) -> None:
+    operations = [{"op": "create", "title": f"Disposable {i}", "content": "To be deleted"} for i in range(count)]
+    response = await client.post("/api/notes/bulk", json={"operations": operations})
+    fixture.disposable_notes = [result["id"] for result in response.json()["results"]]
+
+
+async def _create_disposable_categories(client: httpx.AsyncClient, fixture: Fixture, count: int) -> None:
+    fixture.disposable_categories = []
+    for _ in range(count):
+        response = await client.post("/api/categories", json={"name": f"Disposable {uuid.uuid4().hex[:12]}"})
+        fixture.disposable_categories.append(response.json()["id"])
+
+
+async def _remember_list_etag(client: httpx.AsyncClient, fixture: Fixture, count: int) -> None:
+    fixture.etags["list"] = (await client.get("/api/notes", params={"archived": "false"})).headers["ETag"]
+
+
+async def _remember_note_etag(client: httpx.AsyncClient, fixture: Fixture, count: int) -> None:
+    note_id = fixture.note()
+    fixture.etags["note"] = (await client.get(f"/api/notes/{note_id}")).headers["ETag"]
+    fixture.etags["note_id"] = note_id
+
+
+def endpoints() -> List[Endpoint]:
+    """Every API endpoint except the streaming event feeds"""
+    return [
+        Endpoint("GET /health", lambda c, f: c.get("/health")),
+        Endpoint("GET /api/notes", lambda c, f: c.get("/api/notes", params={"archived": "false"})),
+        Endpoint("GET /api/notes (summary)", lambda c, f: c.get("/api/notes", params={"archived": "false", "view": "summary"})),
+        Endpoint("GET /api/notes (category)", lambda c, f: c.get("/api/notes", params={"category_id": f.category()})),
+        Endpoint(
+            "GET /api/notes (not modified)",
+            lambda c, f: c.get("/api/notes", params={"archived": "false"}, headers={"If-None-Match": f.etags["list"]}),
+            prepare=_remember_list_etag
+        ),
+        Endpoint("GET /api/notes/{id}", lambda c, f: c.get(f"/api/notes/{f.note()}")),
+        Endpoint(
+            "GET /api/notes/{id} (not modified)",
+            lambda c, f: c.get(f"/api/notes/{f.etags['note_id']}", headers={"If-None-Match": f.etags["note"]}),
+            prepare=_remember_note_etag
+        ),
+        Endpoint("GET /api/notes/search", lambda c, f: c.get("/api/notes/search", params={"q": f.rng.choice(["meeting", "budget plan", "garden"])})),
+        Endpoint("GET /api/notes/changes", lambda c, f: c.get("/api/notes/changes", params={"limit": 500})),
+        Endpoint("GET /api/notes/export", lambda c, f: c.get("/api/notes/export", params={"archived": "false"}), share=0.05),
+        Endpoint("POST /api/notes", lambda c, f: c.post("/api/notes", json={"title": "Load test", "content": "Created under load"})),
+        Endpoint("PUT /api/notes/{id}", lambda c, f: c.put(f"/api/notes/{f.note()}", json={"title": f"Edited {f.rng.random():.6f}"})),
+        Endpoint("PATCH /api/notes/{id}/archive", lambda c, f: c.patch(f"/api/notes/{f.note()}/archive")),
+        Endpoint("PATCH /api/notes/{id}/unarchive", lambda c, f: c.patch(f"/api/notes/{f.note()}/unarchive")),
+        Endpoint("POST /api/notes/{id}/categories/{cid}", lambda c, f: c.post(f"/api/notes/{f.note()}/categories/{f.category()}")),
+        Endpoint("DELETE /api/notes/{id}/categories/{cid}", lambda c, f: c.delete(f"/api/notes/{f.note()}/categories/{f.category()}")),
+        Endpoint(
+            "POST /api/notes/bulk",
+            lambda c, f: c.post("/api/notes/bulk", json={"operations": [
+                {"op": "update", "id": note_id, "content": "Bulk edited"} for note_id in f.notes(10)
+            ]})
+        ),
+        Endpoint(
+            "POST /api/notes/bulk/categories",
+            lambda c, f: c.post("/api/notes/bulk/categories", json={
+                "note_ids": f.notes(10), "category_ids": [f.category()], "mode": "add"
+            })
+        ),
+        Endpoint(
+            "DELETE /api/notes/{id}",
+            lambda c, f: c.delete(f"/api/notes/{f.disposable_notes.pop()}"),
+            prepare=_create_disposable_notes
+        ),
+        Endpoint("GET /api/categories", lambda c, f: c.get("/api/categories")),
+        Endpoint("GET /api/categories (counts)", lambda c, f: c.get("/api/categories", params={"with_counts": "true"})),
+        Endpoint("GET /api/categories/{id}", lambda c, f: c.get(f"/api/categories/{f.category()}")),
+        Endpoint("POST /api/categories", lambda c, f: c.post("/api/categories", json={"name": f"Load {uuid.uuid4().hex[:12]}"})),
+        Endpoint("PUT /api/categories/{id}", lambda c, f: c.put(f"/api/categories/{f.category()}", json={"color": f"#{f.rng.getrandbits(24):06x}"})),
+        Endpoint(
+            "DELETE /api/categories/{id}",
+            lambda c, f: c.delete(f"/api/categories/{f.disposable_categories.pop()}"),
+            prepare=_create_disposable_categories
+        ),
+    ]
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+async def run_phase(client: httpx.AsyncClient, fixture: Fixture, endpoint: Endpoint, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send `requests` requests with `concurrency` workers and summarize them"""
+    if endpoint.prepare is not None:
+        await endpoint.prepare(client, fixture, requests)
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+    
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await endpoint.request(client, fixture)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+    
+    counted_engine = async_engine.sync_engine if settings.database_mode == "async" else engine
+    with QueryCounter(counted_engine) as counter:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "statements_per_request": round(counter.count / len(latencies), 2),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Seed, run every selected phase and return the JSON report"""
+    init_db()
+    with SessionLocal() as db:
+        dataset = seed(db, args.notes, args.categories, tombstones=args.notes // 20, rng_seed=args.seed)
+    fixture = Fixture(dataset=dataset, rng=random.Random(args.seed))
+    selected = endpoints()
+    if args.only:
+        names = {name.strip() for name in args.only.split(",")}
+        selected = [endpoint for endpoint in selected if endpoint.name in names]
+    
+    results: Dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", limits=limits) as client:
+            for endpoint in selected:
+                requests = max(1, int(args.requests * endpoint.share))
+                results[endpoint.name] = await run_phase(client, fixture, endpoint, requests, args.concurrency)
+                print(_format_row(endpoint.name, results[endpoint.name]), flush=True)
+    
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "dialect": engine.dialect.name,
+            "database_mode": settings.database_mode,
+            "cache_backend": settings.cache_backend,
+            "category_counters": settings.category_counters,
+            "python": platform.python_version(),
+            "notes": args.notes,
+            "categories": args.categories,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "endpoints": results,
+    }
+
+
+HEADER = f"{'endpoint':<42} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'stmts':>6} {'errors':>6}"
+
+
+def _format_row(name: str, result: Dict[str, Any]) -> str:
+    return (
+        f"{name:<42} {result['throughput_rps']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+        f"{result['p99_ms']:>8.2f} {result['statements_per_request']:>6.2f} {result['errors']:>6}"
+    )
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print the relative change of p50, p95 and throughput per endpoint"""
+    print(f"\nCompared with {previous['meta'].get('commit')} ({previous['meta'].get('timestamp')}):")
+    print(f"{'endpoint':<42} {'p50':>8} {'p95':>8} {'req/s':>8} {'stmts':>7}")
+    for name, result in current["endpoints"].items():
+        before = previous["endpoints"].get(name)
+        if before is None:
+            continue
+        
+        def change(key: str) -> str:
+            if not before[key]:
+                return "n/a"
+            return f"{(result[key] - before[key]) / before[key] * 100:+.0f}%"
+        
+        statements = result["statements_per_request"] - before["statements_per_request"]
+        print(f"{name:<42} {change('p50_ms'):>8} {change('p95_ms'):>8} {change('throughput_rps'):>8} {statements:>+7.2f}")
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=10000, help="Notes to seed")
+    parser.add_argument("--categories", type=int, default=50, help="Categories to seed")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the dataset and requests")
+    parser.add_argument("--only", help="Comma-separated endpoint names to run")
+    parser.add_argument("--output", help="JSON results file (default: load_test_<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    args = parser.parse_args(argv)
+    
+    print(HEADER)
+    report = asyncio.run(run(args))
+    output = args.output or f"load_test_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {output}")
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(json.load(fh), report)
+    failed = [name for name, result in report["endpoints"].items() if result["errors"]]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+"""
+Request metrics overhead benchmark.
+
+Calls a minimal ASGI app directly (no server, no HTTP client) with and
+without RequestMetricsMiddleware and reports the time per request, so the
+difference is the middleware's own cost. Also times rendering GET /metrics
+for a registry holding a realistic number of series.
+
+Usage (from the backend directory):
+    python -m benchmarks.request_metrics [REQUESTS]
+    
+REQUESTS defaults to 20000.
+"""
+import asyncio
+import sys
+import time
+from typing import List
+
+from fastapi import FastAPI
+
+from config.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+
+REPEAT = 5
+# Series held by the registry when timing the exposition
+ROUTES = 40
+STATUSES = (200, 201, 304, 404, 500)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/api/notes/{note_id}")
+    async def get_note(note_id: str):
+        return {"id": note_id}
+    
+    return app
+
+
+async def run(app, requests: int) -> float:
+    """Best time per request (microseconds) over REPEAT runs"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/notes/42",
+        "raw_path": b"/api/notes/42",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        pass
+    
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        for _ in range(requests):
+            # The router writes into the scope, so every request gets a copy
+            await app(dict(scope), receive, send)
+        best = min(best, time.perf_counter() - started)
+    return best / requests * 1e6
+
+
+def exposition_ms() -> float:
+    metrics = RequestMetrics()
+    for route in range(ROUTES):
+        for status in STATUSES:
+            metrics.start()
+            metrics.finish("GET", f"/api/route{route}/{{id}}", status, 0.01, 1000)
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        "\n".join(metrics.exposition())
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: List[str]) -> int:
+    requests = int(argv[0]) if argv else 20000
+    app = build_app()
+    bare = asyncio.run(run(app, requests))
+    measured = asyncio.run(run(RequestMetricsMiddleware(app, RequestMetrics()), requests))
+    print(f"without middleware: {bare:8.1f} us/request")
+    print(f"with middleware:    {measured:8.1f} us/request")
+    print(f"overhead:           {measured - bare:8.1f} us/request ({(measured - bare) / bare:+.1%})")
+    print(f"exposition, {ROUTES * len(STATUSES)} request series: {exposition_ms():.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
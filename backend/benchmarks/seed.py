@@ -0,0 +1,115 @@
+"""
+Reproducible dataset generator shared by the benchmarks.
+
+Generates notes and categories with a realistic shape: category popularity
+follows a Zipf-like curve (a few categories hold most notes), most notes
+carry zero to two categories, content lengths are skewed towards short
+notes with a long tail, a fifth of the notes are archived and timestamps
+spread over a year. The same seed always produces the same dataset.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models import Category, CategoryNoteCount, Note, NoteDeletion, note_categories
+from repositories.category_repository import CategoryRepository
+
+
+BATCH_SIZE = 5000
+# Probability of a note carrying 0, 1, 2, 3 and 4 categories
+CATEGORIES_PER_NOTE = [0.30, 0.35, 0.20, 0.10, 0.05]
+ARCHIVED_SHARE = 0.2
+WORDS = (
+    "meeting project idea todo groceries travel book recipe budget draft "
+    "review call plan weekend garden fix follow up notes list research "
+    "release design client invoice workout reminder birthday"
+).split()
+
+
+@dataclass
+class Dataset:
+    """Ids of the generated rows"""
+    note_ids: List[uuid.UUID] = field(default_factory=list)
+    category_ids: List[uuid.UUID] = field(default_factory=list)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _content_words(rng: random.Random) -> int:
+    # Log-normal: median around 40 words, occasionally a few thousand
+    return max(1, min(5000, int(rng.lognormvariate(3.7, 1.0))))
+
+
+def clear(db: Session) -> None:
+    """Delete all notes, categories, links and tombstones"""
+    db.execute(delete(note_categories))
+    db.execute(delete(NoteDeletion))
+    db.execute(delete(CategoryNoteCount))
+    db.execute(delete(Note))
+    db.execute(delete(Category))
+
+
+def seed(db: Session, notes: int, categories: int, tombstones: int = 0, rng_seed: int = 42) -> Dataset:
+    """
+    Replace all data with a generated dataset.
+    
+    Args:
+        db: Session to write with (committed on return)
+        notes: Number of notes
+        categories: Number of categories
+        tombstones: Number of note_deletions rows, for the changes feed
+        rng_seed: Random seed; equal seeds give equal datasets
+        
+    Returns:
+        Ids of the generated notes and categories, newest note first
+    """
+    rng = random.Random(rng_seed)
+    clear(db)
+    dataset = Dataset(category_ids=[uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(categories)])
+    if dataset.category_ids:
+        db.execute(insert(Category), [
+            {"id": category_id, "name": f"{rng.choice(WORDS).title()} {i}", "color": f"#{rng.getrandbits(24):06x}"}
+            for i, category_id in enumerate(dataset.category_ids)
+        ])
+    popularity = [1 / rank for rank in range(1, categories + 1)]
+    
+    now = datetime.now(timezone.utc)
+    for offset in range(0, notes, BATCH_SIZE):
+        rows, links = [], []
+        for i in range(offset, min(offset + BATCH_SIZE, notes)):
+            note_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            created_at = now - timedelta(days=365 * i / max(notes, 1), seconds=rng.random())
+            rows.append({
+                "id": note_id,
+                "title": _text(rng, rng.randint(1, 8)).capitalize(),
+                "content": _text(rng, _content_words(rng)),
+                "is_archived": rng.random() < ARCHIVED_SHARE,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(hours=rng.expovariate(1 / 48)),
+            })
+            dataset.note_ids.append(note_id)
+            if categories:
+                wanted = rng.choices(range(len(CATEGORIES_PER_NOTE)), CATEGORIES_PER_NOTE)[0]
+                picked = set(rng.choices(dataset.category_ids, popularity, k=wanted))
+                links.extend({"note_id": note_id, "category_id": category_id} for category_id in picked)
+        db.execute(insert(Note), rows)
+        if links:
+            db.execute(insert(note_categories), links)
+    
+    if tombstones:
+        db.execute(insert(NoteDeletion), [
+            {"note_id": uuid.UUID(int=rng.getrandbits(128), version=4), "deleted_at": now - timedelta(minutes=i)}
+            for i in range(tombstones)
+        ])
+    db.commit()
+    if settings.category_counters:
+        CategoryRepository(db).rebuild_note_counts()
+    return dataset
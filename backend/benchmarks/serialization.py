@@ -0,0 +1,130 @@
+"""
+Serialization benchmark: note list responses through the response models
+versus the row-based fast path.
+
+For each size, seeds that many notes (a third of them linked to a category)
+and times rendering one page holding all of them:
+
+  models    get_page() -> NoteResponse.model_validate per note ->
+            NoteListResponse -> FastAPI's response_model validation and
+            jsonable_encoder -> JSONResponse
+  fast      get_page_rows() -> note_payloads() -> ORJSONResponse
+  
+Both paths include the database query, so the numbers are end-to-end for
+the handler minus HTTP framing.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization [SIZE ...]
+    
+SIZE defaults to 1000 10000 100000. DATABASE_URL is honoured; without it a
+throwaway SQLite database is used. Existing notes in the database are deleted.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Tuple
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="serialization_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'serialization.db')}"
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import delete, insert
+
+from config.database import SessionLocal, init_db
+from models import Category, Note, note_categories
+from repositories.note_repository import NoteRepository
+from routers.responses import ORJSONResponse
+from schemas.note_schemas import NoteListResponse, NoteResponse
+from services.note_service import NoteService
+from services.payloads import note_payloads
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+SEED_BATCH = 5000
+
+
+def seed(db, size: int) -> None:
+    """Replace all notes with `size` generated notes and a few categories"""
+    db.execute(delete(note_categories))
+    db.execute(delete(Note))
+    db.execute(delete(Category))
+    categories = [
+        {"id": uuid.uuid4(), "name": f"Category {i}", "color": "#336699"}
+        for i in range(5)
+    ]
+    db.execute(insert(Category), categories)
+    
+    start = datetime.now(timezone.utc)
+    for offset in range(0, size, SEED_BATCH):
+        notes, links = [], []
+        for i in range(offset, min(offset + SEED_BATCH, size)):
+            note_id = uuid.uuid4()
+            stamp = start - timedelta(seconds=i)
+            notes.append({
+                "id": note_id,
+                "title": f"Note {i}",
+                "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                "is_archived": False,
+                "created_at": stamp,
+                "updated_at": stamp,
+            })
+            if i % 3 == 0:
+                links.append({"note_id": note_id, "category_id": categories[i % 5]["id"]})
+        db.execute(insert(Note), notes)
+        if links:
+            db.execute(insert(note_categories), links)
+    db.commit()
+
+
+def render_models(db, size: int) -> bytes:
+    """Render the list the way the routers did before the fast path"""
+    notes = [NoteResponse.model_validate(note) for note in NoteRepository(db).get_page(limit=size)]
+    content = NoteListResponse(notes=notes, total=None, archived=None, next_cursor=None)
+    field = create_response_field(name="response", type_=NoteListResponse, mode="serialization")
+    payload = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(payload).body
+
+
+def render_fast(db, size: int) -> bytes:
+    """Render the list through the row-based payloads and ORJSONResponse"""
+    notes = note_payloads(NoteRepository(db).get_page_rows(limit=size))
+    return ORJSONResponse(NoteService.page_payload(notes, size, None, None)).body
+
+
+def timed(render: Callable, db, size: int, repeat: int) -> Tuple[float, int]:
+    """Best wall-clock time of `repeat` runs, and the body size"""
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        db.expunge_all()
+        started = time.perf_counter()
+        body = render(db, size)
+        best = min(best, time.perf_counter() - started)
+    return best, len(body)
+
+
+def main(argv: List[str]) -> int:
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    init_db()
+    print(f"{'notes':>8} {'models ms':>10} {'fast ms':>10} {'speedup':>8} {'body KiB':>9}")
+    with SessionLocal() as db:
+        for size in sizes:
+            seed(db, size)
+            repeat = 5 if size <= 10000 else 2
+            models_time, _ = timed(render_models, db, size, repeat)
+            fast_time, body_size = timed(render_fast, db, size, repeat)
+            print(
+                f"{size:>8} {models_time * 1000:>10.1f} {fast_time * 1000:>10.1f} "
+                f"{models_time / fast_time:>7.1f}x {body_size / 1024:>9.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,116 @@
+"""
+Startup benchmark: how long a fresh process takes to serve its first request.
+
+Starts `--runs` fresh interpreters that import main, run the startup
+handlers and answer GET /health in-process, and reports the median time of
+each phase. One more interpreter runs with `python -X importtime` and its
+output is summarized: import time per top-level package and the slowest
+modules.
+
+The import time budget, and the absence of engines and database drivers
+after import, are enforced by tests/test_startup.py.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup [--runs N] [--top K]
+    
+The environment is passed through (ENVIRONMENT, DATABASE_URL,
+DATABASE_MODE, ...). No database connection is needed: the engine is only
+created on first use, and the startup pool warm-up is skipped unless
+DB_WARMUP=true is set. Requires httpx (see requirements-dev.txt).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The pool warm-up connects to the database, so it is off unless asked for
+CHILD_ENV = dict(os.environ)
+CHILD_ENV.setdefault("DB_WARMUP", "false")
+
+# Runs in the child interpreter; prints the phase timings as JSON
+PROBE = """
+import asyncio, json, time
+import httpx
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def first_request():
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            assert (await client.get("/health")).status_code == 200
+        served = time.perf_counter()
+    return ready, served
+    
+ready, served = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (served - ready) * 1000,
+}))
+"""
+
+
+def probe() -> Dict[str, float]:
+    """Phase timings of one fresh interpreter, plus its wall time from exec to exit"""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=CHILD_ENV, capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["total_ms"] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+def import_profile() -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every module imported by main"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=CHILD_ENV, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Slowest packages and modules to list")
+    args = parser.parse_args(argv)
+    
+    modules = import_profile()
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+    total_us = sum(by_package.values())
+    print(f"-X importtime: {len(modules)} modules, {total_us / 1000:.0f} ms")
+    print(f"\n{'package':<30} {'ms':>8} {'share':>6}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<30} {self_us / 1000:>8.1f} {self_us / total_us:>6.0%}")
+    print(f"\n{'module':<50} {'self ms':>8} {'cumul ms':>9}")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda module: -module[1])[:args.top]:
+        print(f"{name:<50} {self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}")
+    
+    runs = [probe() for _ in range(args.runs)]
+    print(f"\nMedian of {args.runs} fresh processes:")
+    for phase in ("import_ms", "startup_ms", "first_request_ms", "total_ms"):
+        print(f"  {phase[:-3]:<16} {statistics.median(run[phase] for run in runs):>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
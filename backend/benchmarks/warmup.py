@@ -0,0 +1,128 @@
+"""
+Cold start benchmark: latency right after a deploy, with and without warm-up.
+
+Seeds a dataset (see benchmarks.seed), then starts a fresh production
+server (one gunicorn worker, see benchmarks.workers) twice: once with
+DB_WARMUP=false and once with DB_WARMUP=true. As soon as it answers
+/health, `--concurrency` clients send a mix of note list and single-note
+reads for `--seconds`. Latency percentiles are reported for the first
+second, the first ten seconds and the whole window, which is where an
+unwarmed pool pays for opening connections and compiling statements.
+Keep the load below saturation: once requests queue, queueing hides the
+difference (the client runs on the same machine).
+
+The response cache is off (CACHE_BACKEND=none) unless set, so every request
+reaches the database, as it does for a cache that is still empty.
+ENVIRONMENT defaults to production, so SQL is not echoed.
+
+Usage (from the backend directory):
+    python -m benchmarks.warmup [--notes N] [--concurrency C] [--seconds S]
+        [--rounds R]
+        
+DATABASE_URL and DATABASE_MODE are honoured; without DATABASE_URL a
+throwaway SQLite database is used. Existing notes and categories are
+deleted. Requires gunicorn and httpx.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+os.environ.setdefault("CACHE_BACKEND", "none")
+# Not "development", which logs every statement
+os.environ.setdefault("ENVIRONMENT", "production")
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="warmup_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'warmup.db')}"
+
+import httpx
+
+from benchmarks.load_test import percentile
+from benchmarks.seed import seed
+from benchmarks.workers import free_port, start_server, wait_until_ready
+from config.database import SessionLocal, init_db
+
+
+# (label, seconds since the first request) windows to report
+WINDOWS = [("first 1 s", 1.0), ("first 10 s", 10.0), ("all", float("inf"))]
+
+
+async def drive(base_url: str, note_ids: List[str], concurrency: int, seconds: float) -> List[Tuple[float, float]]:
+    """(seconds since start, latency ms) of every request sent by `concurrency` clients"""
+    samples: List[Tuple[float, float]] = []
+    rng = random.Random(42)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        started = time.perf_counter()
+        
+        async def worker() -> None:
+            while time.perf_counter() - started < seconds:
+                if rng.random() < 0.5:
+                    path, params = "/api/notes", {"archived": "false", "view": rng.choice(["full", "summary"])}
+                else:
+                    path, params = f"/api/notes/{rng.choice(note_ids)}", None
+                sent = time.perf_counter()
+                response = await client.get(path, params=params)
+                response.raise_for_status()
+                samples.append((sent - started, (time.perf_counter() - sent) * 1000))
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def cold_start(warmup: bool, note_ids: List[str], concurrency: int, seconds: float) -> List[Tuple[float, float]]:
+    """Start a fresh server and load it from its first request on"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(1, port, DB_WARMUP=str(warmup).lower())
+    try:
+        wait_until_ready(base_url, server)
+        return asyncio.run(drive(base_url, note_ids, concurrency, seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summarize(samples: List[Tuple[float, float]], window: float) -> Dict[str, float]:
+    latencies = sorted(latency for at, latency in samples if at < window)
+    return {
+        "requests": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--notes", type=int, default=2000, help="Notes to seed")
+    parser.add_argument("--concurrency", type=int, default=2, help="Concurrent keep-alive clients; keep the server below saturation")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Load duration after each start")
+    parser.add_argument("--rounds", type=int, default=3, help="Cold starts per variant; the median is reported")
+    args = parser.parse_args(argv)
+    
+    init_db()
+    with SessionLocal() as db:
+        note_ids = [str(note_id) for note_id in seed(db, args.notes, 30).note_ids]
+    
+    print(f"{'warm-up':<8} {'window':<11} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for warmup in (False, True):
+        runs = [cold_start(warmup, note_ids, args.concurrency, args.seconds) for _ in range(args.rounds)]
+        for label, window in WINDOWS:
+            results = [summarize(samples, window) for samples in runs]
+            median = {key: statistics.median(result[key] for result in results) for key in results[0]}
+            print(
+                f"{'on' if warmup else 'off':<8} {label:<11} {median['requests']:>9.0f} {median['p50']:>8.2f} "
+                f"{median['p99']:>8.2f} {median['max']:>8.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,152 @@
+"""
+Worker scaling benchmark: throughput of the production server per worker count.
+
+Seeds a dataset (see benchmarks.seed), then for every worker count starts
+the production server (gunicorn -c gunicorn.conf.py with uvicorn workers)
+on a free local port, drives GET /api/notes over real TCP connections with
+`--concurrency` keep-alive clients for `--seconds`, and reports requests per
+second and latency percentiles before stopping the server again.
+
+The load generator is a single asyncio process on the same machine, so it
+competes with the workers for CPU: scaling flattens once the workers plus
+the client saturate the cores, and a single-core machine shows no scaling
+at all. Run it on the target hardware, or point the server at a separate
+database host, for representative numbers.
+
+Usage (from the backend directory):
+    python -m benchmarks.workers [--workers 1,2,4] [--notes N]
+        [--concurrency C] [--seconds S] [--path PATH]
+        
+DATABASE_URL is honoured; without it a throwaway SQLite database is used.
+Existing notes and categories are deleted. Requires gunicorn and httpx.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# gunicorn.conf.py refuses in-process events with several workers unless
+# they go through PostgreSQL; nothing subscribes here anyway
+os.environ.setdefault("EVENTS_BACKEND", "none")
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="workers_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'workers.db')}"
+
+import httpx
+
+from benchmarks.load_test import percentile
+from benchmarks.seed import seed
+from config.database import SessionLocal, init_db
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT = 30.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, **overrides: str) -> subprocess.Popen:
+    """Launch gunicorn with `workers` workers; the rest comes from gunicorn.conf.py and `overrides` (settings)"""
+    env = dict(os.environ, WEB_WORKERS=str(workers), PORT=str(port), **overrides)
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}", "main:app"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def drive(base_url: str, path: str, concurrency: int, seconds: float) -> Dict[str, Any]:
+    """Send requests from `concurrency` clients for `seconds` and summarize them"""
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # Warm up every worker's pools and caches before measuring
+        await asyncio.gather(*(client.get(path) for _ in range(concurrency * 2)))
+        deadline = time.perf_counter() + seconds
+        
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--notes", type=int, default=2000, help="Notes to seed")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measured duration per worker count")
+    parser.add_argument("--path", default="/api/notes?archived=false&limit=20", help="Request path")
+    args = parser.parse_args(argv)
+    
+    init_db()
+    with SessionLocal() as db:
+        seed(db, args.notes, 30)
+    
+    print(f"CPU cores: {os.cpu_count()}")
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    baseline = None
+    for workers in [int(value) for value in args.workers.split(",")]:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(workers, port)
+        try:
+            wait_until_ready(base_url, server)
+            result = asyncio.run(drive(base_url, args.path, args.concurrency, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        baseline = baseline or result["throughput_rps"]
+        print(
+            f"{workers:>7} {result['throughput_rps']:>9.1f} {result['throughput_rps'] / baseline:>7.2f}x "
+            f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>6}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,52 @@
+from cache.base import CacheBackend, NullCache
+from cache.memory import MemoryCache
+from cache.keys import CATEGORY_LIST_KEY, CATEGORY_COUNTS_KEY, note_key, category_key
+from cache.read_through import read_through, async_read_through
+from config.settings import settings
+
+
+def _build_cache() -> CacheBackend:
+    if settings.cache_backend == "memory":
+        return MemoryCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            default_ttl=settings.cache_ttl
+        )
+    if settings.cache_backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown CACHE_BACKEND '{settings.cache_backend}' (expected 'memory' or 'none')")
+
+
+_cache: CacheBackend = _build_cache()
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache backend used by the services"""
+    return _cache
+
+
+def set_cache(backend: CacheBackend) -> None:
+    """
+    Replace the process-wide cache backend, e.g. with a fake in tests or a
+    networked implementation of CacheBackend.
+    
+    Args:
+        backend: Backend to use from now on
+    """
+    global _cache
+    _cache = backend
+
+
+__all__ = [
+    "CacheBackend",
+    "NullCache",
+    "MemoryCache",
+    "CATEGORY_LIST_KEY",
+    "CATEGORY_COUNTS_KEY",
+    "note_key",
+    "category_key",
+    "read_through",
+    "async_read_through",
+    "get_cache",
+    "set_cache"
+]
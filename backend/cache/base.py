@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CacheBackend(ABC):
+    """
+    Interface for response cache backends.
+    
+    Values are strings (serialized JSON), so a networked store such as Redis
+    can implement this with GET / SET EX / DEL.
+    """
+    
+    #: False for backends that never store anything; lets callers skip work
+    #: that only serves invalidation
+    enabled: bool = True
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None on a miss
+        """
+    
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None, generation: Optional[int] = None) -> None:
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Serialized value
+            ttl: Seconds until the entry expires (None = backend default)
+            generation: generation(key) read before the value was loaded; if
+                the key has been invalidated since, the value may be stale
+                and is not stored (None = store unconditionally)
+        """
+    
+    @abstractmethod
+    def generation(self, key: str) -> int:
+        """
+        Invalidation counter of a key, bumped by delete() and clear().
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Opaque value to pass back to set()
+        """
+    
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """
+        Remove entries and invalidate loads in progress; missing keys are
+        still invalidated.
+        
+        Args:
+            keys: Cache keys to remove
+        """
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry"""
+
+
+class NullCache(CacheBackend):
+    """Backend that stores nothing (CACHE_BACKEND=none)"""
+    
+    enabled = False
+    
+    def get(self, key: str) -> Optional[str]:
+        return None
+    
+    def set(self, key: str, value: str, ttl: Optional[float] = None, generation: Optional[int] = None) -> None:
+        pass
+    
+    def generation(self, key: str) -> int:
+        return 0
+    
+    def delete(self, *keys: str) -> None:
+        pass
+    
+    def clear(self) -> None:
+        pass
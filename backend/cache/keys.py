@@ -0,0 +1,23 @@
+from uuid import UUID
+
+
+# Cache keys for service-level reads. Every key that a write can make stale is
+# built here, so the services invalidate exactly the entries they affect.
+
+CATEGORY_LIST_KEY = "categories"
+CATEGORY_COUNTS_KEY = "categories:counts"
+
+
+def note_key(note_id: UUID) -> str:
+    """Key of a single note response"""
+    return f"note:{note_id}"
+
+
+def category_key(category_id: UUID) -> str:
+    """Key of a single category response"""
+    return f"category:{category_id}"
+
+
+def compressed_key(coding: str, etag: str) -> str:
+    """Key of a compressed response body; the ETag pins the content"""
+    return f"compressed:{coding}:{etag}"
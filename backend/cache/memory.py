@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from cache.base import CacheBackend
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process cache with per-entry TTL and LRU eviction.
+    
+    Memory is bounded both by entry count and by the total UTF-8 size of
+    the stored values. Entries are local to the process, so with several
+    workers another worker's writes are only seen once the TTL expires
+    (gunicorn.conf.py turns the cache off there unless CACHE_BACKEND is set).
+    
+    Invalidations are tracked per stripe of keys rather than per key, so the
+    counters take constant memory; a delete in the same stripe only makes a
+    concurrent load skip caching its value.
+    """
+    
+    GENERATION_STRIPES = 4096
+    
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 32 * 1024 * 1024, default_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # key -> (value, expiry on the monotonic clock, size in bytes)
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._size = 0
+        self._generations = [0] * self.GENERATION_STRIPES
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, key: str, value: str, ttl: Optional[float] = None, generation: Optional[int] = None) -> None:
+        size = len(value.encode())
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and self._generations[self._stripe(key)] != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations[self._stripe(key)]
+    
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._generations[self._stripe(key)] += 1
+                if key in self._entries:
+                    self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._generations = [generation + 1 for generation in self._generations]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+    
+    def _stripe(self, key: str) -> int:
+        return hash(key) % self.GENERATION_STRIPES
+    
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
@@ -0,0 +1,80 @@
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from pydantic import TypeAdapter
+
+from cache.base import CacheBackend
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def read_through(
+    cache: CacheBackend,
+    key: str,
+    response_type: Any,
+    load: Callable[[], T],
+    ttl: Optional[float] = None
+) -> T:
+    """
+    Return the cached value for `key`, or load, cache and return it.
+    
+    Exceptions raised by `load` (e.g. a 404) propagate and nothing is cached.
+    If the key is invalidated while `load` runs, the value is returned but
+    not cached: it may have been read before the write that invalidated it.
+    
+    Args:
+        cache: Cache backend
+        key: Cache key
+        response_type: Pydantic type the value is (de)serialized as
+        load: Callable producing the value on a miss
+        ttl: Entry lifetime in seconds (None = backend default)
+        
+    Returns:
+        Cached or freshly loaded value
+    """
+    adapter = _adapter(response_type)
+    cached = cache.get(key)
+    if cached is not None:
+        return adapter.validate_json(cached)
+    
+    generation = cache.generation(key)
+    value = load()
+    cache.set(key, adapter.dump_json(value).decode(), ttl, generation)
+    return value
+
+
+async def async_read_through(
+    cache: CacheBackend,
+    key: str,
+    response_type: Any,
+    load: Callable[[], Awaitable[T]],
+    ttl: Optional[float] = None
+) -> T:
+    """
+    Async variant of read_through() for coroutine loaders, with the same
+    invalidation check.
+    
+    Args:
+        cache: Cache backend
+        key: Cache key
+        response_type: Pydantic type the value is (de)serialized as
+        load: Coroutine function producing the value on a miss
+        ttl: Entry lifetime in seconds (None = backend default)
+        
+    Returns:
+        Cached or freshly loaded value
+    """
+    adapter = _adapter(response_type)
+    cached = cache.get(key)
+    if cached is not None:
+        return adapter.validate_json(cached)
+    
+    generation = cache.generation(key)
+    value = await load()
+    cache.set(key, adapter.dump_json(value).decode(), ttl, generation)
+    return value
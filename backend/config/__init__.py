@@ -1,4 +1,24 @@
 from config.settings import settings, get_settings
-from config.database import get_db, init_db, Base, engine
+from config.database import get_db, get_async_db, init_db, Base, get_engine, get_async_engine
 
-__all__ = ["settings", "get_settings", "get_db", "init_db", "Base", "engine"]
+
+def __getattr__(name: str):
+    # The engines are created on first access (see config.database)
+    if name in ("engine", "async_engine"):
+        from config import database
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "settings",
+    "get_settings",
+    "get_db",
+    "get_async_db",
+    "init_db",
+    "Base",
+    "engine",
+    "async_engine",
+    "get_engine",
+    "get_async_engine"
+]
@@ -0,0 +1,260 @@
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cache import get_cache
+from cache.keys import compressed_key
+
+# brotli and zstandard are optional; without them only gzip is offered
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+# Content types worth compressing. Server-sent events are left alone:
+# compressors buffer, which would hold events back.
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "image/svg+xml")
+UNCOMPRESSIBLE_TEXT_TYPES = ("text/event-stream",)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def build_encoders(codings: Sequence[str], gzip_level: int, brotli_quality: int, zstd_level: int) -> Dict[str, Callable]:
+    """
+    Encoder factories for the configured content codings.
+    
+    Codings whose package is not installed (or that are unknown) are
+    skipped. Each factory returns an object with compress(data), flush()
+    (emit everything compressed so far, for streamed bodies) and finish().
+    
+    Args:
+        codings: Content codings in order of server preference
+        gzip_level: zlib level (1-9)
+        brotli_quality: Brotli quality (0-11)
+        zstd_level: Zstandard level (1-22)
+        
+    Returns:
+        Ordered mapping of coding to encoder factory
+    """
+    factories = {"gzip": lambda: _GzipEncoder(gzip_level)}
+    if brotli is not None:
+        factories["br"] = lambda: _BrotliEncoder(brotli_quality)
+    if zstandard is not None:
+        factories["zstd"] = lambda: _ZstdEncoder(zstd_level)
+    return {coding: factories[coding] for coding in codings if coding in factories}
+
+
+def negotiate(accept_encoding: str, codings: Sequence[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+    
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+        codings: Available codings in order of server preference
+        
+    Returns:
+        The coding with the highest q-value (server preference breaks
+        ties), or None if the client accepts none of them
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.strip().lower()] = q
+    
+    best, best_q = None, 0.0
+    for coding in codings:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """ETag of the `coding`-encoded representation: "abc" -> "abc-gzip" """
+    return f'{etag[:-1]}-{coding}"'
+
+
+def strip_coding(tag: str, codings: Sequence[str] = ("gzip", "br", "zstd")) -> str:
+    """Undo coded_etag(), so a client's tag compares equal to the identity ETag"""
+    for coding in codings:
+        suffix = f'-{coding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type.startswith("text/"):
+        return content_type not in UNCOMPRESSIBLE_TEXT_TYPES
+    return content_type in COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies.
+    
+    The coding is negotiated from Accept-Encoding. Bodies sent in one piece
+    are compressed only from `min_size` bytes on; streamed bodies (exports)
+    are compressed chunk by chunk. Compressed responses get a coding-specific
+    ETag ("abc-gzip"), which routers.conditional accepts wherever the
+    identity ETag is expected.
+    
+    Compressed bodies of responses with a strong ETag are kept in the
+    response cache under (coding, ETag), so repeated hits on a popular list
+    page or note skip the compressor. The ETag changes with the content, so
+    such entries never go stale.
+    """
+    
+    def __init__(self, app: ASGIApp, encoders: Dict[str, Callable], min_size: int = 1024, cache_ttl: Optional[float] = None):
+        self.app = app
+        self.encoders = encoders
+        self.codings: List[str] = list(encoders)
+        self.min_size = min_size
+        self.cache_ttl = cache_ttl
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.codings:
+            await self.app(scope, receive, send)
+            return
+        
+        request_headers = Headers(scope=scope)
+        coding = negotiate(request_headers.get("accept-encoding", ""), self.codings)
+        if scope["method"] == "HEAD":
+            coding = None
+        start: Optional[Message] = None
+        encoder = None
+        
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows the body's size
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is None:
+                # Headers already sent: pass through, or continue a stream
+                if encoder is not None:
+                    body = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+                    message = {"type": "http.response.body", "body": body, "more_body": more_body}
+                await send(message)
+                return
+            
+            headers = MutableHeaders(scope=start)
+            status = start["status"]
+            compressible = _compressible(headers) and "content-encoding" not in headers
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            
+            if status == 304 and coding is not None and etag:
+                # Echo the tag the client holds if it is the coded one
+                tag = coded_etag(etag, coding)
+                if tag in request_headers.get("if-none-match", ""):
+                    headers["ETag"] = tag
+            
+            if (
+                coding is None
+                or not compressible
+                or status in (204, 206, 304)
+                or (not more_body and len(body) < self.min_size)
+            ):
+                await send(start)
+                start = None
+                await send(message)
+                return
+            
+            headers["Content-Encoding"] = coding
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = coded_etag(etag, coding)
+            
+            if more_body:
+                encoder = self.encoders[coding]()
+                del headers["Content-Length"]
+                body = encoder.compress(body) + encoder.flush()
+            else:
+                body = self._compress_whole(body, coding, etag if status == 200 else None)
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            start = None
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+        
+        await self.app(scope, receive, send_compressed)
+    
+    def _compress_whole(self, body: bytes, coding: str, etag: Optional[str]) -> bytes:
+        """Compress a complete body, through the cache when it has a strong ETag"""
+        if not etag or etag.startswith("W/"):
+            encoder = self.encoders[coding]()
+            return encoder.compress(body) + encoder.finish()
+        
+        cache = get_cache()
+        key = compressed_key(coding, etag)
+        cached = cache.get(key)
+        if cached is not None:
+            # Stored as latin-1 text, which maps every byte to one character
+            return cached.encode("latin-1")
+        encoder = self.encoders[coding]()
+        compressed = encoder.compress(body) + encoder.finish()
+        cache.set(key, compressed.decode("latin-1"), self.cache_ttl)
+        return compressed
@@ -1,18 +1,228 @@
-from sqlalchemy import create_engine
+import os
+import threading
+from sqlalchemy import DateTime, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from sqlalchemy.sql.functions import FunctionElement, now
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
+from uuid import uuid4
 from config.settings import settings
+from config.instrumentation import instrument_engine
+from config.pool_metrics import PoolMetrics, instrumented_pool_class
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,  # Verify connections before using them
-    echo=settings.environment == "development"  # Log SQL in development
-)
 
-# Create SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQLite is supported for local development and tests. Its CURRENT_TIMESTAMP
+# has second precision and a different text format than the one SQLAlchemy
+# binds datetimes with, which breaks ordering and keyset comparisons, so
+# render now() in SQLAlchemy's own storage format instead.
+@compiles(now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+
+class seconds_ago(FunctionElement):
+    """now() minus a number of seconds, on the database clock: seconds_ago(10)"""
+    type = DateTime(timezone=True)
+    name = "seconds_ago"
+    inherit_cache = True
+
+
+@compiles(seconds_ago)
+def _seconds_ago(element, compiler, **kw):
+    return "(now() - make_interval(secs => %s))" % compiler.process(element.clauses, **kw)
+
+
+@compiles(seconds_ago, "sqlite")
+def _sqlite_seconds_ago(element, compiler, **kw):
+    return "(STRFTIME('%%Y-%%m-%%d %%H:%%M:%%f000', 'now', -(%s) || ' seconds'))" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_enable_foreign_keys(dbapi_connection, connection_record):
+    """Enforce foreign keys (and ON DELETE CASCADE) on SQLite connections"""
+    if "sqlite" in type(dbapi_connection).__module__:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def _engine_options(is_async: bool, metrics: PoolMetrics) -> Dict[str, Any]:
+    """
+    Build create_engine keyword arguments from the pool settings.
+    
+    Args:
+        is_async: Whether the options are for the async engine
+        metrics: Metrics instance that will receive checkout wait times
+        
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.environment == "development",  # Log SQL in development
+        "pool_pre_ping": settings.db_pool_pre_ping,  # Verify connections before using them
+    }
+    
+    if settings.db_pgbouncer_mode:
+        # PgBouncer owns the pooling; in transaction mode a server connection
+        # can change between statements, so named prepared statements break.
+        options["poolclass"] = instrumented_pool_class(NullPool, metrics)
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+    
+    base_pool = AsyncAdaptedQueuePool if is_async else QueuePool
+    pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    if not is_async and settings.database_mode == "async":
+        # Fallback pool next to the async one, for the sync-only endpoints
+        # (search, export, bulk writes)
+        pool_size = max_overflow = settings.db_sync_fallback_pool_size
+    options.update(
+        poolclass=instrumented_pool_class(base_pool, metrics),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+# Pool counters, exposed by GET /metrics/pool
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+# Engines are created on first use rather than at import: importing the
+# app then loads no database driver and allocates no pool, which keeps cold
+# starts short and leaves nothing to inherit across a fork.
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    Return the process-wide sync engine, creating it on first use.
+    
+    Returns:
+        Engine: SQLAlchemy engine for settings.database_url
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(settings.database_url, **_engine_options(False, pool_metrics))
+                pool_metrics.attach(engine.pool)
+                if settings.sql_instrumentation:
+                    instrument_engine(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """
+    Return the process-wide async engine, creating it on first use.
+    
+    Only available in async mode, so the asyncio driver is not required
+    otherwise.
+    
+    Returns:
+        AsyncEngine for settings.async_database_url, or None in sync mode
+    """
+    global _async_engine
+    if settings.database_mode != "async":
+        return None
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                async_engine = create_async_engine(
+                    settings.async_database_url,
+                    **_engine_options(True, async_pool_metrics)
+                )
+                async_pool_metrics.attach(async_engine.sync_engine.pool)
+                if settings.sql_instrumentation:
+                    instrument_engine(async_engine.sync_engine)
+                _async_engine = async_engine
+    return _async_engine
+
+
+class _LazyBindSession(Session):
+    """Session that binds to the sync engine when it first needs a connection"""
+    
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kw)
+
+
+class _LazyAsyncBindSession(Session):
+    """Sync half of an AsyncSession, bound to the async engine on first use"""
+    
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None:
+            self.bind = get_async_engine().sync_engine
+        return super().get_bind(mapper, **kw)
+
+
+def __getattr__(name: str) -> Any:
+    # `engine` and `async_engine` remain importable module attributes, but
+    # are only created when first accessed
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Create SessionLocal class for database sessions. Objects are not expired
+# on commit: repository writes return rows via RETURNING, and expiring them
+# would make serialization reload every note after the commit.
+SessionLocal = sessionmaker(class_=_LazyBindSession, autocommit=False, autoflush=False, expire_on_commit=False)
+
+# Async sessions, only available in async mode. expire_on_commit is
+# disabled because expired attributes cannot be lazily reloaded outside of
+# an await.
+AsyncSessionLocal = None
+if settings.database_mode == "async":
+    AsyncSessionLocal = async_sessionmaker(
+        sync_session_class=_LazyAsyncBindSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+def _reset_pools_after_fork() -> None:
+    """
+    Give a forked child process its own connection pools.
+    
+    Pre-forking servers (gunicorn with preload_app) import this module once
+    and fork workers from it, so every worker would inherit the parent's
+    pooled connections if the parent used an engine. close=False drops them
+    without closing the sockets, which still belong to the parent.
+    """
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection of the engines created so far (application shutdown)"""
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
 
 # Base class for all models
 Base = declarative_base()
@@ -33,10 +243,22 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session.
+    Used by the async routers when DATABASE_MODE=async.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     Initialize database by creating all tables.
     This should only be used in development.
     In production, use Alembic migrations.
     """
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
@@ -0,0 +1,299 @@
+import asyncio
+import functools
+import logging
+import re
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional, Set
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Incoming X-Request-ID values are reused only when they are this tame, so
+# they cannot inject anything into headers or log lines
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class QueryCounter:
+    """
+    Context manager recording every statement an engine sends to the database.
+    
+    Usage:
+        with QueryCounter(engine) as counter:
+            ...
+        print(counter.count, counter.statements)
+        
+    counter.parameters holds the parameters each statement was sent with,
+    so statements can be replayed (e.g. under EXPLAIN).
+    
+    For an AsyncEngine pass `async_engine.sync_engine`.
+    """
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+    
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+    
+    @property
+    def count(self) -> int:
+        """Number of statements executed so far"""
+        return len(self.statements)
+
+
+class RequestStats:
+    """
+    Statements and timings of the request being served.
+    
+    Collected by the engine listeners from instrument_engine() and the
+    InstrumentedRoute / ORJSONResponse hooks, reported by
+    RequestInstrumentationMiddleware. Database time is the time spent in
+    cursor.execute(), so it excludes fetching rows on drivers that stream
+    them.
+    """
+    
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.handler_done: Optional[float] = None
+        self.statements: Counter = Counter()
+        # Statements run once per chunk of a batch on purpose (executed with
+        # the "chunked" execution option)
+        self.chunked: Set[str] = set()
+    
+    @property
+    def query_count(self) -> int:
+        """Number of statements executed so far"""
+        return sum(self.statements.values())
+    
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value: db, serialize and total durations in ms.
+        
+        serialize is the time from the endpoint returning to the response
+        starting (validation, encoding) plus rendering done by the endpoint
+        itself (ORJSONResponse).
+        """
+        now = time.perf_counter()
+        serialize = self.serialize_seconds
+        if self.handler_done is not None:
+            serialize += now - self.handler_done
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.query_count} queries"',
+            f"serialize;dur={serialize * 1000:.1f}",
+            f"total;dur={(now - self.started) * 1000:.1f}",
+        ])
+    
+    def repeated_statements(self, threshold: int) -> List[tuple]:
+        """
+        (statement, count) for SELECTs executed at least `threshold` times.
+        
+        Writes are left out: bulk endpoints repeat their chunked INSERTs
+        and UPDATEs on purpose. So are SELECTs executed with the "chunked"
+        execution option, such as bulk lookups split into bounded IN-lists.
+        """
+        return [
+            (statement, count) for statement, count in self.statements.most_common()
+            if count >= threshold
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and statement not in self.chunked
+        ]
+
+
+# Set per request by RequestInstrumentationMiddleware. The stats object is
+# mutated in place, so updates made in threadpool workers (sync endpoints)
+# and SQLAlchemy's greenlets (async sessions) reach the middleware.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, or None outside of a request"""
+    return _request_stats.get()
+
+
+def redact(parameters: Any) -> str:
+    """
+    Describe statement parameters without their values.
+    
+    Values may hold note contents or other user data, so slow query logs
+    only show parameter names and types.
+    
+    Args:
+        parameters: Parameters passed to cursor.execute() / executemany()
+        
+    Returns:
+        e.g. "(UUID, int)" or "{title: str}"; executemany batches as a row count
+    """
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "()" if parameters is None else f"<{type(parameters).__name__}>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_seconds += elapsed
+        stats.statements[statement] += 1
+        if context is not None and context.execution_options.get("chunked"):
+            stats.chunked.add(statement)
+    
+    if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning(
+            "Slow query (%.1f ms, request %s): %s -- parameters: %s",
+            elapsed * 1000,
+            stats.request_id if stats is not None else "-",
+            " ".join(statement.split()),
+            redact(parameters)
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute does not run for failed statements
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement an engine executes.
+    
+    Statements count towards the current request's RequestStats, and
+    statements slower than SLOW_QUERY_MS are logged with redacted
+    parameters. For an AsyncEngine pass `async_engine.sync_engine`.
+    
+    Args:
+        engine: Engine to instrument
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def record_serialization(seconds: float) -> None:
+    """
+    Count rendering done by the endpoint itself towards serialize time.
+    
+    Rendering after the endpoint returned is already covered by the gap
+    between the endpoint returning and the response starting.
+    """
+    stats = _request_stats.get()
+    if stats is not None and stats.handler_done is None:
+        stats.serialize_seconds += seconds
+
+
+def _mark_handler_done(call: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _set_handler_done()
+        return async_endpoint
+    
+    @functools.wraps(call)
+    def endpoint(*args, **kwargs):
+        try:
+            return call(*args, **kwargs)
+        finally:
+            _set_handler_done()
+    return endpoint
+
+
+def _set_handler_done() -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.handler_done = time.perf_counter()
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute recording when its endpoint returns.
+    
+    Lets Server-Timing split the time spent in the endpoint from the time
+    spent validating and encoding its result. Use as
+    APIRouter(route_class=InstrumentedRoute).
+    """
+    
+    def get_route_handler(self) -> Callable:
+        self.dependant.call = _mark_handler_done(self.dependant.call)
+        return super().get_route_handler()
+
+
+class RequestInstrumentationMiddleware:
+    """
+    ASGI middleware collecting RequestStats for every HTTP request.
+    
+    Reuses the client's X-Request-ID (or generates one) and echoes it,
+    adds a Server-Timing header, and warns when one statement ran at least
+    `n_plus_one_threshold` times within the request, which usually means
+    something is loaded row by row instead of in one query.
+    """
+    
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 0):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = Headers(scope=scope).get("x-request-id", "")
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        stats = RequestStats(request_id)
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+        
+        token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _request_stats.reset(token)
+            if self.n_plus_one_threshold:
+                for statement, count in stats.repeated_statements(self.n_plus_one_threshold):
+                    logger.warning(
+                        "Possible N+1 query (request %s, %s %s): %d executions of %s",
+                        request_id,
+                        scope["method"],
+                        scope["path"],
+                        count,
+                        " ".join(statement.split())[:500]
+                    )
@@ -0,0 +1,106 @@
+import logging
+import time
+from contextlib import AsyncExitStack, ExitStack
+from uuid import UUID
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from config.database import get_async_engine, get_engine
+from config.settings import settings
+from repositories.async_category_repository import AsyncCategoryRepository
+from repositories.async_note_repository import AsyncNoteRepository
+from repositories.category_repository import CategoryRepository
+from repositories.note_repository import NoteRepository
+from services.payloads import NOTE_VIEWS
+
+
+logger = logging.getLogger(__name__)
+
+# Looked up by the warm-up reads; no note has it, so they return nothing
+WARM_UP_NOTE_ID = UUID(int=0)
+# The list filters the client sends most (all notes, and active notes)
+WARM_UP_ARCHIVED = (None, False)
+
+
+def _hot_reads(db: Session) -> None:
+    """The reads behind GET /api/notes, GET /api/notes/{id} and GET /api/categories"""
+    notes = NoteRepository(db)
+    for archived in WARM_UP_ARCHIVED:
+        notes.get_list_version(archived, None)
+        for fields in NOTE_VIEWS.values():
+            notes.get_page_rows(archived=archived, fields=fields)
+    notes.get_version(WARM_UP_NOTE_ID)
+    notes.get_by_id(WARM_UP_NOTE_ID)
+    CategoryRepository(db).get_all()
+
+
+async def _async_hot_reads(db: AsyncSession) -> None:
+    """_hot_reads() for the async repositories"""
+    notes = AsyncNoteRepository(db)
+    for archived in WARM_UP_ARCHIVED:
+        await notes.get_list_version(archived, None)
+        for fields in NOTE_VIEWS.values():
+            await notes.get_page_rows(archived=archived, fields=fields)
+    await notes.get_version(WARM_UP_NOTE_ID)
+    await notes.get_by_id(WARM_UP_NOTE_ID)
+    await AsyncCategoryRepository(db).get_all()
+
+
+def warm_up_engine(engine: Engine, connections: int, prepare: bool) -> None:
+    """
+    Open pooled connections and run the hot reads before serving.
+    
+    The first run compiles the statements into the engine's compiled cache,
+    which all connections share. All connections are held at once, so the
+    pool really opens `connections` of them; they return to the pool when
+    done. Every read happens in a transaction that is rolled back.
+    
+    Args:
+        engine: Engine to warm up
+        connections: Connections to open (normally the pool size)
+        prepare: Run the hot reads on every connection instead of the first
+            only, for drivers that prepare statements per connection
+    """
+    with ExitStack() as stack:
+        opened = [stack.enter_context(engine.connect()) for _ in range(connections)]
+        for index, connection in enumerate(opened):
+            if index == 0 or prepare:
+                with Session(bind=connection) as db:
+                    _hot_reads(db)
+
+
+async def warm_up_async_engine(engine: AsyncEngine, connections: int, prepare: bool) -> None:
+    """warm_up_engine() for an AsyncEngine; with asyncpg, `prepare` prepares the reads on every connection"""
+    async with AsyncExitStack() as stack:
+        opened = [await stack.enter_async_context(engine.connect()) for _ in range(connections)]
+        for index, connection in enumerate(opened):
+            if index == 0 or prepare:
+                async with AsyncSession(bind=connection) as db:
+                    await _async_hot_reads(db)
+
+
+async def warm_up_database() -> None:
+    """
+    Warm up the engine serving requests in the configured DATABASE_MODE.
+    
+    Failures are logged, not raised: a cold pool is slower, not broken, and
+    requests will report a database that is really unavailable.
+    """
+    # Without a client-side pool (PgBouncer mode) connections are not kept,
+    # so only compiling the statements is worth it
+    connections = 1 if settings.db_pgbouncer_mode else max(1, settings.db_pool_size)
+    prepare = settings.db_warmup_prepare and not settings.db_pgbouncer_mode
+    started = time.perf_counter()
+    try:
+        if settings.database_mode == "async":
+            await warm_up_async_engine(get_async_engine(), connections, prepare)
+        else:
+            await run_in_threadpool(warm_up_engine, get_engine(), connections, prepare)
+    except (SQLAlchemyError, OSError):
+        logger.warning("Database warm-up failed; serving with a cold pool", exc_info=True)
+        return
+    logger.info("Database warm-up: %d connections in %.0f ms", connections, (time.perf_counter() - started) * 1000)
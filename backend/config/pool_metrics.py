@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """
+    Counters for one connection pool, fed by pool events.
+    
+    Checkout wait time is measured around Pool.connect(), so it includes
+    queueing for a free connection, opening new connections and pre-ping.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Record how long one checkout took"""
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+    
+    def _increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def attach(self, pool: Pool) -> None:
+        """
+        Register event listeners on a pool.
+        
+        Listeners are carried over when the pool is recreated by
+        engine.dispose().
+        
+        Args:
+            pool: Pool to instrument
+        """
+        event.listen(pool, "connect", lambda *args: self._increment("connects"))
+        event.listen(pool, "checkout", lambda *args: self._increment("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._increment("checkins"))
+        event.listen(pool, "invalidate", lambda *args: self._increment("invalidations"))
+    
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Combine the counters with the pool's current gauges.
+        
+        Args:
+            pool: Pool the counters were collected from
+            
+        Returns:
+            Dictionary of pool statistics
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "pool_class": type(pool).__name__,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+        
+        # NullPool (PgBouncer mode) keeps no connections, so it has no gauges
+        for gauge in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, gauge, None)
+            stats[gauge] = method() if callable(method) else None
+        return stats
+
+
+class _TimedCheckoutMixin:
+    """Pool mixin that reports checkout latency to a PoolMetrics instance"""
+    
+    metrics: PoolMetrics
+    
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out)
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Create a pool class that times checkouts into `metrics`.
+    
+    The metrics live on the class so they survive pool recreation.
+    
+    Args:
+        base: Pool class to extend (e.g. QueuePool)
+        metrics: Metrics instance receiving the wait times
+        
+    Returns:
+        Instrumented subclass of `base`
+    """
+    return type(f"Instrumented{base.__name__}", (_TimedCheckoutMixin, base), {"metrics": metrics})
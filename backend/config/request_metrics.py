@@ -0,0 +1,152 @@
+import bisect
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Histogram upper bounds; +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+# Anything else is reported as OTHER, so arbitrary methods cannot add series
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+# Requests that matched no route (404s, CORS preflights)
+UNMATCHED = "unmatched"
+
+
+class _Histogram:
+    """Bucket counts (not cumulative), sum and count of observed values"""
+    
+    __slots__ = ("bounds", "counts", "sum", "count")
+    
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def samples(self, name: str, labels: str) -> List[str]:
+        """Exposition lines: cumulative buckets, _sum and _count"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum!r}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """
+    HTTP request counters and histograms, fed by RequestMetricsMiddleware.
+    
+    Series are keyed by method and route template (/api/notes/{note_id}),
+    never by the raw path, so their number is bounded by the routes the app
+    declares. Counts per status code are kept separately from the latency
+    and size histograms to keep the histogram series few.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], _Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], _Histogram] = {}
+    
+    def start(self) -> None:
+        """Count a request as in flight"""
+        with self._lock:
+            self.in_flight += 1
+    
+    def finish(self, method: str, route: str, status: int, seconds: float, size: int) -> None:
+        """Record a completed request"""
+        if method not in METHODS:
+            method = "OTHER"
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            latency = self.latency.get(key)
+            if latency is None:
+                latency = self.latency[key] = _Histogram(LATENCY_BUCKETS)
+                self.sizes[key] = _Histogram(SIZE_BUCKETS)
+            latency.observe(seconds)
+            self.sizes[key].observe(size)
+    
+    def exposition(self) -> List[str]:
+        """Prometheus text format lines for the request metrics"""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_in_flight Requests currently being served",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP http_requests_total Completed requests",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{_label(route)}",status="{status}"}} {count}')
+            
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Time from request start to the last response byte", self.latency),
+                ("http_response_size_bytes", "Response body size", self.sizes),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histogram in sorted(histograms.items()):
+                    lines.extend(histogram.samples(name, f'method="{method}",route="{_label(route)}"'))
+        return lines
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request in a RequestMetrics.
+    
+    The route template is read from the scope after the router matched it,
+    so it costs a dictionary lookup and two clock reads per request.
+    Latency covers the whole response, including streamed bodies.
+    """
+    
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status = 500
+        size = 0
+        
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+        
+        self.metrics.start()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path_format", None) or UNMATCHED
+            self.metrics.finish(scope["method"], route, status, time.perf_counter() - started, size)
+
+
+# Request metrics of this process, exposed by GET /metrics
+request_metrics = RequestMetrics()
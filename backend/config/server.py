@@ -0,0 +1,22 @@
+from types import FrameType
+from typing import Optional
+
+from uvicorn import Server
+
+
+class NotesServer(Server):
+    """
+    uvicorn server that ends the change event streams when shutdown starts.
+    
+    uvicorn waits for open connections (at most GRACEFUL_SHUTDOWN_TIMEOUT)
+    before running the application's shutdown, and event streams only end
+    when the client leaves. Closing the event hub on the exit signal lets
+    them finish at once, so the wait covers regular requests only.
+    """
+    
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        super().handle_exit(sig, frame)
+        # Imported here: gunicorn.conf.py imports this module before it
+        # settles EVENTS_BACKEND, and importing events builds the broker
+        from events import get_broker
+        get_broker().hub.close()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.workers import UvicornWorker
+
+from config.server import NotesServer
+from config.settings import settings
+
+
+def worker_count() -> int:
+    """Number of server processes: WEB_WORKERS, or one per CPU core available to this process"""
+    if settings.web_workers > 0:
+        return settings.web_workers
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+class NotesUvicornWorker(UvicornWorker):
+    """
+    Gunicorn worker serving the app with uvicorn.
+    
+    Uses the event loop and HTTP parser chosen by WEB_LOOP / WEB_HTTP
+    ("auto" picks uvloop and httptools when installed). Keep-alive, backlog
+    and max_requests are taken from the gunicorn configuration. Serves with
+    NotesServer, which waits at most GRACEFUL_SHUTDOWN_TIMEOUT for open
+    requests on shutdown.
+    """
+    
+    CONFIG_KWARGS = {
+        "loop": settings.web_loop,
+        "http": settings.web_http,
+        "server_header": False,
+        "timeout_graceful_shutdown": settings.graceful_shutdown_timeout,
+    }
+    
+    async def _serve(self) -> None:
+        # UvicornWorker._serve() with NotesServer instead of uvicorn's Server
+        self.config.app = self.wsgi
+        server = NotesServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
@@ -0,0 +1,56 @@
+from events.hub import EventHub, Subscription
+from events.base import EventBroker, LocalBroker, NullBroker
+from config.settings import settings
+
+
+def _build_broker() -> EventBroker:
+    hub = EventHub(queue_size=settings.events_queue_size)
+    if settings.events_backend == "memory":
+        return LocalBroker(hub)
+    if settings.events_backend == "postgres":
+        # Imported here so asyncpg is only loaded when this backend is used
+        from events.postgres import PostgresBroker
+        return PostgresBroker(hub, settings.database_url, settings.events_channel)
+    if settings.events_backend == "none":
+        return NullBroker(hub)
+    raise ValueError(
+        f"Unknown EVENTS_BACKEND '{settings.events_backend}' (expected 'memory', 'postgres' or 'none')"
+    )
+
+
+_broker: EventBroker = _build_broker()
+
+
+def get_broker() -> EventBroker:
+    """Return the process-wide change event broker used by the services"""
+    return _broker
+
+
+def set_broker(broker: EventBroker) -> None:
+    """
+    Replace the process-wide change event broker, e.g. with a fake in tests.
+    
+    Args:
+        broker: Broker to use from now on
+    """
+    global _broker
+    _broker = broker
+
+
+def __getattr__(name: str):
+    if name == "PostgresBroker":
+        from events.postgres import PostgresBroker
+        return PostgresBroker
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "EventHub",
+    "Subscription",
+    "EventBroker",
+    "LocalBroker",
+    "NullBroker",
+    "PostgresBroker",
+    "get_broker",
+    "set_broker"
+]
@@ -0,0 +1,55 @@
+from abc import ABC, abstractmethod
+
+from events.hub import EventHub, Subscription
+from schemas.event_schemas import ChangeEvent
+
+
+class EventBroker(ABC):
+    """
+    Interface for change event backends.
+    
+    Services publish through the broker; subscribers always read from the
+    local EventHub, which the broker feeds. publish() must not block and
+    must be safe to call from any thread.
+    """
+    
+    #: False for backends that never deliver anything
+    enabled: bool = True
+    
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+    
+    @abstractmethod
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Announce a change to every subscriber.
+        
+        Args:
+            event: Event to publish
+        """
+    
+    def subscribe(self) -> Subscription:
+        """Subscribe to the events delivered to this process"""
+        return self.hub.subscribe()
+    
+    async def start(self) -> None:
+        """Connect to external infrastructure; called on application startup"""
+    
+    async def stop(self) -> None:
+        """Release external resources; called on application shutdown"""
+
+
+class LocalBroker(EventBroker):
+    """Delivers events to subscribers of this process only (EVENTS_BACKEND=memory)"""
+    
+    def publish(self, event: ChangeEvent) -> None:
+        self.hub.publish(event)
+
+
+class NullBroker(EventBroker):
+    """Broker that drops every event (EVENTS_BACKEND=none)"""
+    
+    enabled = False
+    
+    def publish(self, event: ChangeEvent) -> None:
+        pass
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Optional, Set
+
+from schemas.event_schemas import ChangeEvent
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of events.
+    
+    A subscriber that lets its queue fill up is dropped by the hub: the
+    backlog is discarded and get() returns None, telling the consumer to
+    close the stream so the client reconnects and resyncs. The hub ends
+    every subscription the same way when the server shuts down.
+    """
+    
+    def __init__(self, hub: "EventHub", maxsize: int):
+        self._hub = hub
+        self._queue: "asyncio.Queue[Optional[ChangeEvent]]" = asyncio.Queue(maxsize)
+        self.dropped = False
+    
+    async def get(self) -> Optional[ChangeEvent]:
+        """
+        Wait for the next event.
+        
+        Returns:
+            Next event, or None once the subscriber has been dropped or the
+            hub closed
+        """
+        return await self._queue.get()
+    
+    def close(self) -> None:
+        """Stop receiving events"""
+        self._hub.unsubscribe(self)
+    
+    def _offer(self, event: ChangeEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    def _end(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class EventHub:
+    """
+    In-process fan-out of change events to asyncio subscribers.
+    
+    Subscribers live on the event loop that serves them; publish() may be
+    called from any thread (sync handlers run in the threadpool) and hands
+    the event over to that loop without blocking.
+    """
+    
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed = False
+        self.published = 0
+        self.dropped = 0
+    
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+    
+    def subscribe(self) -> Subscription:
+        """
+        Register a subscriber; must be called from the event loop.
+        
+        Returns:
+            Subscription receiving every event published from now on
+            (already ended once the hub is closed)
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self, self.queue_size)
+        if self.closed:
+            subscription._end()
+        else:
+            self._subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber; unknown subscribers are ignored"""
+        self._subscribers.discard(subscription)
+    
+    def close(self) -> None:
+        """
+        End every subscription, and those made later; must be called from
+        the event loop.
+        
+        Called when the server starts shutting down: event streams never end
+        on their own, so they would otherwise hold the shutdown until its
+        graceful timeout expires.
+        """
+        self.closed = True
+        for subscription in list(self._subscribers):
+            self.unsubscribe(subscription)
+            subscription._end()
+    
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Deliver an event to every subscriber.
+        
+        Args:
+            event: Event to deliver
+        """
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is loop:
+            self._dispatch(event)
+            return
+        try:
+            loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            # The loop has been closed (application shutting down)
+            pass
+    
+    def stats(self) -> dict:
+        """Subscriber and delivery counters"""
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped_subscribers": self.dropped,
+        }
+    
+    def _dispatch(self, event: ChangeEvent) -> None:
+        self.published += 1
+        for subscription in list(self._subscribers):
+            if not subscription._offer(event):
+                # Slow consumer: drop it rather than buffer without bound
+                self.unsubscribe(subscription)
+                subscription.dropped = True
+                subscription._end()
+                self.dropped += 1
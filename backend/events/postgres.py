@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Optional
+
+import asyncpg
+from pydantic import ValidationError
+from sqlalchemy.engine import make_url
+
+from events.base import EventBroker
+from events.hub import EventHub
+from schemas.event_schemas import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresBroker(EventBroker):
+    """
+    Broker sharing events between workers with PostgreSQL LISTEN/NOTIFY
+    (EVENTS_BACKEND=postgres).
+    
+    Each worker keeps one asyncpg connection that LISTENs on the channel and
+    also sends this worker's NOTIFYs, so every worker, the publisher
+    included, feeds its hub from the channel. The connection is re-opened
+    after failures; subscribers are sent a "resync" event when it comes
+    back, since notifications may have been missed meanwhile.
+    """
+    
+    #: Pending NOTIFYs kept while the connection is down
+    OUTBOX_SIZE = 10000
+    #: Seconds between checks of an idle connection
+    KEEPALIVE = 5.0
+    RETRY_DELAY = 2.0
+    
+    def __init__(self, hub: EventHub, database_url: str, channel: str):
+        super().__init__(hub)
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def publish(self, event: ChangeEvent) -> None:
+        loop = self._loop
+        if loop is None:
+            # Not started (scripts, tests); there is nobody to notify
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, event.model_dump_json())
+        except RuntimeError:
+            # The loop has been closed (application shutting down)
+            pass
+    
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue(self.OUTBOX_SIZE)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        self._loop = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def _enqueue(self, payload: str) -> None:
+        try:
+            self._outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("Event outbox full, dropping notification")
+    
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.hub.publish(ChangeEvent.model_validate_json(payload))
+        except ValidationError:
+            logger.warning("Ignoring malformed notification on %s", channel)
+    
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                self.hub.publish(ChangeEvent(type="resync"))
+                
+                while not lost.is_set():
+                    try:
+                        payload = await asyncio.wait_for(self._outbox.get(), self.KEEPALIVE)
+                    except asyncio.TimeoutError:
+                        continue
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+                raise ConnectionError("LISTEN connection closed")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("Event listener connection failed (%s), retrying in %ss", exc, self.RETRY_DELAY)
+                await asyncio.sleep(self.RETRY_DELAY)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
@@ -0,0 +1,50 @@
+# Gunicorn configuration for production: one uvicorn worker per CPU core.
+#
+#   gunicorn -c gunicorn.conf.py main:app
+#
+# Values come from the WEB_* settings (see config/settings.py), so they can
+# be tuned per environment file or environment variable.
+from config.settings import settings
+from config.workers import worker_count
+
+bind = f"0.0.0.0:{settings.port}"
+workers = worker_count()
+worker_class = "config.workers.NotesUvicornWorker"
+
+# The response cache is per process: with several workers, a write only
+# reaches the other workers' caches (and ETags) when their entries expire,
+# up to CACHE_TTL later. Keep it off there unless CACHE_BACKEND is set. The
+# workers are forked from this process, so they inherit the setting.
+if workers > 1 and "cache_backend" not in settings.model_fields_set:
+    settings.cache_backend = "none"
+
+# The "memory" events backend only reaches subscribers connected to the
+# worker that handled the write. With several workers, default to LISTEN/
+# NOTIFY on PostgreSQL and refuse to start otherwise.
+if workers > 1 and settings.events_backend == "memory":
+    if "events_backend" in settings.model_fields_set or not settings.database_url.startswith("postgresql"):
+        raise RuntimeError(
+            f"EVENTS_BACKEND=memory misses events across {workers} workers; "
+            "use EVENTS_BACKEND=postgres (PostgreSQL only) or none, or WEB_WORKERS=1"
+        )
+    settings.events_backend = "postgres"
+
+# Connections waiting to be accepted, and how long idle keep-alive
+# connections are kept open (keep it above the proxy's idle timeout when
+# running behind one that reuses upstream connections)
+backlog = settings.web_backlog
+keepalive = settings.web_keepalive
+
+# Restart each worker after max_requests (+ up to jitter) requests, which
+# bounds the effect of slow leaks and fragmentation
+max_requests = settings.web_max_requests
+max_requests_jitter = settings.web_max_requests_jitter
+
+timeout = settings.web_timeout
+graceful_timeout = settings.web_graceful_timeout
+
+# Import the app once before forking. Workers then share its memory pages;
+# config.database resets the connection pools in every forked worker.
+preload_app = settings.web_preload
+
+errorlog = "-"
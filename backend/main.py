@@ -1,8 +1,55 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from config.settings import settings
+from config.compression import CompressionMiddleware, build_encoders
+from config.database import SessionLocal, dispose_engines
+from config.instrumentation import InstrumentedRoute, RequestInstrumentationMiddleware
+from config.lifespan import warm_up_database
+from config.request_metrics import RequestMetricsMiddleware, request_metrics
+from repositories.category_repository import CategoryRepository
 from routers.notes import router as notes_router
 from routers.categories import router as categories_router
+from routers.metrics import router as metrics_router
+from routers.events import router as events_router
+from events import get_broker
+
+
+def rebuild_category_counters():
+    """
+    Resynchronize category_note_counts when counters are enabled.
+    
+    The table is not maintained while CATEGORY_COUNTERS is off, so it is
+    rebuilt once per start instead of trusting possibly stale rows.
+    """
+    db = SessionLocal()
+    try:
+        CategoryRepository(db).rebuild_note_counts()
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown.
+    
+    Startup rebuilds the category counters (if enabled), warms up the
+    database pool and connects the change event broker. Shutdown runs once
+    the server has let open requests finish (see config.server.NotesServer)
+    and disconnects the broker and closes the pools.
+    """
+    if settings.category_counters:
+        await run_in_threadpool(rebuild_category_counters)
+    if settings.db_warmup:
+        await warm_up_database()
+    # Connect the change event broker (LISTEN/NOTIFY with EVENTS_BACKEND=postgres)
+    await get_broker().start()
+    yield
+    await get_broker().stop()
+    await dispose_engines()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -10,9 +57,13 @@ app = FastAPI(
     description="Full Stack Notes Application with Archive and Categories",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
+# Routes declared on the app itself (/, /health) get the same timing hooks
+app.router.route_class = InstrumentedRoute
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -20,11 +71,81 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Request-ID"],
 )
 
+# Response compression (gzip, plus br / zstd when installed)
+if settings.compression_encodings_list:
+    app.add_middleware(
+        CompressionMiddleware,
+        encoders=build_encoders(
+            settings.compression_encodings_list,
+            settings.gzip_level,
+            settings.brotli_quality,
+            settings.zstd_level
+        ),
+        min_size=settings.compression_min_size,
+        cache_ttl=settings.cache_ttl
+    )
+
+# Request IDs, Server-Timing headers, N+1 warnings. Added after CORS so it
+# wraps it and CORS preflight responses are timed too.
+if settings.sql_instrumentation:
+    app.add_middleware(
+        RequestInstrumentationMiddleware,
+        n_plus_one_threshold=settings.n_plus_one_threshold
+    )
+
+# Prometheus request metrics, outermost so latency covers every layer
+if settings.request_metrics:
+    app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
+
+def sync_only_routes(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """
+    Build a router with the sync routes that have no async counterpart.
+    
+    Args:
+        sync_router: Router with the sync handlers
+        async_router: Router with the async handlers
+        
+    Returns:
+        Router holding the sync routes not covered by the async router
+    """
+    covered = {
+        (route.path_format, method)
+        for route in async_router.routes
+        for method in route.methods
+    }
+    fallback = APIRouter()
+    fallback.routes = [
+        route for route in sync_router.routes
+        if not any((route.path_format, method) in covered for method in route.methods)
+    ]
+    return fallback
+
+
 # Include routers
-app.include_router(notes_router)
-app.include_router(categories_router)
+if settings.database_mode == "async":
+    # Only imported in async mode: building the routes is a noticeable part
+    # of startup
+    from routers.async_notes import router as async_notes_router
+    from routers.async_categories import router as async_categories_router
+    
+    # Endpoints without an async implementation (search, export and the
+    # bulk writes) keep using the sync stack and its fallback pool (see
+    # db_sync_fallback_pool_size). They are registered first so their static
+    # paths are not captured by the async /{note_id} routes.
+    app.include_router(sync_only_routes(notes_router, async_notes_router))
+    app.include_router(async_notes_router)
+    app.include_router(sync_only_routes(categories_router, async_categories_router))
+    app.include_router(async_categories_router)
+else:
+    app.include_router(notes_router)
+    app.include_router(categories_router)
+
+app.include_router(metrics_router)
+app.include_router(events_router)
 
 
 @app.get("/")
@@ -34,6 +155,7 @@ def root():
         "message": "Notes API",
         "version": "1.0.0",
         "environment": settings.environment,
+        "database_mode": settings.database_mode,
         "docs": "/api/docs"
     }
 
@@ -49,9 +171,15 @@ def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=settings.port,
-        reload=settings.environment == "development"
-    )
+    from config.server import NotesServer
+    
+    options = {
+        "host": "0.0.0.0",
+        "port": settings.port,
+        "timeout_graceful_shutdown": settings.graceful_shutdown_timeout,
+    }
+    if settings.environment == "development":
+        # The reloader runs uvicorn's own server in a subprocess
+        uvicorn.run("main:app", reload=True, **options)
+    else:
+        NotesServer(uvicorn.Config(app, **options)).run()
@@ -1,4 +1,7 @@
 from models.note import Note, note_categories
 from models.category import Category
+from models.category_note_count import CategoryNoteCount
+from models.note_deletion import NoteDeletion
+import models.search  # noqa: F401  (registers full-text search DDL)
 
-__all__ = ["Note", "Category", "note_categories"]
+__all__ = ["Note", "Category", "CategoryNoteCount", "NoteDeletion", "note_categories"]
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Uuid
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from config.database import Base
@@ -20,7 +19,7 @@ class Category(Base):
     """
     __tablename__ = "categories"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String(100), unique=True, nullable=False, index=True)
     color = Column(String(7), nullable=True)  # Hex color code (e.g., #FF5733)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
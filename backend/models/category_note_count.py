@@ -0,0 +1,25 @@
+from sqlalchemy import Column, ForeignKey, Integer, Uuid
+from config.database import Base
+
+
+class CategoryNoteCount(Base):
+    """
+    Denormalized per-category note counts.
+    
+    Maintained by the repository write paths when CATEGORY_COUNTERS is
+    enabled, so listing categories with counts reads one row per category
+    instead of aggregating note_categories.
+    
+    Attributes:
+        category_id: Category the counts belong to
+        active_count: Number of non-archived notes in the category
+        archived_count: Number of archived notes in the category
+    """
+    __tablename__ = "category_note_counts"
+    
+    category_id = Column(Uuid, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    active_count = Column(Integer, nullable=False, default=0)
+    archived_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<CategoryNoteCount(category_id={self.category_id}, active={self.active_count}, archived={self.archived_count})>"
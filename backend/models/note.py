@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Table, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Table, ForeignKey, Index, Uuid, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from config.database import Base
@@ -10,8 +9,11 @@ import uuid
 note_categories = Table(
     'note_categories',
     Base.metadata,
-    Column('note_id', UUID(as_uuid=True), ForeignKey('notes.id', ondelete='CASCADE'), primary_key=True),
-    Column('category_id', UUID(as_uuid=True), ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True)
+    Column('note_id', Uuid, ForeignKey('notes.id', ondelete='CASCADE'), primary_key=True),
+    Column('category_id', Uuid, ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key leads with note_id; category filters and category
+    # deletes look links up by category_id
+    Index('ix_note_categories_category_id_note_id', 'category_id', 'note_id')
 )
 
 
@@ -30,19 +32,43 @@ class Note(Base):
     """
     __tablename__ = "notes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
-    is_archived = Column(Boolean, default=False, nullable=False, index=True)
+    is_archived = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
-    # Relationships
+    # Relationships. Categories are loaded with one SELECT ... IN per batch of
+    # notes unless a query picks another strategy (see NoteRepository)
     categories = relationship(
         "Category",
         secondary=note_categories,
         back_populates="notes",
-        lazy="joined"
+        lazy="selectin"
+    )
+    
+    __table_args__ = (
+        # Supports keyset pagination ordered by (created_at DESC, id DESC)
+        Index("ix_notes_created_at_id", "created_at", "id"),
+        # Same, within the archived or active notes (archived= list filter).
+        # The equality on is_archived leaves both groups in index order, so a
+        # partial (created_at DESC, id DESC) WHERE NOT is_archived index would
+        # duplicate it for active pages. It also answers COUNT(*) per group,
+        # which is why the single-column is_archived index was dropped (see
+        # benchmarks.explain: "list page, active", "count, active").
+        Index("ix_notes_is_archived_created_at_id", is_archived, created_at.desc(), id.desc()),
+        # COUNT / MAX(updated_at) over active notes behind the default list's
+        # ETag, answered from this small index alone
+        Index(
+            "ix_notes_active_updated_at_id",
+            "updated_at",
+            "id",
+            postgresql_where=(is_archived == false()),
+            sqlite_where=(is_archived == false())
+        ),
+        # Supports the changes feed ordered by (updated_at, id)
+        Index("ix_notes_updated_at_id", "updated_at", "id"),
     )
     
     def __repr__(self):
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Index, Uuid
+from sqlalchemy.sql import func
+from config.database import Base
+
+
+class NoteDeletion(Base):
+    """
+    Tombstone left behind by a deleted note.
+    
+    Written by the repository delete paths in the same transaction as the
+    DELETE, so delta sync clients can learn about notes that no longer exist.
+    
+    Attributes:
+        note_id: ID of the deleted note
+        deleted_at: Timestamp when the note was deleted
+    """
+    __tablename__ = "note_deletions"
+    
+    note_id = Column(Uuid, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # Supports the changes feed ordered by (deleted_at, note_id)
+        Index("ix_note_deletions_deleted_at_note_id", "deleted_at", "note_id"),
+    )
+    
+    def __repr__(self):
+        return f"<NoteDeletion(note_id={self.note_id}, deleted_at={self.deleted_at})>"
@@ -0,0 +1,66 @@
+from sqlalchemy import DDL, event
+from models.note import Note
+
+
+# Full-text search over note title and content.
+#
+# PostgreSQL: a stored tsvector generated column with a GIN index (title
+# weighted above content). SQLite: an external-content FTS5 table kept in sync
+# with triggers, so search can be exercised locally without PostgreSQL.
+#
+# Neither object is mapped on the Note model; they are created next to the
+# notes table by init_db() and by the Alembic migration, and queried by
+# NoteRepository.search().
+
+SEARCH_CONFIG = "english"
+
+POSTGRES_SEARCH_DDL = [
+    f"""
+    ALTER TABLE notes ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_notes_search_vector ON notes USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE notes_fts USING fts5(
+        title, content, content='notes', content_rowid='rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts(rowid, title, content)
+        VALUES (new.rowid, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_fts_delete AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content)
+        VALUES ('delete', old.rowid, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER notes_fts_update AFTER UPDATE OF title, content ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content)
+        VALUES ('delete', old.rowid, old.title, old.content);
+        INSERT INTO notes_fts(rowid, title, content)
+        VALUES (new.rowid, new.title, new.content);
+    END
+    """,
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Note.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Note.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Note.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS notes_fts").execute_if(dialect="sqlite")
+)
@@ -1,4 +1,6 @@
 from repositories.note_repository import NoteRepository
 from repositories.category_repository import CategoryRepository
+from repositories.async_note_repository import AsyncNoteRepository
+from repositories.async_category_repository import AsyncCategoryRepository
 
-__all__ = ["NoteRepository", "CategoryRepository"]
+__all__ = ["NoteRepository", "CategoryRepository", "AsyncNoteRepository", "AsyncCategoryRepository"]
@@ -0,0 +1,163 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Row
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+from models.note import note_categories
+from models.category import Category
+from config.settings import settings
+from repositories.category_repository import CategoryRepository
+
+
+class AsyncCategoryRepository:
+    """
+    Async repository layer for Category entity.
+    Mirrors CategoryRepository on top of an AsyncSession.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.counters_enabled = settings.category_counters
+    
+    async def get_all(self) -> List[Category]:
+        """
+        Get all categories.
+        
+        Returns:
+            List of all categories
+        """
+        result = await self.db.execute(select(Category).order_by(Category.name))
+        return list(result.scalars())
+    
+    async def get_all_with_counts(self) -> List[Tuple[Category, int, int]]:
+        """
+        Get all categories with their active and archived note counts.
+        
+        Returns:
+            List of (category, active count, archived count) tuples
+        """
+        result = await self.db.execute(CategoryRepository.with_counts_statement(self.counters_enabled))
+        return [tuple(row) for row in result]
+    
+    async def get_by_id(self, category_id: UUID) -> Optional[Category]:
+        """
+        Get a single category by ID.
+        
+        Args:
+            category_id: UUID of the category
+            
+        Returns:
+            Category if found, None otherwise
+        """
+        result = await self.db.execute(select(Category).filter(Category.id == category_id))
+        return result.scalars().first()
+    
+    async def get_rows_by_ids(self, category_ids: Sequence[UUID]) -> List[Row]:
+        """
+        Get several categories as plain rows, without building ORM objects.
+        
+        Args:
+            category_ids: UUIDs of the categories
+            
+        Returns:
+            (id, name, color, created_at) rows of the existing ones, by name
+        """
+        return list(await self.db.execute(CategoryRepository.rows_by_ids_statement(category_ids)))
+    
+    async def note_ids(self, category_id: UUID) -> List[UUID]:
+        """
+        Get the IDs of the notes linked to a category.
+        
+        Args:
+            category_id: UUID of the category
+            
+        Returns:
+            UUIDs of the category's notes
+        """
+        stmt = select(note_categories.c.note_id).where(note_categories.c.category_id == category_id)
+        return list((await self.db.execute(stmt)).scalars())
+    
+    async def get_by_name(self, name: str) -> Optional[Category]:
+        """
+        Get a category by name.
+        
+        Args:
+            name: Category name
+            
+        Returns:
+            Category if found, None otherwise
+        """
+        result = await self.db.execute(select(Category).filter(Category.name == name))
+        return result.scalars().first()
+    
+    async def create(self, name: str, color: Optional[str] = None) -> Category:
+        """
+        Create a new category.
+        
+        Args:
+            name: Category name
+            color: Optional hex color code
+            
+        Returns:
+            Created category
+        """
+        stmt = insert(Category).values(name=name, color=color).returning(Category)
+        category = (await self.db.execute(stmt)).scalars().one()
+        await self.db.commit()
+        return category
+    
+    async def update(
+        self,
+        category_id: UUID,
+        name: Optional[str] = None,
+        color: Optional[str] = None
+    ) -> Optional[Category]:
+        """
+        Update an existing category.
+        
+        Args:
+            category_id: UUID of the category to update
+            name: New name (optional)
+            color: New color (optional)
+            
+        Returns:
+            Updated category if found, None otherwise
+        """
+        values = {}
+        if name is not None:
+            values["name"] = name
+        if color is not None:
+            values["color"] = color
+        
+        if not values:
+            return await self.get_by_id(category_id)
+        
+        stmt = (
+            update(Category)
+            .where(Category.id == category_id)
+            .values(**values)
+            .returning(Category)
+            .execution_options(populate_existing=True)
+        )
+        category = (await self.db.execute(stmt)).scalars().first()
+        if category is not None:
+            await self.db.execute(CategoryRepository.touch_notes_statement(category_id))
+        await self.db.commit()
+        return category
+    
+    async def delete(self, category_id: UUID) -> bool:
+        """
+        Delete a category. Note links are removed by ON DELETE CASCADE.
+        
+        Args:
+            category_id: UUID of the category to delete
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        await self.db.execute(CategoryRepository.touch_notes_statement(category_id))
+        result = await self.db.execute(
+            delete(Category).where(Category.id == category_id).execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
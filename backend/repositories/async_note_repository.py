@@ -0,0 +1,412 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, noload
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.engine import Row
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+from uuid import UUID
+from models.note import Note, note_categories
+from models.category import Category
+from models.note_deletion import NoteDeletion
+from config.settings import settings
+from repositories.note_repository import CategoryLoading, NoteRepository
+from repositories.category_counters import CounterDeltas, link_counts
+
+
+class AsyncNoteRepository:
+    """
+    Async repository layer for Note entity.
+    Mirrors NoteRepository on top of an AsyncSession.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.counters_enabled = settings.category_counters
+        self.changes_lag = settings.changes_max_txn_lag
+    
+    async def get_all(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        loading: CategoryLoading = "selectin"
+    ) -> List[Note]:
+        """
+        Get all notes with optional filters.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            loading: How categories are loaded (see CategoryLoading)
+            
+        Returns:
+            List of notes matching the filters
+        """
+        stmt = NoteRepository.apply_filters(select(Note), archived, category_id)
+        stmt = stmt.options(NoteRepository.load_categories(loading))
+        result = await self.db.execute(stmt.order_by(Note.created_at.desc()))
+        return list(result.unique().scalars())
+    
+    async def get_page(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        loading: CategoryLoading = "selectin"
+    ) -> List[Note]:
+        """
+        Get one page of notes using keyset pagination on (created_at DESC, id DESC).
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            limit: Maximum number of notes to return
+            after: (created_at, id) of the last note of the previous page
+            loading: How categories are loaded (see CategoryLoading)
+            
+        Returns:
+            Up to `limit` notes following the `after` position
+        """
+        stmt = NoteRepository.apply_filters(select(Note), archived, category_id)
+        stmt = stmt.options(NoteRepository.load_categories(loading))
+        
+        if after is not None:
+            created_at, note_id = after
+            stmt = stmt.filter(tuple_(Note.created_at, Note.id) < tuple_(created_at, note_id))
+        
+        stmt = stmt.order_by(Note.created_at.desc(), Note.id.desc()).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.unique().scalars())
+    
+    async def count(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None
+    ) -> int:
+        """
+        Count notes matching the list filters.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            Number of matching notes
+        """
+        stmt = NoteRepository.apply_filters(select(func.count(Note.id)), archived, category_id)
+        return (await self.db.execute(stmt)).scalar_one()
+    
+    async def get_version(self, note_id: UUID, lock: bool = False) -> Optional[datetime]:
+        """
+        Get the updated_at of a note without loading it.
+        
+        Args:
+            note_id: UUID of the note
+            lock: Lock the row until the end of the transaction
+            
+        Returns:
+            updated_at if the note exists, None otherwise
+        """
+        stmt = select(Note.updated_at).where(Note.id == note_id)
+        if lock:
+            stmt = stmt.with_for_update()
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+    
+    async def get_list_version(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Summarize the notes matching the list filters for change detection.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            (number of matching notes, latest updated_at), or None while the
+            latest change is more recent than the transaction lag
+        """
+        stmt = NoteRepository.list_version_statement(archived, category_id, self.changes_lag)
+        count, latest, settled = (await self.db.execute(stmt)).one()
+        return (count, latest) if settled or latest is None else None
+    
+    async def get_page_rows(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
+        """
+        Get the page get_page() would return, as plain rows.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            limit: Maximum number of notes to return
+            after: (created_at, id) of the last note of the previous page
+            fields: Note columns to select; None selects all and categories
+            
+        Returns:
+            One row per note and category, for up to `limit` notes in
+            (created_at DESC, id DESC) order
+        """
+        stmt = NoteRepository.page_rows_statement(archived, category_id, limit, after, fields)
+        return list(await self.db.execute(stmt))
+    
+    async def get_category_links(self, note_ids: Sequence[UUID]) -> List[Row]:
+        """
+        Get the category links of several notes with one query on note_categories.
+        
+        Args:
+            note_ids: IDs of the notes
+            
+        Returns:
+            (note_id, category_id) rows
+        """
+        return list(await self.db.execute(NoteRepository.category_links_statement(note_ids)))
+    
+    async def get_changed_rows(self, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 500) -> List[Row]:
+        """
+        Get notes created or updated after a changes feed position, as plain
+        rows, leaving out the last CHANGES_MAX_TXN_LAG seconds (see
+        NoteRepository.get_changed_rows).
+        
+        Args:
+            after: (updated_at, id) of the last note already seen (None = from the start)
+            limit: Maximum number of notes to return
+            
+        Returns:
+            One row per note and category, for up to `limit` notes in
+            (updated_at, id) order
+        """
+        return list(await self.db.execute(NoteRepository.changed_rows_statement(after, limit, self.changes_lag)))
+    
+    async def get_deletions(self, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 500) -> List[NoteDeletion]:
+        """
+        Get tombstones of notes deleted after a changes feed position,
+        leaving out the last CHANGES_MAX_TXN_LAG seconds.
+        
+        Args:
+            after: (deleted_at, note_id) of the last tombstone already seen (None = from the start)
+            limit: Maximum number of tombstones to return
+            
+        Returns:
+            Up to `limit` tombstones, ordered by (deleted_at, note_id)
+        """
+        result = await self.db.execute(NoteRepository.deletions_statement(after, limit, self.changes_lag))
+        return list(result.scalars())
+    
+    async def get_by_id(self, note_id: UUID, loading: CategoryLoading = "joined") -> Optional[Note]:
+        """
+        Get a single note by ID.
+        
+        Args:
+            note_id: UUID of the note
+            loading: How categories are loaded (joined by default)
+            
+        Returns:
+            Note if found, None otherwise
+        """
+        stmt = select(Note).options(NoteRepository.load_categories(loading)).filter(Note.id == note_id)
+        result = await self.db.execute(stmt)
+        return result.unique().scalars().first()
+    
+    async def create(self, title: str, content: str) -> Note:
+        """
+        Create a new note with a single INSERT ... RETURNING.
+        
+        Args:
+            title: Note title
+            content: Note content
+            
+        Returns:
+            Created note
+        """
+        stmt = (
+            insert(Note)
+            .values(title=title, content=content, is_archived=False)
+            .returning(Note)
+            .options(noload(Note.categories))
+        )
+        note = (await self.db.execute(stmt)).unique().scalars().one()
+        await self.db.commit()
+        return note
+    
+    async def update(self, note_id: UUID, title: Optional[str] = None, content: Optional[str] = None) -> Optional[Note]:
+        """
+        Update an existing note.
+        
+        Args:
+            note_id: UUID of the note to update
+            title: New title (optional)
+            content: New content (optional)
+            
+        Returns:
+            Updated note if found, None otherwise
+        """
+        values = {}
+        if title is not None:
+            values["title"] = title
+        if content is not None:
+            values["content"] = content
+        
+        if not values:
+            return await self.get_by_id(note_id)
+        return await self._update_returning(note_id, values)
+    
+    async def delete(self, note_id: UUID) -> bool:
+        """
+        Delete a note. Category links are removed by ON DELETE CASCADE.
+        
+        Args:
+            note_id: UUID of the note to delete
+            
+        Returns:
+            True if deleted, False if not found
+        """
+        deltas = CounterDeltas()
+        if self.counters_enabled:
+            await self._lock_note(note_id)
+            deltas.add_rows(await self.db.execute(link_counts(note_categories.c.note_id == note_id)), sign=-1)
+        
+        await self.db.execute(NoteRepository.log_deletions_statement(Note.id == note_id))
+        result = await self.db.execute(
+            delete(Note).where(Note.id == note_id).execution_options(synchronize_session=False)
+        )
+        await self._flush_counters(deltas)
+        await self.db.commit()
+        return result.rowcount > 0
+    
+    async def archive(self, note_id: UUID) -> Optional[Note]:
+        """
+        Archive a note.
+        
+        Args:
+            note_id: UUID of the note to archive
+            
+        Returns:
+            Archived note if found, None otherwise
+        """
+        return await self._set_archived(note_id, True)
+    
+    async def unarchive(self, note_id: UUID) -> Optional[Note]:
+        """
+        Unarchive a note.
+        
+        Args:
+            note_id: UUID of the note to unarchive
+            
+        Returns:
+            Unarchived note if found, None otherwise
+        """
+        return await self._set_archived(note_id, False)
+    
+    async def add_category(self, note_id: UUID, category: Category) -> Optional[Note]:
+        """
+        Add a category to a note. Adding a category twice is a no-op.
+        
+        Args:
+            note_id: UUID of the note
+            category: Category object to add
+            
+        Returns:
+            Updated note if found, None otherwise
+        """
+        if self.counters_enabled:
+            await self._lock_note(note_id)
+        stmt = NoteRepository.link_categories_statement(self._dialect_name(), [note_id], [category.id])
+        result = await self.db.execute(stmt)
+        note = await self._touch_or_reload(note_id, result.rowcount > 0)
+        if self.counters_enabled and result.rowcount and note is not None:
+            deltas = CounterDeltas()
+            deltas.add(category.id, note.is_archived)
+            await self._flush_counters(deltas)
+        await self.db.commit()
+        return note
+    
+    async def remove_category(self, note_id: UUID, category: Category) -> Optional[Note]:
+        """
+        Remove a category from a note.
+        
+        Args:
+            note_id: UUID of the note
+            category: Category object to remove
+            
+        Returns:
+            Updated note if found, None otherwise
+        """
+        if self.counters_enabled:
+            await self._lock_note(note_id)
+        result = await self.db.execute(
+            delete(note_categories).where(
+                note_categories.c.note_id == note_id,
+                note_categories.c.category_id == category.id
+            )
+        )
+        note = await self._touch_or_reload(note_id, result.rowcount > 0)
+        if self.counters_enabled and result.rowcount and note is not None:
+            deltas = CounterDeltas()
+            deltas.add(category.id, note.is_archived, -1)
+            await self._flush_counters(deltas)
+        await self.db.commit()
+        return note
+    
+    def _dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+    
+    async def _touch_or_reload(self, note_id: UUID, changed: bool) -> Optional[Note]:
+        """Return a note after a link change, bumping updated_at if it changed"""
+        if not changed:
+            return await self._reload(note_id)
+        stmt = NoteRepository.update_statement(self._dialect_name(), note_id, {"updated_at": func.now()})
+        return (await self.db.execute(stmt)).unique().scalars().first()
+    
+    async def _reload(self, note_id: UUID) -> Optional[Note]:
+        """Load a note, overwriting any stale copy held by the session"""
+        stmt = (
+            select(Note)
+            .options(joinedload(Note.categories))
+            .filter(Note.id == note_id)
+            .execution_options(populate_existing=True)
+        )
+        return (await self.db.execute(stmt)).unique().scalars().first()
+    
+    async def _flush_counters(self, deltas: CounterDeltas) -> None:
+        """Apply pending category counter changes in the current transaction"""
+        params = deltas.params()
+        if params:
+            await self.db.execute(CounterDeltas.upsert_statement(self._dialect_name()), params)
+    
+    async def _lock_note(self, note_id: UUID) -> None:
+        """Lock a note row until commit, before a counter-maintaining write (see NoteRepository._lock_notes)"""
+        await self.db.execute(NoteRepository.lock_statement(self._dialect_name(), [note_id]))
+    
+    async def _set_archived(self, note_id: UUID, archived: bool) -> Optional[Note]:
+        """Set the archived flag of a note and return the note"""
+        if self.counters_enabled:
+            await self._lock_note(note_id)
+        stmt = NoteRepository.update_statement(
+            self._dialect_name(), note_id, {"is_archived": archived}, Note.is_archived != archived
+        )
+        note = (await self.db.execute(stmt)).unique().scalars().first()
+        if note is None:
+            # Missing, or already in the requested state
+            note = await self.get_by_id(note_id)
+        elif self.counters_enabled:
+            deltas = CounterDeltas()
+            for category in note.categories:
+                deltas.move(category.id, archived)
+            await self._flush_counters(deltas)
+        await self.db.commit()
+        return note
+    
+    async def _update_returning(self, note_id: UUID, values: Dict[str, Any]) -> Optional[Note]:
+        """Apply `values` to a note and return it, categories included"""
+        stmt = NoteRepository.update_statement(self._dialect_name(), note_id, values)
+        note = (await self.db.execute(stmt)).unique().scalars().first()
+        await self.db.commit()
+        return note
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, case, delete, exists, func, insert, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import Select
+
+from models.note import Note, note_categories
+from models.category import Category
+from models.category_note_count import CategoryNoteCount
+
+
+# Statement builders for the category_note_counts table, shared by the sync
+# and async repositories. Write paths collect (category, archived) deltas in a
+# CounterDeltas, computed with GROUP BY queries over the rows they are about to
+# touch, and flush them with one upsert before committing. They lock those
+# note rows first (NoteRepository.lock_statement), so a concurrent write to
+# the same notes cannot apply a delta computed from the same stale state.
+
+
+def note_count_columns(archived_column):
+    """Active/archived SUM(CASE ...) columns over the given is_archived column"""
+    return (
+        func.sum(case((archived_column.is_(False), 1), else_=0)).label("active_count"),
+        func.sum(case((archived_column.is_(True), 1), else_=0)).label("archived_count"),
+    )
+
+
+def link_counts(*conditions) -> Select:
+    """
+    Count existing note/category links by category and archived status.
+    
+    Args:
+        conditions: Filters on note_categories / notes selecting the links
+        
+    Returns:
+        SELECT yielding (category_id, is_archived, count) rows
+    """
+    return (
+        select(note_categories.c.category_id, Note.is_archived, func.count())
+        .join(Note, Note.id == note_categories.c.note_id)
+        .where(*conditions)
+        .group_by(note_categories.c.category_id, Note.is_archived)
+    )
+
+
+def missing_link_counts(note_ids: Sequence[UUID], category_ids: Sequence[UUID]) -> Select:
+    """
+    Count the links between `note_ids` and `category_ids` that do not exist yet.
+    
+    Args:
+        note_ids: UUIDs of the notes
+        category_ids: UUIDs of the categories
+        
+    Returns:
+        SELECT yielding (category_id, is_archived, count) rows
+    """
+    already_linked = exists().where(
+        note_categories.c.note_id == Note.id,
+        note_categories.c.category_id == Category.id
+    )
+    return (
+        select(Category.id, Note.is_archived, func.count())
+        .join_from(Note, Category, true())
+        .where(Note.id.in_(note_ids), Category.id.in_(category_ids), ~already_linked)
+        .group_by(Category.id, Note.is_archived)
+    )
+
+
+def rebuild_statements() -> List:
+    """
+    Statements recomputing the whole counter table from note_categories.
+    
+    Returns:
+        DELETE and INSERT ... SELECT statements, to run in one transaction
+    """
+    active_count, archived_count = note_count_columns(Note.is_archived)
+    totals = (
+        select(note_categories.c.category_id, active_count, archived_count)
+        .join(Note, Note.id == note_categories.c.note_id)
+        .group_by(note_categories.c.category_id)
+    )
+    return [
+        delete(CategoryNoteCount),
+        insert(CategoryNoteCount).from_select(["category_id", "active_count", "archived_count"], totals),
+    ]
+
+
+class CounterDeltas:
+    """Pending changes to category_note_counts, keyed by category"""
+    
+    def __init__(self):
+        self._deltas: Dict[UUID, List[int]] = defaultdict(lambda: [0, 0])
+    
+    def add(self, category_id: UUID, archived: bool, amount: int = 1) -> None:
+        """Count `amount` more (or fewer, if negative) notes in a category"""
+        self._deltas[category_id][1 if archived else 0] += amount
+    
+    def add_rows(self, rows: Iterable[Tuple[UUID, bool, int]], sign: int = 1) -> None:
+        """Add (category_id, is_archived, count) rows from link_counts()"""
+        for category_id, archived, amount in rows:
+            self.add(category_id, archived, sign * amount)
+    
+    def move(self, category_id: UUID, to_archived: bool, amount: int = 1) -> None:
+        """Move notes between the active and archived counts of a category"""
+        self.add(category_id, not to_archived, -amount)
+        self.add(category_id, to_archived, amount)
+    
+    def move_rows(self, rows: Iterable[Tuple[UUID, bool, int]], to_archived: bool) -> None:
+        """Move the notes of (category_id, is_archived, count) rows"""
+        for category_id, _, amount in rows:
+            self.move(category_id, to_archived, amount)
+    
+    def params(self) -> List[Dict]:
+        """Non-zero deltas as parameter sets for upsert_statement()"""
+        return [
+            {"cid": category_id, "active": active, "archived": archived}
+            for category_id, (active, archived) in self._deltas.items()
+            if active or archived
+        ]
+    
+    @staticmethod
+    def upsert_statement(dialect_name: str):
+        """
+        Build the INSERT ... ON CONFLICT DO UPDATE applying one delta.
+        
+        Args:
+            dialect_name: Name of the database dialect
+            
+        Returns:
+            Statement to execute with params()
+        """
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        table = CategoryNoteCount.__table__
+        stmt = dialect_insert(table).values(
+            category_id=bindparam("cid"),
+            active_count=bindparam("active"),
+            archived_count=bindparam("archived")
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.category_id],
+            set_={
+                "active_count": table.c.active_count + stmt.excluded.active_count,
+                "archived_count": table.c.archived_count + stmt.excluded.archived_count,
+            }
+        )
@@ -1,7 +1,14 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Row
+from typing import List, Optional, Sequence, Set, Tuple
 from uuid import UUID
+from models.note import Note, note_categories
 from models.category import Category
+from models.category_note_count import CategoryNoteCount
+from config.settings import settings
+from repositories.category_counters import note_count_columns, rebuild_statements
+from repositories.note_repository import NoteRepository
 
 
 class CategoryRepository:
@@ -12,6 +19,7 @@ class CategoryRepository:
     
     def __init__(self, db: Session):
         self.db = db
+        self.counters_enabled = settings.category_counters
     
     def get_all(self) -> List[Category]:
         """
@@ -22,6 +30,66 @@ class CategoryRepository:
         """
         return self.db.query(Category).order_by(Category.name).all()
     
+    def get_all_with_counts(self) -> List[Tuple[Category, int, int]]:
+        """
+        Get all categories with their active and archived note counts.
+        
+        Returns:
+            List of (category, active count, archived count) tuples
+        """
+        return [tuple(row) for row in self.db.execute(self.with_counts_statement(self.counters_enabled))]
+    
+    def rebuild_note_counts(self) -> None:
+        """Recompute the category_note_counts table from note_categories"""
+        for stmt in rebuild_statements():
+            self.db.execute(stmt)
+        self.db.commit()
+    
+    # Statement builders below are shared with AsyncCategoryRepository
+    
+    @staticmethod
+    def rows_by_ids_statement(category_ids: Sequence[UUID]):
+        """SELECT of the columns of `category_ids`, ordered by name"""
+        return (
+            select(Category.id, Category.name, Category.color, Category.created_at)
+            .where(Category.id.in_(category_ids))
+            .order_by(Category.name)
+        )
+    
+    @staticmethod
+    def touch_notes_statement(category_id: UUID):
+        """Bump updated_at of the notes embedding a category that is changing"""
+        linked = select(note_categories.c.note_id).where(note_categories.c.category_id == category_id)
+        return NoteRepository.touch_statement(Note.id.in_(linked))
+    
+    @staticmethod
+    def with_counts_statement(from_counters: bool):
+        """
+        Build the categories-with-counts query.
+        
+        Args:
+            from_counters: Read the maintained counter table instead of
+                aggregating note_categories with a GROUP BY
+                
+        Returns:
+            SELECT yielding (Category, active count, archived count) rows
+        """
+        if from_counters:
+            counts = CategoryNoteCount.__table__
+        else:
+            active_count, archived_count = note_count_columns(Note.is_archived)
+            counts = (
+                select(note_categories.c.category_id, active_count, archived_count)
+                .join(Note, Note.id == note_categories.c.note_id)
+                .group_by(note_categories.c.category_id)
+                .subquery()
+            )
+        return (
+            select(Category, func.coalesce(counts.c.active_count, 0), func.coalesce(counts.c.archived_count, 0))
+            .outerjoin(counts, counts.c.category_id == Category.id)
+            .order_by(Category.name)
+        )
+    
     def get_by_id(self, category_id: UUID) -> Optional[Category]:
         """
         Get a single category by ID.
@@ -34,6 +102,45 @@ class CategoryRepository:
         """
         return self.db.query(Category).filter(Category.id == category_id).first()
     
+    def get_rows_by_ids(self, category_ids: Sequence[UUID]) -> List[Row]:
+        """
+        Get several categories as plain rows, without building ORM objects.
+        
+        Args:
+            category_ids: UUIDs of the categories
+            
+        Returns:
+            (id, name, color, created_at) rows of the existing ones, by name
+        """
+        return list(self.db.execute(self.rows_by_ids_statement(category_ids)))
+    
+    def existing_ids(self, category_ids: Sequence[UUID]) -> Set[UUID]:
+        """
+        Return which of the given category IDs exist.
+        
+        Args:
+            category_ids: UUIDs to look up
+            
+        Returns:
+            Subset of `category_ids` present in the database
+        """
+        if not category_ids:
+            return set()
+        return set(self.db.execute(select(Category.id).where(Category.id.in_(category_ids))).scalars())
+    
+    def note_ids(self, category_id: UUID) -> List[UUID]:
+        """
+        Get the IDs of the notes linked to a category.
+        
+        Args:
+            category_id: UUID of the category
+            
+        Returns:
+            UUIDs of the category's notes
+        """
+        stmt = select(note_categories.c.note_id).where(note_categories.c.category_id == category_id)
+        return list(self.db.execute(stmt).scalars())
+    
     def get_by_name(self, name: str) -> Optional[Category]:
         """
         Get a category by name.
@@ -57,10 +164,9 @@ class CategoryRepository:
         Returns:
             Created category
         """
-        category = Category(name=name, color=color)
-        self.db.add(category)
+        stmt = insert(Category).values(name=name, color=color).returning(Category)
+        category = self.db.execute(stmt).scalars().one()
         self.db.commit()
-        self.db.refresh(category)
         return category
     
     def update(
@@ -80,22 +186,31 @@ class CategoryRepository:
         Returns:
             Updated category if found, None otherwise
         """
-        category = self.get_by_id(category_id)
-        if not category:
-            return None
-        
+        values = {}
         if name is not None:
-            category.name = name
+            values["name"] = name
         if color is not None:
-            category.color = color
+            values["color"] = color
         
+        if not values:
+            return self.get_by_id(category_id)
+        
+        stmt = (
+            update(Category)
+            .where(Category.id == category_id)
+            .values(**values)
+            .returning(Category)
+            .execution_options(populate_existing=True)
+        )
+        category = self.db.execute(stmt).scalars().first()
+        if category is not None:
+            self.db.execute(self.touch_notes_statement(category_id))
         self.db.commit()
-        self.db.refresh(category)
         return category
     
     def delete(self, category_id: UUID) -> bool:
         """
-        Delete a category.
+        Delete a category. Note links are removed by ON DELETE CASCADE.
         
         Args:
             category_id: UUID of the category to delete
@@ -103,10 +218,9 @@ class CategoryRepository:
         Returns:
             True if deleted, False if not found
         """
-        category = self.get_by_id(category_id)
-        if not category:
-            return False
-        
-        self.db.delete(category)
+        self.db.execute(self.touch_notes_statement(category_id))
+        result = self.db.execute(
+            delete(Category).where(Category.id == category_id).execution_options(synchronize_session=False)
+        )
         self.db.commit()
-        return True
+        return result.rowcount > 0
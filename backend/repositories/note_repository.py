@@ -1,9 +1,24 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from uuid import UUID
-from models.note import Note
+from sqlalchemy.orm import Session, Query, aliased, joinedload, noload, selectinload
+from sqlalchemy import and_, case, delete, func, insert, literal, literal_column, or_, select, table, true, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Set, Tuple
+from datetime import datetime
+from uuid import UUID, uuid4
+from models.note import Note, note_categories
 from models.category import Category
+from models.note_deletion import NoteDeletion
+from models.search import SEARCH_CONFIG
+from config.database import seconds_ago
+from config.settings import settings
+from repositories.category_counters import CounterDeltas, link_counts, missing_link_counts
+
+
+# How a query loads Note.categories: "selectin" (one extra SELECT ... IN per
+# batch of notes), "joined" (LEFT OUTER JOIN in the same statement, repeating
+# the note row once per category) or "noload" (left empty, for callers that
+# never read the categories)
+CategoryLoading = Literal["selectin", "joined", "noload"]
 
 
 class NoteRepository:
@@ -12,13 +27,74 @@ class NoteRepository:
     Handles all database operations for notes.
     """
     
+    # Rows per multi-row INSERT / IN-list in bulk writes and lookups, kept
+    # well under the bind parameter limits of PostgreSQL and SQLite. Chunked
+    # SELECTs carry the "chunked" execution option, so the request
+    # instrumentation does not report their repetition as an N+1 pattern.
+    BULK_CHUNK_SIZE = 500
+    
+    # Columns returned by the row queries (get_page_rows, get_changed_rows),
+    # which skip ORM objects so responses can be serialized straight from rows
+    NOTE_ROW_COLUMNS = (Note.id, Note.title, Note.content, Note.is_archived, Note.created_at, Note.updated_at)
+    
+    # Characters of content returned as the "snippet" row column
+    SNIPPET_LENGTH = 200
+    
+    CATEGORY_LOADERS = {"selectin": selectinload, "joined": joinedload, "noload": noload}
+    
     def __init__(self, db: Session):
         self.db = db
+        self.counters_enabled = settings.category_counters
+        self.changes_lag = settings.changes_max_txn_lag
     
-    def get_all(
+    @staticmethod
+    def apply_filters(query, archived: Optional[bool], category_id: Optional[UUID]):
+        """
+        Apply the standard list filters to a Query or a select() statement.
+        
+        Args:
+            query: Query or Select over notes
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            The filtered query or statement
+        """
+        if archived is not None:
+            query = query.filter(Note.is_archived == archived)
+        
+        if category_id is not None:
+            query = query.join(Note.categories).filter(Category.id == category_id)
+        
+        return query
+    
+    @classmethod
+    def load_categories(cls, loading: CategoryLoading, entity: Any = Note):
+        """Loader option for the categories of `entity` (Note or an alias of it)"""
+        return cls.CATEGORY_LOADERS[loading](entity.categories)
+    
+    def _filtered_query(
         self,
         archived: Optional[bool] = None,
         category_id: Optional[UUID] = None
+    ) -> Query:
+        """
+        Build a note query with the standard list filters applied.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            Query over notes matching the filters
+        """
+        return self.apply_filters(self.db.query(Note), archived, category_id)
+    
+    def get_all(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        loading: CategoryLoading = "selectin"
     ) -> List[Note]:
         """
         Get all notes with optional filters.
@@ -26,35 +102,312 @@ class NoteRepository:
         Args:
             archived: Filter by archived status (None = all notes)
             category_id: Filter by category ID
+            loading: How categories are loaded (see CategoryLoading)
             
         Returns:
             List of notes matching the filters
         """
-        query = self.db.query(Note)
+        query = self._filtered_query(archived=archived, category_id=category_id)
+        return query.options(self.load_categories(loading)).order_by(Note.created_at.desc()).all()
+    
+    def get_page(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        loading: CategoryLoading = "selectin"
+    ) -> List[Note]:
+        """
+        Get one page of notes using keyset pagination on (created_at DESC, id DESC).
         
-        if archived is not None:
-            query = query.filter(Note.is_archived == archived)
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            limit: Maximum number of notes to return
+            after: (created_at, id) of the last note of the previous page
+            loading: How categories are loaded (see CategoryLoading)
+            
+        Returns:
+            Up to `limit` notes following the `after` position
+        """
+        query = self._filtered_query(archived=archived, category_id=category_id)
+        query = query.options(self.load_categories(loading))
         
-        if category_id is not None:
-            query = query.join(Note.categories).filter(Category.id == category_id)
+        if after is not None:
+            created_at, note_id = after
+            query = query.filter(tuple_(Note.created_at, Note.id) < tuple_(created_at, note_id))
         
-        return query.order_by(Note.created_at.desc()).all()
+        return (
+            query.order_by(Note.created_at.desc(), Note.id.desc())
+            .limit(limit)
+            .all()
+        )
     
-    def get_by_id(self, note_id: UUID) -> Optional[Note]:
+    def get_page_rows(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Row]:
         """
-        Get a single note by ID.
+        Get the page get_page() would return, as plain rows.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            limit: Maximum number of notes to return
+            after: (created_at, id) of the last note of the previous page
+            fields: Note columns to select (see _row_columns); None selects
+                NOTE_ROW_COLUMNS and categories
+                
+        Returns:
+            One row per note and category (see _with_category_rows), for up
+            to `limit` notes in (created_at DESC, id DESC) order; one row per
+            note when "categories" is not among `fields`
+        """
+        return list(self.db.execute(self.page_rows_statement(archived, category_id, limit, after, fields)))
+    
+    def get_changed_rows(self, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 500) -> List[Row]:
+        """
+        Get notes created or updated after a changes feed position, as plain rows.
+        
+        Notes updated within the last CHANGES_MAX_TXN_LAG seconds are left
+        for a later call: updated_at is the start time of the writing
+        transaction, which may still commit after newer rows are returned.
+        
+        Args:
+            after: (updated_at, id) of the last note already seen (None = from the start)
+            limit: Maximum number of notes to return
+            
+        Returns:
+            One row per note and category (see _with_category_rows), for up
+            to `limit` notes in (updated_at, id) order
+        """
+        return list(self.db.execute(self.changed_rows_statement(after, limit, self.changes_lag)))
+    
+    def get_category_links(self, note_ids: Sequence[UUID]) -> List[Row]:
+        """
+        Get the category links of several notes with one query on note_categories.
+        
+        Args:
+            note_ids: IDs of the notes
+            
+        Returns:
+            (note_id, category_id) rows
+        """
+        return list(self.db.execute(self.category_links_statement(note_ids)))
+    
+    def get_deletions(self, after: Optional[Tuple[datetime, UUID]] = None, limit: int = 500) -> List[NoteDeletion]:
+        """
+        Get tombstones of notes deleted after a changes feed position.
+        
+        Tombstones younger than CHANGES_MAX_TXN_LAG seconds are left for a
+        later call, as in get_changed_rows().
+        
+        Args:
+            after: (deleted_at, note_id) of the last tombstone already seen (None = from the start)
+            limit: Maximum number of tombstones to return
+            
+        Returns:
+            Up to `limit` tombstones, ordered by (deleted_at, note_id)
+        """
+        return list(self.db.execute(self.deletions_statement(after, limit, self.changes_lag)).scalars())
+    
+    def iter_all(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Note]:
+        """
+        Stream all notes matching the filters through a server-side cursor.
+        
+        Rows are fetched `batch_size` at a time, so memory stays flat no matter
+        how many notes match. Categories are loaded per batch with selectin
+        loading, since joined eager loading cannot be combined with yield_per.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            batch_size: Number of rows fetched per round-trip
+            
+        Yields:
+            Notes matching the filters, newest first
+        """
+        stmt = (
+            self.apply_filters(select(Note), archived, category_id)
+            .options(selectinload(Note.categories))
+            .order_by(Note.created_at.desc(), Note.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.db.execute(stmt).scalars()
+    
+    def search(
+        self,
+        text: str,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 20,
+        offset: int = 0,
+        loading: CategoryLoading = "selectin"
+    ) -> List[Tuple[Note, float]]:
+        """
+        Full-text search over note titles and contents, best matches first.
+        
+        Uses the tsvector column and ts_rank on PostgreSQL and the FTS5 table
+        with bm25 on SQLite. Other databases fall back to ILIKE term matching,
+        ranked by the number of terms found in the title.
+        
+        Args:
+            text: User search query
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            limit: Maximum number of results
+            offset: Number of results to skip
+            loading: How categories are loaded (see CategoryLoading)
+            
+        Returns:
+            List of (note, rank) pairs; a higher rank is a better match
+        """
+        if not text.split():
+            # No terms: FTS5 rejects an empty MATCH, and the ILIKE fallback
+            # would match every note
+            return []
+        
+        dialect = self._dialect_name()
+        
+        if dialect == "postgresql":
+            search_vector = literal_column("notes.search_vector")
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+            rank = func.ts_rank(search_vector, ts_query)
+            stmt = select(Note, rank.label("rank")).filter(search_vector.op("@@")(ts_query))
+        elif dialect == "sqlite":
+            notes_fts = table("notes_fts")
+            # bm25() is lower for better matches; negate it so higher is better
+            rank = -func.bm25(literal_column("notes_fts"))
+            stmt = (
+                select(Note, rank.label("rank"))
+                .join(notes_fts, literal_column("notes_fts.rowid") == literal_column("notes.rowid"))
+                .filter(literal_column("notes_fts").op("MATCH")(self._fts5_query(text)))
+            )
+        else:
+            # No full-text index: every term must appear in the title or the
+            # content, and notes matching more terms in the title rank first
+            conditions, title_hits = [], []
+            for pattern in self._ilike_patterns(text):
+                in_title = Note.title.ilike(pattern, escape="\\")
+                conditions.append(or_(in_title, Note.content.ilike(pattern, escape="\\")))
+                title_hits.append(case((in_title, 1.0), else_=0.0))
+            rank = sum(title_hits, literal(0.0))
+            stmt = select(Note, rank.label("rank")).filter(and_(true(), *conditions))
+        
+        stmt = (
+            self.apply_filters(stmt, archived, category_id)
+            .options(self.load_categories(loading))
+            .order_by(rank.desc(), Note.created_at.desc(), Note.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return [(note, float(score)) for note, score in self.db.execute(stmt).unique().all()]
+    
+    @staticmethod
+    def _fts5_query(text: str) -> str:
+        """Quote each term so user input is never parsed as FTS5 query syntax"""
+        terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+        return " ".join(terms)
+    
+    @staticmethod
+    def _ilike_patterns(text: str) -> List[str]:
+        """ILIKE patterns matching each term literally, with % and _ escaped"""
+        terms = [term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") for term in text.split()]
+        return [f"%{term}%" for term in terms]
+    
+    def count(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None
+    ) -> int:
+        """
+        Count notes matching the list filters.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            Number of matching notes
+        """
+        query = self._filtered_query(archived=archived, category_id=category_id)
+        return query.order_by(None).count()
+    
+    def get_version(self, note_id: UUID, lock: bool = False) -> Optional[datetime]:
+        """
+        Get the updated_at of a note without loading it.
         
         Args:
             note_id: UUID of the note
+            lock: Lock the row until the end of the transaction (SELECT ... FOR
+                UPDATE), so a following write cannot race a concurrent one
+                
+        Returns:
+            updated_at if the note exists, None otherwise
+        """
+        stmt = select(Note.updated_at).where(Note.id == note_id)
+        if lock:
+            stmt = stmt.with_for_update()
+        return self.db.execute(stmt).scalar_one_or_none()
+    
+    def get_list_version(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Summarize the notes matching the list filters for change detection.
+        
+        Any insert, update or delete among the matching notes changes the
+        count or the latest updated_at, provided no transaction commits a
+        row older than that latest updated_at afterwards. updated_at is the
+        transaction start time, so that only holds once the latest change is
+        older than the maximum transaction lag (see changes_lag).
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
             
+        Returns:
+            (number of matching notes, latest updated_at), or None while the
+            latest change is more recent than the transaction lag
+        """
+        stmt = self.list_version_statement(archived, category_id, self.changes_lag)
+        count, latest, settled = self.db.execute(stmt).one()
+        return (count, latest) if settled or latest is None else None
+    
+    def get_by_id(self, note_id: UUID, loading: CategoryLoading = "joined") -> Optional[Note]:
+        """
+        Get a single note by ID.
+        
+        Args:
+            note_id: UUID of the note
+            loading: How categories are loaded; a single note joins them in
+                the same statement by default
+                
         Returns:
             Note if found, None otherwise
         """
-        return self.db.query(Note).filter(Note.id == note_id).first()
+        return (
+            self.db.query(Note)
+            .options(self.load_categories(loading))
+            .filter(Note.id == note_id)
+            .first()
+        )
     
     def create(self, title: str, content: str) -> Note:
         """
-        Create a new note.
+        Create a new note with a single INSERT ... RETURNING.
         
         Args:
             title: Note title
@@ -63,10 +416,14 @@ class NoteRepository:
         Returns:
             Created note
         """
-        note = Note(title=title, content=content, is_archived=False)
-        self.db.add(note)
+        stmt = (
+            insert(Note)
+            .values(title=title, content=content, is_archived=False)
+            .returning(Note)
+            .options(noload(Note.categories))
+        )
+        note = self.db.execute(stmt).unique().scalars().one()
         self.db.commit()
-        self.db.refresh(note)
         return note
     
     def update(self, note_id: UUID, title: Optional[str] = None, content: Optional[str] = None) -> Optional[Note]:
@@ -81,22 +438,19 @@ class NoteRepository:
         Returns:
             Updated note if found, None otherwise
         """
-        note = self.get_by_id(note_id)
-        if not note:
-            return None
-        
+        values = {}
         if title is not None:
-            note.title = title
+            values["title"] = title
         if content is not None:
-            note.content = content
+            values["content"] = content
         
-        self.db.commit()
-        self.db.refresh(note)
-        return note
+        if not values:
+            return self.get_by_id(note_id)
+        return self._update_returning(note_id, values)
     
     def delete(self, note_id: UUID) -> bool:
         """
-        Delete a note.
+        Delete a note. Category links are removed by ON DELETE CASCADE.
         
         Args:
             note_id: UUID of the note to delete
@@ -104,13 +458,18 @@ class NoteRepository:
         Returns:
             True if deleted, False if not found
         """
-        note = self.get_by_id(note_id)
-        if not note:
-            return False
+        deltas = CounterDeltas()
+        if self.counters_enabled:
+            self._lock_notes([note_id])
+            deltas.add_rows(self.db.execute(link_counts(note_categories.c.note_id == note_id)), sign=-1)
         
-        self.db.delete(note)
+        self.db.execute(self.log_deletions_statement(Note.id == note_id))
+        result = self.db.execute(
+            delete(Note).where(Note.id == note_id).execution_options(synchronize_session=False)
+        )
+        self._flush_counters(deltas)
         self.db.commit()
-        return True
+        return result.rowcount > 0
     
     def archive(self, note_id: UUID) -> Optional[Note]:
         """
@@ -122,14 +481,7 @@ class NoteRepository:
         Returns:
             Archived note if found, None otherwise
         """
-        note = self.get_by_id(note_id)
-        if not note:
-            return None
-        
-        note.is_archived = True
-        self.db.commit()
-        self.db.refresh(note)
-        return note
+        return self._set_archived(note_id, True)
     
     def unarchive(self, note_id: UUID) -> Optional[Note]:
         """
@@ -141,19 +493,15 @@ class NoteRepository:
         Returns:
             Unarchived note if found, None otherwise
         """
-        note = self.get_by_id(note_id)
-        if not note:
-            return None
-        
-        note.is_archived = False
-        self.db.commit()
-        self.db.refresh(note)
-        return note
+        return self._set_archived(note_id, False)
     
     def add_category(self, note_id: UUID, category: Category) -> Optional[Note]:
         """
         Add a category to a note.
         
+        The link is inserted with INSERT ... SELECT ... ON CONFLICT DO NOTHING,
+        so adding a category twice is a no-op and no prior load is needed.
+        
         Args:
             note_id: UUID of the note
             category: Category object to add
@@ -161,15 +509,15 @@ class NoteRepository:
         Returns:
             Updated note if found, None otherwise
         """
-        note = self.get_by_id(note_id)
-        if not note:
-            return None
-        
-        if category not in note.categories:
-            note.categories.append(category)
-            self.db.commit()
-            self.db.refresh(note)
-        
+        if self.counters_enabled:
+            self._lock_notes([note_id])
+        result = self.db.execute(self.link_categories_statement(self._dialect_name(), [note_id], [category.id]))
+        note = self._touch_or_reload(note_id, result.rowcount > 0)
+        if self.counters_enabled and result.rowcount and note is not None:
+            deltas = CounterDeltas()
+            deltas.add(category.id, note.is_archived)
+            self._flush_counters(deltas)
+        self.db.commit()
         return note
     
     def remove_category(self, note_id: UUID, category: Category) -> Optional[Note]:
@@ -183,13 +531,441 @@ class NoteRepository:
         Returns:
             Updated note if found, None otherwise
         """
-        note = self.get_by_id(note_id)
-        if not note:
-            return None
+        if self.counters_enabled:
+            self._lock_notes([note_id])
+        result = self.db.execute(
+            delete(note_categories).where(
+                note_categories.c.note_id == note_id,
+                note_categories.c.category_id == category.id
+            )
+        )
+        note = self._touch_or_reload(note_id, result.rowcount > 0)
+        if self.counters_enabled and result.rowcount and note is not None:
+            deltas = CounterDeltas()
+            deltas.add(category.id, note.is_archived, -1)
+            self._flush_counters(deltas)
+        self.db.commit()
+        return note
+    
+    def existing_ids(self, note_ids: Sequence[UUID]) -> Set[UUID]:
+        """
+        Return which of the given note IDs exist.
+        
+        Args:
+            note_ids: UUIDs to look up
+            
+        Returns:
+            Subset of `note_ids` present in the database
+        """
+        found: Set[UUID] = set()
+        for chunk in self._chunks(list(note_ids)):
+            stmt = select(Note.id).where(Note.id.in_(chunk)).execution_options(chunked=True)
+            found.update(self.db.execute(stmt).scalars())
+        return found
+    
+    def bulk_apply(
+        self,
+        creates: Sequence[Tuple[str, str]] = (),
+        updates: Sequence[Dict[str, Any]] = (),
+        archive_ids: Sequence[UUID] = (),
+        unarchive_ids: Sequence[UUID] = (),
+        delete_ids: Sequence[UUID] = ()
+    ) -> List[UUID]:
+        """
+        Apply a batch of writes in a single transaction.
+        
+        Rows are written with multi-row INSERTs and IN-list UPDATE/DELETE
+        statements, BULK_CHUNK_SIZE rows per statement, followed by one commit.
+        With category counters, the archived and deleted notes are locked
+        first (see _lock_notes).
+        
+        Args:
+            creates: (title, content) pairs of notes to create
+            updates: Dictionaries with an "id" key plus the columns to change
+            archive_ids: UUIDs of notes to archive
+            unarchive_ids: UUIDs of notes to unarchive
+            delete_ids: UUIDs of notes to delete
+            
+        Returns:
+            UUIDs of the created notes, in the order of `creates`
+        """
+        if self.counters_enabled:
+            self._lock_notes([*archive_ids, *unarchive_ids, *delete_ids])
+        
+        created_ids = [uuid4() for _ in creates]
+        rows = [
+            {"id": note_id, "title": title, "content": content, "is_archived": False}
+            for note_id, (title, content) in zip(created_ids, creates)
+        ]
+        for chunk in self._chunks(rows):
+            self.db.execute(insert(Note).values(chunk))
+        
+        # ORM bulk UPDATE by primary key; rows are grouped by the columns they set
+        if updates:
+            self.db.execute(update(Note), list(updates))
+        
+        deltas = CounterDeltas()
+        for ids, archived in ((archive_ids, True), (unarchive_ids, False)):
+            for chunk in self._chunks(list(ids)):
+                if self.counters_enabled:
+                    changing = link_counts(note_categories.c.note_id.in_(chunk), Note.is_archived != archived)
+                    deltas.move_rows(self.db.execute(changing.execution_options(chunked=True)), archived)
+                self.db.execute(
+                    update(Note)
+                    .where(Note.id.in_(chunk))
+                    .values(is_archived=archived)
+                    .execution_options(synchronize_session=False)
+                )
+        
+        for chunk in self._chunks(list(delete_ids)):
+            if self.counters_enabled:
+                linked = link_counts(note_categories.c.note_id.in_(chunk))
+                deltas.add_rows(self.db.execute(linked.execution_options(chunked=True)), sign=-1)
+            self.db.execute(self.log_deletions_statement(Note.id.in_(chunk)))
+            self.db.execute(
+                delete(Note).where(Note.id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+        
+        self._flush_counters(deltas)
+        self.db.commit()
+        return created_ids
+    
+    def set_categories(
+        self,
+        note_ids: Sequence[UUID],
+        category_ids: Sequence[UUID],
+        mode: str = "add"
+    ) -> Tuple[int, int]:
+        """
+        Assign, remove or replace categories across many notes in one transaction.
+        
+        Args:
+            note_ids: UUIDs of the notes
+            category_ids: UUIDs of the categories
+            mode: "add", "remove", or "replace" (each note ends up with exactly
+                `category_ids`)
+                
+        Returns:
+            (links added, links removed)
+        """
+        added = removed = 0
+        deltas = CounterDeltas()
+        if self.counters_enabled:
+            self._lock_notes(note_ids)
         
-        if category in note.categories:
-            note.categories.remove(category)
-            self.db.commit()
-            self.db.refresh(note)
+        if mode in ("remove", "replace"):
+            condition = note_categories.c.category_id.in_(category_ids)
+            if mode == "replace":
+                condition = ~condition if category_ids else true()
+            if self.counters_enabled:
+                deltas.add_rows(
+                    self.db.execute(link_counts(note_categories.c.note_id.in_(note_ids), condition)),
+                    sign=-1
+                )
+            result = self.db.execute(
+                delete(note_categories).where(note_categories.c.note_id.in_(note_ids), condition)
+            )
+            removed = result.rowcount
         
+        if mode in ("add", "replace") and category_ids:
+            if self.counters_enabled:
+                deltas.add_rows(self.db.execute(missing_link_counts(note_ids, category_ids)))
+            result = self.db.execute(self.link_categories_statement(self._dialect_name(), note_ids, category_ids))
+            added = result.rowcount
+        
+        if added or removed:
+            self.db.execute(self.touch_statement(Note.id.in_(note_ids)))
+        
+        self._flush_counters(deltas)
+        self.db.commit()
+        return added, removed
+    
+    @classmethod
+    def _chunks(cls, items: List[Any]) -> Iterator[List[Any]]:
+        for start in range(0, len(items), cls.BULK_CHUNK_SIZE):
+            yield items[start:start + cls.BULK_CHUNK_SIZE]
+    
+    def _dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+    
+    def _touch_or_reload(self, note_id: UUID, changed: bool) -> Optional[Note]:
+        """
+        Return a note after a change to its category links.
+        
+        When the links changed, updated_at is bumped (so ETags and sync
+        clients see the new category list) and the note comes back from the
+        UPDATE ... RETURNING; otherwise it is simply reloaded.
+        """
+        if not changed:
+            return self._reload(note_id)
+        stmt = self.update_statement(self._dialect_name(), note_id, {"updated_at": func.now()})
+        return self.db.execute(stmt).unique().scalars().first()
+    
+    def _reload(self, note_id: UUID) -> Optional[Note]:
+        """Load a note, overwriting any stale copy held by the session"""
+        stmt = (
+            select(Note)
+            .options(joinedload(Note.categories))
+            .filter(Note.id == note_id)
+            .execution_options(populate_existing=True)
+        )
+        return self.db.execute(stmt).unique().scalars().first()
+    
+    def _flush_counters(self, deltas: CounterDeltas) -> None:
+        """Apply pending category counter changes in the current transaction"""
+        params = deltas.params()
+        if params:
+            self.db.execute(CounterDeltas.upsert_statement(self._dialect_name()), params)
+    
+    def _lock_notes(self, note_ids: Sequence[UUID]) -> None:
+        """
+        Lock the rows of `note_ids` until commit, before a counter-maintaining write.
+        
+        Counter deltas come from the links and archived flags read before
+        the write. Holding the note rows makes concurrent writes to the same
+        notes take turns, so each one reads what the previous one committed
+        instead of applying a delta for a change that already happened.
+        Rows are locked in id order, so overlapping batches cannot deadlock.
+        """
+        for chunk in self._chunks(sorted(set(note_ids))):
+            self.db.execute(self.lock_statement(self._dialect_name(), chunk))
+    
+    def _set_archived(self, note_id: UUID, archived: bool) -> Optional[Note]:
+        """Set the archived flag of a note and return the note"""
+        if self.counters_enabled:
+            self._lock_notes([note_id])
+        stmt = self.update_statement(
+            self._dialect_name(), note_id, {"is_archived": archived}, Note.is_archived != archived
+        )
+        note = self.db.execute(stmt).unique().scalars().first()
+        if note is None:
+            # Missing, or already in the requested state
+            note = self.get_by_id(note_id)
+        elif self.counters_enabled:
+            deltas = CounterDeltas()
+            for category in note.categories:
+                deltas.move(category.id, archived)
+            self._flush_counters(deltas)
+        self.db.commit()
+        return note
+    
+    def _update_returning(self, note_id: UUID, values: Dict[str, Any]) -> Optional[Note]:
+        """Apply `values` to a note and return it, categories included"""
+        stmt = self.update_statement(self._dialect_name(), note_id, values)
+        note = self.db.execute(stmt).unique().scalars().first()
+        self.db.commit()
         return note
+    
+    # Statement builders below are shared with AsyncNoteRepository, which
+    # executes the same SQL on an AsyncSession
+    
+    @classmethod
+    def page_rows_statement(
+        cls,
+        archived: Optional[bool],
+        category_id: Optional[UUID],
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]],
+        fields: Optional[Sequence[str]] = None
+    ):
+        """Row query for one list page in (created_at DESC, id DESC) order"""
+        columns = cls._row_columns(fields)
+        stmt = cls.apply_filters(select(*columns), archived, category_id)
+        if after is not None:
+            stmt = stmt.where(tuple_(Note.created_at, Note.id) < tuple_(*after))
+        page = stmt.order_by(Note.created_at.desc(), Note.id.desc()).limit(limit).subquery()
+        if fields is not None and "categories" not in fields:
+            return select(page).order_by(page.c.created_at.desc(), page.c.id.desc())
+        return cls._with_category_rows(page, page.c.created_at.desc(), page.c.id.desc())
+    
+    @classmethod
+    def _row_columns(cls, fields: Optional[Sequence[str]]) -> List[Any]:
+        """
+        Columns for a row query selecting only `fields`.
+        
+        Unrequested columns (notably content) are never read. "snippet" is
+        the first SNIPPET_LENGTH characters of content, cut by the database;
+        id and created_at are always selected for ordering and cursors.
+        """
+        if fields is None:
+            return list(cls.NOTE_ROW_COLUMNS)
+        available = {column.key: column for column in cls.NOTE_ROW_COLUMNS}
+        available["snippet"] = func.substr(Note.content, 1, cls.SNIPPET_LENGTH).label("snippet")
+        selected = {"id", "created_at", *fields}
+        return [column for key, column in available.items() if key in selected]
+    
+    @classmethod
+    def changed_rows_statement(cls, after: Optional[Tuple[datetime, UUID]], limit: int, lag: float = 0.0):
+        """Row query for the next `limit` changed notes in (updated_at, id) order, older than `lag` seconds"""
+        stmt = select(*cls.NOTE_ROW_COLUMNS)
+        if lag > 0:
+            stmt = stmt.where(Note.updated_at < seconds_ago(lag))
+        if after is not None:
+            stmt = stmt.where(tuple_(Note.updated_at, Note.id) > tuple_(*after))
+        page = stmt.order_by(Note.updated_at, Note.id).limit(limit).subquery()
+        return cls._with_category_rows(page, page.c.updated_at, page.c.id)
+    
+    @staticmethod
+    def _with_category_rows(page, *order_by):
+        """
+        Join a page of NOTE_ROW_COLUMNS to the notes' categories.
+        
+        Yields one row per note and category (one row with NULL category
+        columns for notes without categories), grouped by note in the page
+        order, with the category columns labeled category_<field>.
+        """
+        return (
+            select(
+                page,
+                Category.id.label("category_id"),
+                Category.name.label("category_name"),
+                Category.color.label("category_color"),
+                Category.created_at.label("category_created_at")
+            )
+            .outerjoin(note_categories, note_categories.c.note_id == page.c.id)
+            .outerjoin(Category, Category.id == note_categories.c.category_id)
+            .order_by(*order_by, Category.name)
+        )
+    
+    @classmethod
+    def list_version_statement(cls, archived: Optional[bool], category_id: Optional[UUID], lag: float = 0.0):
+        """COUNT, MAX(updated_at) and whether that max is older than `lag` seconds, over the filtered notes"""
+        latest = func.max(Note.updated_at)
+        settled = latest < seconds_ago(lag) if lag > 0 else true()
+        return cls.apply_filters(select(func.count(Note.id), latest, settled), archived, category_id)
+    
+    @staticmethod
+    def category_links_statement(note_ids: Sequence[UUID]):
+        """SELECT of the (note_id, category_id) links of `note_ids`"""
+        return (
+            select(note_categories.c.note_id, note_categories.c.category_id)
+            .where(note_categories.c.note_id.in_(note_ids))
+        )
+    
+    @staticmethod
+    def deletions_statement(after: Optional[Tuple[datetime, UUID]], limit: int, lag: float = 0.0):
+        """SELECT of the next `limit` tombstones in (deleted_at, note_id) order, older than `lag` seconds"""
+        stmt = select(NoteDeletion)
+        if lag > 0:
+            stmt = stmt.where(NoteDeletion.deleted_at < seconds_ago(lag))
+        if after is not None:
+            stmt = stmt.where(tuple_(NoteDeletion.deleted_at, NoteDeletion.note_id) > tuple_(*after))
+        return stmt.order_by(NoteDeletion.deleted_at, NoteDeletion.note_id).limit(limit)
+    
+    @staticmethod
+    def log_deletions_statement(*conditions):
+        """
+        Build an INSERT ... SELECT recording tombstones for the notes matching
+        `conditions`; run it right before deleting them.
+        """
+        return insert(NoteDeletion).from_select(
+            ["note_id", "deleted_at"],
+            select(Note.id, func.now()).where(*conditions)
+        )
+    
+    @staticmethod
+    def lock_statement(dialect_name: str, note_ids: Sequence[UUID]):
+        """
+        Build a statement locking the rows of `note_ids` until the transaction ends.
+        
+        SELECT ... FOR NO KEY UPDATE where row locks exist. SQLite has none;
+        a no-op UPDATE takes its database write lock instead, which also
+        holds off the reads of other writers until commit.
+        """
+        if dialect_name == "sqlite":
+            return (
+                update(Note)
+                .where(Note.id.in_(note_ids))
+                .values(updated_at=Note.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        return (
+            select(Note.id)
+            .where(Note.id.in_(note_ids))
+            .order_by(Note.id)
+            .with_for_update(key_share=True)
+            .execution_options(chunked=True)
+        )
+    
+    @staticmethod
+    def touch_statement(*conditions):
+        """
+        Build an UPDATE bumping updated_at of the notes matching `conditions`.
+        
+        Used when something embedded in the note representation (its
+        categories) changes without the note row itself being written, here
+        and by CategoryRepository when a category is updated or deleted.
+        """
+        return (
+            update(Note)
+            .where(*conditions)
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    
+    @staticmethod
+    def update_statement(dialect_name: str, note_id: UUID, values: Dict[str, Any], *conditions):
+        """
+        Build an UPDATE ... RETURNING statement that also yields the categories.
+        
+        On PostgreSQL the UPDATE is wrapped in a CTE and selected as a Note, so
+        categories can be joined in the same statement.
+        Other dialects return the row directly and load categories with one
+        extra selectin query.
+        
+        Args:
+            dialect_name: Name of the database dialect
+            note_id: UUID of the note to update
+            values: Column values to set
+            conditions: Extra filters; the note is only updated when they match
+            
+        Returns:
+            Executable statement returning the updated Note
+        """
+        if dialect_name == "postgresql":
+            updated = (
+                update(Note.__table__)
+                .where(Note.__table__.c.id == note_id, *conditions)
+                .values(**values)
+                .returning(*Note.__table__.c)
+                .cte("updated_note")
+            )
+            note = aliased(Note, updated)
+            stmt = select(note).options(joinedload(note.categories))
+        else:
+            stmt = (
+                update(Note)
+                .where(Note.id == note_id, *conditions)
+                .values(**values)
+                .returning(Note)
+                .options(selectinload(Note.categories))
+            )
+        return stmt.execution_options(populate_existing=True)
+    
+    @staticmethod
+    def link_categories_statement(dialect_name: str, note_ids: Sequence[UUID], category_ids: Sequence[UUID]):
+        """
+        Build an idempotent INSERT linking every given note to every given category.
+        
+        Links are selected from the notes x categories cross join, so IDs that
+        do not exist are skipped, and existing links are left alone.
+        
+        Args:
+            dialect_name: Name of the database dialect
+            note_ids: UUIDs of the notes
+            category_ids: UUIDs of the categories
+            
+        Returns:
+            Executable INSERT statement
+        """
+        dialect_insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        return (
+            dialect_insert(note_categories)
+            .from_select(
+                ["note_id", "category_id"],
+                select(Note.id, Category.id)
+                .join_from(Note, Category, true())
+                .where(Note.id.in_(note_ids), Category.id.in_(category_ids))
+            )
+            .on_conflict_do_nothing()
+        )
@@ -1,4 +1,28 @@
-from routers.notes import router as notes_router
-from routers.categories import router as categories_router
+from importlib import import_module
 
-__all__ = ["notes_router", "categories_router"]
+# Routers are imported on first access, so importing one of them (or only
+# the sync or the async set, see main.py) does not build every other one
+_ROUTERS = {
+    "notes_router": "routers.notes",
+    "categories_router": "routers.categories",
+    "async_notes_router": "routers.async_notes",
+    "async_categories_router": "routers.async_categories",
+    "metrics_router": "routers.metrics",
+    "events_router": "routers.events",
+}
+
+
+def __getattr__(name: str):
+    if name in _ROUTERS:
+        return import_module(_ROUTERS[name]).router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "notes_router",
+    "categories_router",
+    "async_notes_router",
+    "async_categories_router",
+    "metrics_router",
+    "events_router"
+]
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Union
+from uuid import UUID
+
+from config.database import get_async_db
+from config.instrumentation import InstrumentedRoute
+from services.async_category_service import AsyncCategoryService
+from schemas.category_schemas import (
+    CreateCategoryDTO,
+    UpdateCategoryDTO,
+    CategoryResponse,
+    CategoryWithNotesCount
+)
+
+router = APIRouter(prefix="/api/categories", tags=["categories"], route_class=InstrumentedRoute)
+
+
+@router.post(
+    "",
+    response_model=CategoryResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new category"
+)
+async def create_category(
+    dto: CreateCategoryDTO,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new category with a unique name and optional color.
+    """
+    service = AsyncCategoryService(db)
+    return await service.create_category(dto)
+
+
+@router.get(
+    "",
+    response_model=Union[List[CategoryWithNotesCount], List[CategoryResponse]],
+    summary="Get all categories"
+)
+async def get_categories(
+    with_counts: bool = Query(False, description="Include active/archived note counts per category"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get all categories ordered by name.
+    
+    With with_counts=true each category also carries notes_count,
+    active_notes_count and archived_notes_count.
+    """
+    service = AsyncCategoryService(db)
+    return await service.get_categories(with_counts=with_counts)
+
+
+@router.get(
+    "/{category_id}",
+    response_model=CategoryResponse,
+    summary="Get a single category"
+)
+async def get_category(
+    category_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a single category by ID.
+    """
+    service = AsyncCategoryService(db)
+    return await service.get_category(category_id)
+
+
+@router.put(
+    "/{category_id}",
+    response_model=CategoryResponse,
+    summary="Update a category"
+)
+async def update_category(
+    category_id: UUID,
+    dto: UpdateCategoryDTO,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update an existing category's name and/or color.
+    """
+    service = AsyncCategoryService(db)
+    return await service.update_category(category_id, dto)
+
+
+@router.delete(
+    "/{category_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a category"
+)
+async def delete_category(
+    category_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a category. This will remove the category from all associated notes.
+    """
+    service = AsyncCategoryService(db)
+    await service.delete_category(category_id)
@@ -0,0 +1,238 @@
+from fastapi import APIRouter, Depends, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional, Union
+from uuid import UUID
+
+from config.database import get_async_db
+from config.instrumentation import InstrumentedRoute
+from routers.responses import orjson_response
+from routers.conditional import check_not_modified, note_etag, async_note_if_match, async_notes_list_etag
+from services.async_note_service import AsyncNoteService
+from schemas.note_schemas import CreateNoteDTO, UpdateNoteDTO, NoteResponse, NoteListResponse, NoteSummaryListResponse, CompactNoteListResponse, NoteChangesResponse
+
+router = APIRouter(prefix="/api/notes", tags=["notes"], route_class=InstrumentedRoute)
+
+
+@router.post(
+    "",
+    response_model=NoteResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new note"
+)
+async def create_note(
+    dto: CreateNoteDTO,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new note with title and content.
+    """
+    service = AsyncNoteService(db)
+    return await service.create_note(dto)
+
+
+@router.get(
+    "",
+    response_model=Union[NoteListResponse, NoteSummaryListResponse, CompactNoteListResponse],
+    summary="Get notes (paginated)",
+    dependencies=[Depends(async_notes_list_etag)]
+)
+async def get_notes(
+    response: Response,
+    archived: Optional[bool] = Query(None, description="Filter by archived status"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of notes per page"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    include_total: bool = Query(False, description="Also count all matching notes"),
+    view: Literal["full", "summary"] = Query("full", description="summary: a content snippet instead of the full content"),
+    fields: Optional[str] = Query(None, description="Comma-separated note fields to return, overriding view"),
+    include: Optional[Literal["categories"]] = Query(
+        None,
+        description="categories: notes carry category_ids and each category is sent once, in a top-level map"
+    ),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a page of notes, newest first, with optional filters:
+    - archived: true (only archived), false (only active), null (all notes)
+    - category_id: filter by specific category
+    - limit / cursor: keyset pagination; pass next_cursor back to get the next page
+    - view / fields: leave out note fields (e.g. view=summary or fields=title,snippet);
+      unrequested columns are not read from the database
+    - include=categories: compact format, categories referenced by id and sent once
+    """
+    service = AsyncNoteService(db)
+    page = await service.get_notes(
+        archived=archived,
+        category_id=category_id,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        view=view,
+        fields=fields,
+        include=include
+    )
+    return orjson_response(page, response)
+
+
+@router.get(
+    "/changes",
+    response_model=NoteChangesResponse,
+    summary="Get notes changed since a sync token"
+)
+async def get_changes(
+    response: Response,
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of notes (and of deleted notes) per batch"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delta sync: notes created or updated since `since`, plus tombstones for
+    deleted notes. Store next_token and pass it back as `since`; while
+    has_more is true, request again right away to get the rest.
+    Changes younger than CHANGES_MAX_TXN_LAG seconds are held back for a
+    later call, so a transaction committing late is not skipped.
+    """
+    service = AsyncNoteService(db)
+    changes = await service.get_changes(since=since, limit=limit)
+    return orjson_response(changes, response)
+
+
+@router.get(
+    "/{note_id}",
+    response_model=NoteResponse,
+    summary="Get a single note"
+)
+async def get_note(
+    note_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a single note by ID.
+    Answers 304 Not Modified when If-None-Match carries the current ETag.
+    """
+    service = AsyncNoteService(db)
+    note = await service.get_note(note_id)
+    check_not_modified(request, response, note_etag(note.id, note.updated_at))
+    return note
+
+
+@router.put(
+    "/{note_id}",
+    response_model=NoteResponse,
+    summary="Update a note",
+    dependencies=[Depends(async_note_if_match)]
+)
+async def update_note(
+    note_id: UUID,
+    dto: UpdateNoteDTO,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update an existing note's title and/or content.
+    """
+    service = AsyncNoteService(db)
+    note = await service.update_note(note_id, dto)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
+
+
+@router.delete(
+    "/{note_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a note",
+    dependencies=[Depends(async_note_if_match)]
+)
+async def delete_note(
+    note_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a note permanently.
+    """
+    service = AsyncNoteService(db)
+    await service.delete_note(note_id)
+
+
+@router.patch(
+    "/{note_id}/archive",
+    response_model=NoteResponse,
+    summary="Archive a note",
+    dependencies=[Depends(async_note_if_match)]
+)
+async def archive_note(
+    note_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Archive a note (sets is_archived to true).
+    """
+    service = AsyncNoteService(db)
+    note = await service.archive_note(note_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
+
+
+@router.patch(
+    "/{note_id}/unarchive",
+    response_model=NoteResponse,
+    summary="Unarchive a note",
+    dependencies=[Depends(async_note_if_match)]
+)
+async def unarchive_note(
+    note_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Unarchive a note (sets is_archived to false).
+    """
+    service = AsyncNoteService(db)
+    note = await service.unarchive_note(note_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
+
+
+@router.post(
+    "/{note_id}/categories/{category_id}",
+    response_model=NoteResponse,
+    summary="Add category to note",
+    dependencies=[Depends(async_note_if_match)]
+)
+async def add_category_to_note(
+    note_id: UUID,
+    category_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Add a category to a note.
+    """
+    service = AsyncNoteService(db)
+    note = await service.add_category_to_note(note_id, category_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
+
+
+@router.delete(
+    "/{note_id}/categories/{category_id}",
+    response_model=NoteResponse,
+    summary="Remove category from note",
+    dependencies=[Depends(async_note_if_match)]
+)
+async def remove_category_from_note(
+    note_id: UUID,
+    category_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Remove a category from a note.
+    """
+    service = AsyncNoteService(db)
+    note = await service.remove_category_from_note(note_id, category_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from uuid import UUID
 
 from config.database import get_db
+from config.instrumentation import InstrumentedRoute
 from services.category_service import CategoryService
-from schemas.category_schemas import CreateCategoryDTO, UpdateCategoryDTO, CategoryResponse
+from schemas.category_schemas import (
+    CreateCategoryDTO,
+    UpdateCategoryDTO,
+    CategoryResponse,
+    CategoryWithNotesCount
+)
 
-router = APIRouter(prefix="/api/categories", tags=["categories"])
+router = APIRouter(prefix="/api/categories", tags=["categories"], route_class=InstrumentedRoute)
 
 
 @router.post(
@@ -29,17 +35,21 @@ def create_category(
 
 @router.get(
     "",
-    response_model=List[CategoryResponse],
+    response_model=Union[List[CategoryWithNotesCount], List[CategoryResponse]],
     summary="Get all categories"
 )
 def get_categories(
+    with_counts: bool = Query(False, description="Include active/archived note counts per category"),
     db: Session = Depends(get_db)
 ):
     """
     Get all categories ordered by name.
+    
+    With with_counts=true each category also carries notes_count,
+    active_notes_count and archived_notes_count.
     """
     service = CategoryService(db)
-    return service.get_categories()
+    return service.get_categories(with_counts=with_counts)
 
 
 @router.get(
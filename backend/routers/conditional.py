@@ -0,0 +1,179 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config.compression import strip_coding
+from config.database import get_db, get_async_db
+from services.note_service import NoteService
+from services.async_note_service import AsyncNoteService
+
+
+# Conditional request support for the notes routers.
+#
+# A note's ETag is derived from its id and updated_at, which the repositories
+# bump on every change to the note's representation (including category links
+# and renames of linked categories). A list's ETag is derived from the query
+# string plus COUNT(*) and MAX(updated_at) over the filtered notes, so it
+# changes whenever a matching note is created, edited, moved out or deleted.
+# updated_at is the transaction start time, so a slow transaction can commit
+# a change without raising the max: lists get no ETag (and are never
+# answered 304 or served from the compressed body cache) until their latest
+# change is older than CHANGES_MAX_TXN_LAG. A write committing after the
+# version is read then always changes it, so a body read after the version
+# can be newer than its ETag, but never older.
+# Compressed responses carry the ETag with a coding suffix ("abc-gzip", see
+# config.compression); it identifies the same version of the resource.
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong entity tag from the values identifying a representation.
+    
+    Args:
+        parts: Values that change whenever the representation changes
+        
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def note_etag(note_id: UUID, updated_at: datetime) -> str:
+    """ETag of a single note"""
+    return make_etag("note", note_id, updated_at.isoformat())
+
+
+def list_etag(request: Request, count: int, latest: Optional[datetime]) -> str:
+    """ETag of a note list page, covering every query parameter"""
+    query = sorted(request.query_params.multi_items())
+    return make_etag("notes", query, count, latest.isoformat() if latest else "")
+
+
+def check_list_not_modified(
+    request: Request,
+    response: Response,
+    version: Optional[Tuple[int, Optional[datetime]]]
+) -> None:
+    """check_not_modified() for a note list; a list without a settled version gets no ETag"""
+    if version is None:
+        response.headers["Cache-Control"] = "no-cache"
+        return
+    check_not_modified(request, response, list_etag(request, *version))
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    Check an If-None-Match / If-Match header against an ETag.
+    
+    Args:
+        header: Raw header value (may list several tags, or be "*")
+        etag: Current ETag of the resource
+        weak: Use weak comparison (If-None-Match); strong comparison
+            (If-Match) never matches W/ tags
+            
+    Returns:
+        True if any listed tag matches, ignoring content-coding suffixes
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            if not weak:
+                continue
+            tag = tag[2:]
+        if strip_coding(tag) == etag:
+            return True
+    return False
+
+
+def check_not_modified(request: Request, response: Response, etag: str) -> None:
+    """
+    Answer 304 if the client already has `etag`, otherwise tag the response.
+    
+    Raising before the handler returns skips loading and serializing the body.
+    
+    Raises:
+        HTTPException: 304 Not Modified if If-None-Match matches
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def check_precondition(header: Optional[str], note_id: UUID, updated_at: Optional[datetime]) -> None:
+    """
+    Enforce If-Match on a note write.
+    
+    Raises:
+        HTTPException: 412 Precondition Failed if the note is gone or changed
+    """
+    if header is None:
+        return
+    if updated_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Note with id {note_id} does not exist"
+        )
+    etag = note_etag(note_id, updated_at)
+    if not etag_matches(header, etag, weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Note was modified by another request",
+            headers={"ETag": etag}
+        )
+
+
+def notes_list_etag(
+    request: Request,
+    response: Response,
+    archived: Optional[bool] = Query(None, description="Filter by archived status"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    db: Session = Depends(get_db)
+) -> None:
+    """Dependency answering conditional GETs of the note list"""
+    version = NoteService(db).get_list_version(archived, category_id)
+    check_list_not_modified(request, response, version)
+
+
+def note_if_match(note_id: UUID, request: Request, db: Session = Depends(get_db)) -> None:
+    """
+    Dependency enforcing If-Match on note writes.
+    
+    The note row is locked (SELECT ... FOR UPDATE where supported) in the
+    request's session, so no other writer can slip in between the check and
+    the handler's own update.
+    """
+    header = request.headers.get("if-match")
+    if header is not None:
+        updated_at = NoteService(db).get_note_version(note_id, lock=True)
+        check_precondition(header, note_id, updated_at)
+
+
+async def async_notes_list_etag(
+    request: Request,
+    response: Response,
+    archived: Optional[bool] = Query(None, description="Filter by archived status"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    db: AsyncSession = Depends(get_async_db)
+) -> None:
+    """Async variant of notes_list_etag"""
+    version = await AsyncNoteService(db).get_list_version(archived, category_id)
+    check_list_not_modified(request, response, version)
+
+
+async def async_note_if_match(note_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)) -> None:
+    """Async variant of note_if_match"""
+    header = request.headers.get("if-match")
+    if header is not None:
+        updated_at = await AsyncNoteService(db).get_note_version(note_id, lock=True)
+        check_precondition(header, note_id, updated_at)
@@ -0,0 +1,99 @@
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from config.settings import settings
+from config.instrumentation import InstrumentedRoute
+from events import EventBroker, get_broker
+from schemas.event_schemas import ChangeEvent
+
+router = APIRouter(prefix="/api/events", tags=["events"], route_class=InstrumentedRoute)
+
+
+def _sse_message(event: ChangeEvent) -> str:
+    return f"data: {event.model_dump_json()}\n\n"
+
+
+async def _sse_stream(broker: EventBroker, heartbeat: float) -> AsyncIterator[str]:
+    # Subscribing inside the generator ties the subscription to the stream:
+    # it is released when the client disconnects and the generator closes.
+    subscription = broker.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                # Dropped as a slow consumer, or the server is shutting down;
+                # the client reconnects and resyncs
+                yield _sse_message(ChangeEvent(type="resync"))
+                return
+            yield _sse_message(event)
+    finally:
+        subscription.close()
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    summary="Stream change events (server-sent events)"
+)
+async def stream_events():
+    """
+    Push a notification whenever a note or category changes, as a
+    text/event-stream of JSON ChangeEvent messages.
+    
+    Events say what changed, not the new data: fetch it from
+    GET /api/notes/changes, where changes appear after CHANGES_MAX_TXN_LAG
+    seconds. A "resync" event means notifications may have been lost (e.g.
+    the client fell behind and was disconnected, or the server is
+    restarting), so the client should resync from its last changes token.
+    """
+    return StreamingResponse(
+        _sse_stream(get_broker(), settings.events_heartbeat),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws")
+async def events_websocket(websocket: WebSocket):
+    """
+    WebSocket variant of the event stream: one JSON ChangeEvent per text
+    message. Messages sent by the client are ignored.
+    """
+    await websocket.accept()
+    subscription = get_broker().subscribe()
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            next_event = asyncio.ensure_future(subscription.get())
+            await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_event.cancel()
+                return
+            event = next_event.result()
+            if event is None:
+                # Slow consumer, or shutdown (see _sse_stream)
+                await websocket.send_text(ChangeEvent(type="resync").model_dump_json())
+                await websocket.close()
+                return
+            await websocket.send_text(event.model_dump_json())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        subscription.close()
@@ -0,0 +1,144 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from cache import get_cache
+from events import get_broker
+from config import database
+from config.instrumentation import InstrumentedRoute
+from config.request_metrics import request_metrics
+from schemas.metrics_schemas import CacheMetricsResponse, EventMetricsResponse, PoolMetricsResponse
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], route_class=InstrumentedRoute)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Pool snapshot keys exported as counters; the remaining numeric keys are gauges
+POOL_COUNTERS = ("connects", "checkouts", "checkins", "invalidations", "timeouts", "wait_seconds_total")
+POOL_GAUGES = ("size", "checkedin", "checkedout", "overflow")
+
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str, samples: Dict[str, Any]) -> None:
+    """Append one metric family; samples map a label string ("" for none) to a value"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples.items():
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+
+def _pool_snapshots() -> Dict[str, Dict[str, Any]]:
+    """
+    Snapshots of the pools whose engine has been created, keyed "sync" /
+    "async". The private attributes are read on purpose: database.engine
+    would create the sync engine (and its pool) just to report on it.
+    """
+    pools = {}
+    if database._engine is not None:
+        pools["sync"] = database.pool_metrics.snapshot(database._engine.pool)
+    if database._async_engine is not None:
+        pools["async"] = database.async_pool_metrics.snapshot(database._async_engine.sync_engine.pool)
+    return pools
+
+
+def _pool_lines(lines: List[str]) -> None:
+    pools = _pool_snapshots()
+    if not pools:
+        return
+    for key in POOL_COUNTERS:
+        name = f"db_pool_{key}" if key.endswith("_total") else f"db_pool_{key}_total"
+        _metric(lines, name, "counter", f"Connection pool {key.replace('_', ' ')}", {
+            f'pool="{pool}"': stats[key] for pool, stats in pools.items()
+        })
+    for key in POOL_GAUGES:
+        # NullPool (PgBouncer mode) has no gauges
+        samples = {f'pool="{pool}"': stats[key] for pool, stats in pools.items() if stats[key] is not None}
+        if samples:
+            _metric(lines, f"db_pool_{key}", "gauge", f"Connection pool {key}", samples)
+
+
+def _cache_lines(lines: List[str]) -> None:
+    stats_method = getattr(get_cache(), "stats", None)
+    stats: Optional[Dict[str, int]] = stats_method() if callable(stats_method) else None
+    if stats is None:
+        return
+    lookups = stats["hits"] + stats["misses"]
+    _metric(lines, "cache_hits_total", "counter", "Response cache hits", {"": stats["hits"]})
+    _metric(lines, "cache_misses_total", "counter", "Response cache misses", {"": stats["misses"]})
+    _metric(lines, "cache_evictions_total", "counter", "Response cache LRU evictions", {"": stats["evictions"]})
+    _metric(lines, "cache_hit_ratio", "gauge", "Hits per lookup since start", {"": round(stats["hits"] / lookups, 6) if lookups else 0})
+    _metric(lines, "cache_entries", "gauge", "Entries in the response cache", {"": stats["entries"]})
+    _metric(lines, "cache_bytes", "gauge", "UTF-8 size of the cached values", {"": stats["bytes"]})
+
+
+def _event_lines(lines: List[str]) -> None:
+    stats = get_broker().hub.stats()
+    _metric(lines, "events_subscribers", "gauge", "Connected SSE / WebSocket subscribers", {"": stats["subscribers"]})
+    _metric(lines, "events_published_total", "counter", "Change events dispatched", {"": stats["published"]})
+    _metric(lines, "events_dropped_subscribers_total", "counter", "Subscribers dropped for falling behind", {"": stats["dropped_subscribers"]})
+
+
+@router.get(
+    "",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics"
+)
+async def get_prometheus_metrics():
+    """
+    Report request, pool, cache and event metrics in the Prometheus text
+    exposition format.
+    
+    Request metrics are per process; scrape every worker or aggregate
+    with a sum by route.
+    """
+    lines = request_metrics.exposition()
+    _pool_lines(lines)
+    _cache_lines(lines)
+    _event_lines(lines)
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get(
+    "/pool",
+    response_model=PoolMetricsResponse,
+    response_model_by_alias=True,
+    summary="Connection pool metrics"
+)
+def get_pool_metrics():
+    """
+    Report checkout, overflow and wait-time counters for the database pools,
+    to size pool_size / max_overflow from observed load. A pool is null
+    until its engine is first used.
+    """
+    pools = _pool_snapshots()
+    return {"sync": pools.get("sync"), "async": pools.get("async")}
+
+
+@router.get(
+    "/cache",
+    response_model=CacheMetricsResponse,
+    summary="Response cache metrics"
+)
+def get_cache_metrics():
+    """
+    Report the size and hit/miss counters of the response cache.
+    """
+    cache = get_cache()
+    stats = getattr(cache, "stats", None)
+    return {
+        "backend": type(cache).__name__,
+        "stats": stats() if callable(stats) else None
+    }
+
+
+@router.get(
+    "/events",
+    response_model=EventMetricsResponse,
+    summary="Change event metrics"
+)
+def get_event_metrics():
+    """
+    Report subscriber and delivery counters of the change event hub.
+    """
+    broker = get_broker()
+    return {"backend": type(broker).__name__, **broker.hub.stats()}
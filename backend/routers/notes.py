@@ -1,13 +1,30 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Request, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 from uuid import UUID
 
-from config.database import get_db
+from config.database import get_db, SessionLocal
+from config.instrumentation import InstrumentedRoute
+from routers.responses import orjson_response
+from routers.conditional import check_not_modified, note_etag, note_if_match, notes_list_etag
 from services.note_service import NoteService
-from schemas.note_schemas import CreateNoteDTO, UpdateNoteDTO, NoteResponse
+from schemas.note_schemas import (
+    CreateNoteDTO,
+    UpdateNoteDTO,
+    NoteResponse,
+    NoteListResponse,
+    NoteSummaryListResponse,
+    CompactNoteListResponse,
+    NoteChangesResponse,
+    NoteSearchResponse,
+    BulkNoteRequest,
+    BulkNoteResponse,
+    BulkCategoryRequest,
+    BulkCategoryResponse
+)
 
-router = APIRouter(prefix="/api/notes", tags=["notes"])
+router = APIRouter(prefix="/api/notes", tags=["notes"], route_class=InstrumentedRoute)
 
 
 @router.post(
@@ -29,21 +46,175 @@ def create_note(
 
 @router.get(
     "",
-    response_model=List[NoteResponse],
-    summary="Get all notes"
+    response_model=Union[NoteListResponse, NoteSummaryListResponse, CompactNoteListResponse],
+    summary="Get notes (paginated)",
+    dependencies=[Depends(notes_list_etag)]
 )
 def get_notes(
+    response: Response,
     archived: Optional[bool] = Query(None, description="Filter by archived status"),
     category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of notes per page"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    include_total: bool = Query(False, description="Also count all matching notes"),
+    view: Literal["full", "summary"] = Query("full", description="summary: a content snippet instead of the full content"),
+    fields: Optional[str] = Query(None, description="Comma-separated note fields to return, overriding view"),
+    include: Optional[Literal["categories"]] = Query(
+        None,
+        description="categories: notes carry category_ids and each category is sent once, in a top-level map"
+    ),
     db: Session = Depends(get_db)
 ):
     """
-    Get all notes with optional filters:
+    Get a page of notes, newest first, with optional filters:
     - archived: true (only archived), false (only active), null (all notes)
     - category_id: filter by specific category
+    - limit / cursor: keyset pagination; pass next_cursor back to get the next page
+    - view / fields: leave out note fields (e.g. view=summary or fields=title,snippet);
+      unrequested columns are not read from the database
+    - include=categories: compact format, categories referenced by id and sent once
+    """
+    service = NoteService(db)
+    page = service.get_notes(
+        archived=archived,
+        category_id=category_id,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        view=view,
+        fields=fields,
+        include=include
+    )
+    return orjson_response(page, response)
+
+
+@router.get(
+    "/search",
+    response_model=NoteSearchResponse,
+    summary="Search notes"
+)
+def search_notes(
+    q: str = Query(..., min_length=1, max_length=500, pattern=r"\S", description="Search text; must not be blank"),
+    archived: Optional[bool] = Query(None, description="Filter by archived status"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results per page"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over note titles and contents, best matches first.
+    Accepts the same filters as the list endpoint.
+    """
+    service = NoteService(db)
+    return service.search_notes(
+        q,
+        archived=archived,
+        category_id=category_id,
+        limit=limit,
+        offset=offset
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export notes as a stream"
+)
+def export_notes(
+    archived: Optional[bool] = Query(None, description="Filter by archived status"),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    format: Literal["ndjson", "json"] = Query("ndjson", description="ndjson (one note per line) or json (array)")
+):
+    """
+    Stream every matching note without materializing the full result set.
+    Accepts the same filters as the list endpoint.
+    """
+    # The request-scoped session from get_db is closed before the body is
+    # streamed, so the generator owns its own session for the whole export.
+    def generate():
+        db = SessionLocal()
+        try:
+            service = NoteService(db)
+            yield from service.export_notes(
+                archived=archived,
+                category_id=category_id,
+                fmt=format
+            )
+        finally:
+            db.close()
+    
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="notes.{format}"'}
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkNoteResponse,
+    summary="Apply a batch of note operations"
+)
+def bulk_notes(
+    dto: BulkNoteRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply up to 10,000 create, update, archive, unarchive and delete operations
+    in a single transaction.
+    
+    Each operation is an object with an "op" field, e.g.
+    {"op": "create", "title": "...", "content": "..."} or {"op": "archive", "id": "..."}.
+    Results are returned per operation, in request order; operations on
+    missing notes report "not_found" without aborting the batch.
+    """
+    service = NoteService(db)
+    return service.bulk_notes(dto)
+
+
+@router.post(
+    "/bulk/categories",
+    response_model=BulkCategoryResponse,
+    summary="Assign or remove categories across many notes"
+)
+def bulk_categories(
+    dto: BulkCategoryRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a set of categories to a set of notes in one transaction.
+    
+    - mode=add: link every category to every note (existing links are kept)
+    - mode=remove: unlink the categories from the notes
+    - mode=replace: each note ends up with exactly these categories
+      (an empty category_ids clears them)
+    """
+    service = NoteService(db)
+    return service.bulk_categories(dto)
+
+
+@router.get(
+    "/changes",
+    response_model=NoteChangesResponse,
+    summary="Get notes changed since a sync token"
+)
+def get_changes(
+    response: Response,
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of notes (and of deleted notes) per batch"),
+    db: Session = Depends(get_db)
+):
+    """
+    Delta sync: notes created or updated since `since`, plus tombstones for
+    deleted notes. Store next_token and pass it back as `since`; while
+    has_more is true, request again right away to get the rest.
+    Changes younger than CHANGES_MAX_TXN_LAG seconds are held back for a
+    later call, so a transaction committing late is not skipped.
     """
     service = NoteService(db)
-    return service.get_notes(archived=archived, category_id=category_id)
+    changes = service.get_changes(since=since, limit=limit)
+    return orjson_response(changes, response)
 
 
 @router.get(
@@ -53,36 +224,46 @@ def get_notes(
 )
 def get_note(
     note_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get a single note by ID.
+    Answers 304 Not Modified when If-None-Match carries the current ETag.
     """
     service = NoteService(db)
-    return service.get_note(note_id)
+    note = service.get_note(note_id)
+    check_not_modified(request, response, note_etag(note.id, note.updated_at))
+    return note
 
 
 @router.put(
     "/{note_id}",
     response_model=NoteResponse,
-    summary="Update a note"
+    summary="Update a note",
+    dependencies=[Depends(note_if_match)]
 )
 def update_note(
     note_id: UUID,
     dto: UpdateNoteDTO,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Update an existing note's title and/or content.
     """
     service = NoteService(db)
-    return service.update_note(note_id, dto)
+    note = service.update_note(note_id, dto)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
 
 
 @router.delete(
     "/{note_id}",
     status_code=status.HTTP_204_NO_CONTENT,
-    summary="Delete a note"
+    summary="Delete a note",
+    dependencies=[Depends(note_if_match)]
 )
 def delete_note(
     note_id: UUID,
@@ -98,64 +279,80 @@ def delete_note(
 @router.patch(
     "/{note_id}/archive",
     response_model=NoteResponse,
-    summary="Archive a note"
+    summary="Archive a note",
+    dependencies=[Depends(note_if_match)]
 )
 def archive_note(
     note_id: UUID,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Archive a note (sets is_archived to true).
     """
     service = NoteService(db)
-    return service.archive_note(note_id)
+    note = service.archive_note(note_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
 
 
 @router.patch(
     "/{note_id}/unarchive",
     response_model=NoteResponse,
-    summary="Unarchive a note"
+    summary="Unarchive a note",
+    dependencies=[Depends(note_if_match)]
 )
 def unarchive_note(
     note_id: UUID,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Unarchive a note (sets is_archived to false).
     """
     service = NoteService(db)
-    return service.unarchive_note(note_id)
+    note = service.unarchive_note(note_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
 
 
 @router.post(
     "/{note_id}/categories/{category_id}",
     response_model=NoteResponse,
-    summary="Add category to note"
+    summary="Add category to note",
+    dependencies=[Depends(note_if_match)]
 )
 def add_category_to_note(
     note_id: UUID,
     category_id: UUID,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Add a category to a note.
     """
     service = NoteService(db)
-    return service.add_category_to_note(note_id, category_id)
+    note = service.add_category_to_note(note_id, category_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
 
 
 @router.delete(
     "/{note_id}/categories/{category_id}",
     response_model=NoteResponse,
-    summary="Remove category from note"
+    summary="Remove category from note",
+    dependencies=[Depends(note_if_match)]
 )
 def remove_category_from_note(
     note_id: UUID,
     category_id: UUID,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Remove a category from a note.
     """
     service = NoteService(db)
-    return service.remove_category_from_note(note_id, category_id)
+    note = service.remove_category_from_note(note_id, category_id)
+    response.headers["ETag"] = note_etag(note.id, note.updated_at)
+    return note
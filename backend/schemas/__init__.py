@@ -3,7 +3,20 @@ from schemas.note_schemas import (
     CreateNoteDTO,
     UpdateNoteDTO,
     NoteResponse,
-    NoteListResponse
+    NoteListResponse,
+    NoteSummary,
+    NoteSummaryListResponse,
+    CompactNote,
+    CompactNoteListResponse,
+    NoteTombstone,
+    NoteChangesResponse,
+    NoteSearchResult,
+    NoteSearchResponse,
+    BulkNoteRequest,
+    BulkOperationResult,
+    BulkNoteResponse,
+    BulkCategoryRequest,
+    BulkCategoryResponse
 )
 from schemas.category_schemas import (
     CategoryBase,
@@ -19,6 +32,19 @@ __all__ = [
     "UpdateNoteDTO",
     "NoteResponse",
     "NoteListResponse",
+    "NoteSummary",
+    "NoteSummaryListResponse",
+    "CompactNote",
+    "CompactNoteListResponse",
+    "NoteTombstone",
+    "NoteChangesResponse",
+    "NoteSearchResult",
+    "NoteSearchResponse",
+    "BulkNoteRequest",
+    "BulkOperationResult",
+    "BulkNoteResponse",
+    "BulkCategoryRequest",
+    "BulkCategoryResponse",
     "CategoryBase",
     "CreateCategoryDTO",
     "UpdateCategoryDTO",
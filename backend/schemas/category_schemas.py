@@ -32,3 +32,5 @@ class CategoryResponse(CategoryBase):
 class CategoryWithNotesCount(CategoryResponse):
     """Schema for category with notes count"""
     notes_count: int = 0
+    active_notes_count: int = 0
+    archived_notes_count: int = 0
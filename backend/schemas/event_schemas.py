@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from datetime import datetime, timezone
+from uuid import UUID
+
+
+ChangeEventType = Literal[
+    "note.created",
+    "note.updated",
+    "note.archived",
+    "note.unarchived",
+    "note.deleted",
+    "notes.bulk",
+    "category.created",
+    "category.updated",
+    "category.deleted",
+    "resync",
+]
+
+
+class ChangeEvent(BaseModel):
+    """
+    Schema for a change notification pushed to subscribers.
+    
+    Events only identify what changed; clients fetch the data itself, e.g.
+    from GET /api/notes/changes. "notes.bulk" and "resync" carry no id and
+    mean "resync from the changes feed".
+    """
+    type: ChangeEventType
+    id: Optional[UUID] = Field(None, description="ID of the note or category that changed")
+    count: Optional[int] = Field(None, description="Number of notes touched by a notes.bulk event")
+    at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
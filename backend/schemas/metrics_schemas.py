@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class PoolStats(BaseModel):
+    """Schema for connection pool counters and gauges"""
+    pool_class: str
+    connects: int = Field(..., description="New DBAPI connections opened")
+    checkouts: int
+    checkins: int
+    invalidations: int
+    timeouts: int = Field(..., description="Checkouts that gave up after pool_timeout")
+    wait_seconds_total: float = Field(..., description="Total time spent checking out connections")
+    wait_seconds_max: float
+    wait_seconds_avg: float
+    size: Optional[int] = Field(None, description="Configured pool size (null without a client-side pool)")
+    checkedin: Optional[int] = Field(None, description="Idle connections in the pool")
+    checkedout: Optional[int] = Field(None, description="Connections currently in use")
+    overflow: Optional[int] = Field(None, description="Connections open beyond pool_size (negative while the pool is filling)")
+
+
+class PoolMetricsResponse(BaseModel):
+    """Schema for the pool metrics endpoint"""
+    sync: Optional[PoolStats] = Field(None, description="Null until the sync engine is first used")
+    async_: Optional[PoolStats] = Field(None, alias="async", description="Only in async database mode, once used")
+
+
+class CacheStats(BaseModel):
+    """Schema for in-process cache counters"""
+    entries: int
+    bytes: int = Field(..., description="Total UTF-8 size of the cached values")
+    hits: int
+    misses: int
+    evictions: int = Field(..., description="Entries dropped to stay within the size limits")
+
+
+class EventMetricsResponse(BaseModel):
+    """Schema for the change event metrics endpoint"""
+    backend: str
+    subscribers: int = Field(..., description="Open SSE / WebSocket subscriptions in this process")
+    published: int = Field(..., description="Events delivered to this process's hub")
+    dropped_subscribers: int = Field(..., description="Subscribers disconnected for falling behind")
+
+
+class CacheMetricsResponse(BaseModel):
+    """Schema for the cache metrics endpoint"""
+    backend: str
+    stats: Optional[CacheStats] = Field(None, description="Only for backends that keep counters")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from datetime import datetime
 from uuid import UUID
 from schemas.category_schemas import CategoryResponse
@@ -34,7 +34,148 @@ class NoteResponse(NoteBase):
 
 
 class NoteListResponse(BaseModel):
-    """Schema for list of notes"""
+    """Schema for a page of notes"""
     notes: List[NoteResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total matching notes (only when include_total=true)")
     archived: Optional[bool] = None
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class NoteSummary(BaseModel):
+    """Schema for a note in summary lists (view=summary), without its full content"""
+    title: str
+    snippet: str = Field(..., description="Beginning of the note content")
+    id: UUID
+    is_archived: bool
+    created_at: datetime
+    updated_at: datetime
+    categories: List[CategoryResponse] = []
+
+
+class NoteSummaryListResponse(BaseModel):
+    """Schema for a page of note summaries"""
+    notes: List[NoteSummary]
+    total: Optional[int] = Field(None, description="Total matching notes (only when include_total=true)")
+    archived: Optional[bool] = None
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class CompactNote(NoteBase):
+    """Schema for a note in compact lists (include=categories), referencing its categories by id"""
+    id: UUID
+    is_archived: bool
+    created_at: datetime
+    updated_at: datetime
+    category_ids: List[UUID] = Field([], description="Keys into the page's categories map")
+
+
+class CompactNoteListResponse(BaseModel):
+    """Schema for a page of notes whose categories are sent once, in a map"""
+    notes: List[CompactNote]
+    categories: Dict[UUID, CategoryResponse] = Field(..., description="Categories of the notes on this page, by id")
+    total: Optional[int] = Field(None, description="Total matching notes (only when include_total=true)")
+    archived: Optional[bool] = None
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class NoteTombstone(BaseModel):
+    """Schema for a deleted note in the changes feed"""
+    id: UUID
+    deleted_at: datetime
+
+
+class NoteChangesResponse(BaseModel):
+    """Schema for one batch of the notes changes feed"""
+    notes: List[NoteResponse] = Field(..., description="Notes created or updated since the token, oldest change first")
+    deleted: List[NoteTombstone] = Field(..., description="Notes deleted since the token")
+    next_token: str = Field(..., description="Token to pass as since on the next request")
+    has_more: bool = Field(..., description="Whether more changes are waiting; request again with next_token")
+
+
+class NoteSearchResult(NoteResponse):
+    """Schema for a note matched by full-text search"""
+    rank: float = Field(..., description="Relevance score (higher is better)")
+
+
+class NoteSearchResponse(BaseModel):
+    """Schema for a page of full-text search results"""
+    results: List[NoteSearchResult]
+    query: str
+    limit: int
+    offset: int
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, null on the last page")
+
+
+class BulkCreateOperation(NoteBase):
+    """Bulk operation creating a note"""
+    op: Literal["create"]
+
+
+class BulkUpdateOperation(UpdateNoteDTO):
+    """Bulk operation updating a note"""
+    op: Literal["update"]
+    id: UUID
+
+
+class BulkArchiveOperation(BaseModel):
+    """Bulk operation archiving or unarchiving a note"""
+    op: Literal["archive", "unarchive"]
+    id: UUID
+
+
+class BulkDeleteOperation(BaseModel):
+    """Bulk operation deleting a note"""
+    op: Literal["delete"]
+    id: UUID
+
+
+BulkOperation = Annotated[
+    Union[BulkCreateOperation, BulkUpdateOperation, BulkArchiveOperation, BulkDeleteOperation],
+    Field(discriminator="op")
+]
+
+
+class BulkNoteRequest(BaseModel):
+    """Schema for a batch of note operations applied in one transaction"""
+    operations: List[BulkOperation] = Field(..., min_length=1, max_length=10000)
+
+
+class BulkOperationResult(BaseModel):
+    """Outcome of one bulk operation"""
+    index: int = Field(..., description="Position of the operation in the request")
+    op: str
+    id: Optional[UUID] = Field(None, description="Note ID (generated for create operations)")
+    status: Literal["ok", "not_found"]
+    detail: Optional[str] = None
+
+
+class BulkNoteResponse(BaseModel):
+    """Schema for the per-item results of a bulk request"""
+    results: List[BulkOperationResult]
+    succeeded: int
+    failed: int
+
+
+class BulkCategoryRequest(BaseModel):
+    """Schema for assigning or removing categories across many notes"""
+    note_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+    category_ids: List[UUID] = Field(..., max_length=100)
+    mode: Literal["add", "remove", "replace"] = Field(
+        "add",
+        description="add/remove the categories, or replace each note's categories with exactly this set"
+    )
+    
+    @model_validator(mode="after")
+    def require_categories(self) -> "BulkCategoryRequest":
+        if not self.category_ids and self.mode != "replace":
+            raise ValueError("category_ids may only be empty in replace mode")
+        return self
+
+
+class BulkCategoryResponse(BaseModel):
+    """Schema for the outcome of a bulk category assignment"""
+    mode: str
+    notes_matched: int = Field(..., description="Number of requested notes that exist")
+    links_added: int
+    links_removed: int
+    missing_note_ids: List[UUID] = []
@@ -1,4 +1,6 @@
 from services.note_service import NoteService
 from services.category_service import CategoryService
+from services.async_note_service import AsyncNoteService
+from services.async_category_service import AsyncCategoryService
 
-__all__ = ["NoteService", "CategoryService"]
+__all__ = ["NoteService", "CategoryService", "AsyncNoteService", "AsyncCategoryService"]
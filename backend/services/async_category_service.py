@@ -0,0 +1,194 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import Iterable, List, Optional, Union
+from uuid import UUID
+from fastapi import HTTPException, status
+
+from repositories.async_category_repository import AsyncCategoryRepository
+from schemas.category_schemas import (
+    CreateCategoryDTO,
+    UpdateCategoryDTO,
+    CategoryResponse,
+    CategoryWithNotesCount
+)
+from services.category_service import CategoryService
+from events import EventBroker, get_broker
+from schemas.event_schemas import ChangeEvent
+from cache import (
+    CacheBackend,
+    CATEGORY_LIST_KEY,
+    CATEGORY_COUNTS_KEY,
+    async_read_through,
+    category_key,
+    get_cache,
+    note_key
+)
+
+
+class AsyncCategoryService:
+    """
+    Async service layer for Category business logic.
+    Mirrors CategoryService on top of the async repositories.
+    """
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[CacheBackend] = None,
+        events: Optional[EventBroker] = None
+    ):
+        self.category_repo = AsyncCategoryRepository(db)
+        self.cache = cache if cache is not None else get_cache()
+        self.events = events if events is not None else get_broker()
+    
+    async def create_category(self, dto: CreateCategoryDTO) -> CategoryResponse:
+        """
+        Create a new category.
+        
+        Args:
+            dto: Category creation data
+            
+        Returns:
+            Created category
+            
+        Raises:
+            HTTPException: If category name already exists
+        """
+        # Check if category with same name already exists
+        existing = await self.category_repo.get_by_name(dto.name)
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Category with name '{dto.name}' already exists"
+            )
+        
+        try:
+            category = await self.category_repo.create(name=dto.name, color=dto.color)
+            self.cache.delete(CATEGORY_LIST_KEY, CATEGORY_COUNTS_KEY)
+            self.events.publish(ChangeEvent(type="category.created", id=category.id))
+            return CategoryResponse.model_validate(category)
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Category with name '{dto.name}' already exists"
+            )
+    
+    async def get_categories(self, with_counts: bool = False) -> Union[List[CategoryResponse], List[CategoryWithNotesCount]]:
+        """
+        Get all categories.
+        
+        Args:
+            with_counts: Include active/archived note counts per category
+            
+        Returns:
+            List of all categories
+        """
+        if with_counts:
+            async def load_with_counts() -> List[CategoryWithNotesCount]:
+                rows = await self.category_repo.get_all_with_counts()
+                return [CategoryService.with_counts(*row) for row in rows]
+            
+            return await async_read_through(
+                self.cache, CATEGORY_COUNTS_KEY, List[CategoryWithNotesCount], load_with_counts
+            )
+        
+        async def load() -> List[CategoryResponse]:
+            categories = await self.category_repo.get_all()
+            return [CategoryResponse.model_validate(cat) for cat in categories]
+        
+        return await async_read_through(self.cache, CATEGORY_LIST_KEY, List[CategoryResponse], load)
+    
+    async def get_category(self, category_id: UUID) -> CategoryResponse:
+        """
+        Get a single category by ID.
+        
+        Args:
+            category_id: UUID of the category
+            
+        Returns:
+            Category data
+            
+        Raises:
+            HTTPException: If category not found
+        """
+        async def load() -> CategoryResponse:
+            category = await self.category_repo.get_by_id(category_id)
+            if not category:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Category with id {category_id} not found"
+                )
+            return CategoryResponse.model_validate(category)
+        
+        return await async_read_through(self.cache, category_key(category_id), CategoryResponse, load)
+    
+    async def update_category(self, category_id: UUID, dto: UpdateCategoryDTO) -> CategoryResponse:
+        """
+        Update an existing category.
+        
+        Args:
+            category_id: UUID of the category to update
+            dto: Update data
+            
+        Returns:
+            Updated category
+            
+        Raises:
+            HTTPException: If category not found or name already exists
+        """
+        # Check if new name already exists (if name is being updated)
+        if dto.name:
+            existing = await self.category_repo.get_by_name(dto.name)
+            if existing and existing.id != category_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Category with name '{dto.name}' already exists"
+                )
+        
+        category = await self.category_repo.update(
+            category_id=category_id,
+            name=dto.name,
+            color=dto.color
+        )
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Category with id {category_id} not found"
+            )
+        # Note responses embed the category, so its notes are stale too
+        self._invalidate(category_id, await self._cached_note_ids(category_id))
+        self.events.publish(ChangeEvent(type="category.updated", id=category_id))
+        return CategoryResponse.model_validate(category)
+    
+    async def delete_category(self, category_id: UUID) -> None:
+        """
+        Delete a category.
+        
+        Args:
+            category_id: UUID of the category to delete
+            
+        Raises:
+            HTTPException: If category not found
+        """
+        note_ids = await self._cached_note_ids(category_id)
+        deleted = await self.category_repo.delete(category_id)
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Category with id {category_id} not found"
+            )
+        self._invalidate(category_id, note_ids)
+        self.events.publish(ChangeEvent(type="category.deleted", id=category_id))
+    
+    async def _cached_note_ids(self, category_id: UUID) -> List[UUID]:
+        """IDs of the category's notes, looked up only when a cache is in use"""
+        return await self.category_repo.note_ids(category_id) if self.cache.enabled else []
+    
+    def _invalidate(self, category_id: UUID, note_ids: Iterable[UUID]) -> None:
+        """Drop the cached entries that embed a category"""
+        self.cache.delete(
+            category_key(category_id),
+            CATEGORY_LIST_KEY,
+            CATEGORY_COUNTS_KEY,
+            *(note_key(note_id) for note_id in note_ids)
+        )
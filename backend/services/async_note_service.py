@@ -0,0 +1,333 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+
+from repositories.async_note_repository import AsyncNoteRepository
+from repositories.async_category_repository import AsyncCategoryRepository
+from schemas.note_schemas import CreateNoteDTO, UpdateNoteDTO, NoteResponse
+from services.note_service import NoteService
+from services.payloads import note_payloads
+from events import EventBroker, get_broker
+from schemas.event_schemas import ChangeEvent
+from cache import CacheBackend, CATEGORY_COUNTS_KEY, async_read_through, get_cache, note_key
+
+
+class AsyncNoteService:
+    """
+    Async service layer for Note business logic.
+    Mirrors NoteService on top of the async repositories.
+    """
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[CacheBackend] = None,
+        events: Optional[EventBroker] = None
+    ):
+        self.note_repo = AsyncNoteRepository(db)
+        self.category_repo = AsyncCategoryRepository(db)
+        self.cache = cache if cache is not None else get_cache()
+        self.events = events if events is not None else get_broker()
+    
+    async def create_note(self, dto: CreateNoteDTO) -> NoteResponse:
+        """
+        Create a new note.
+        
+        Args:
+            dto: Note creation data
+            
+        Returns:
+            Created note
+        """
+        note = await self.note_repo.create(title=dto.title, content=dto.content)
+        self.events.publish(ChangeEvent(type="note.created", id=note.id))
+        return NoteResponse.model_validate(note)
+    
+    async def get_notes(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        view: str = "full",
+        fields: Optional[str] = None,
+        include: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one page of notes with optional filters.
+        
+        Args:
+            archived: Filter by archived status
+            category_id: Filter by category
+            limit: Maximum number of notes in the page
+            cursor: Cursor returned by the previous page (None = first page)
+            include_total: Whether to count all matching notes
+            view: "full" notes, or "summary" notes with a snippet instead of content
+            fields: Comma-separated note fields to return, overriding the view
+            include: "categories" to reference categories by id and send
+                each of them once
+                
+        Returns:
+            Page of notes with the cursor for the next page, as a dict built
+            from rows without validation
+            
+        Raises:
+            HTTPException: If the cursor, view or fields are invalid
+        """
+        note_fields = NoteService.resolve_list_fields(view, fields)
+        compact = NoteService.is_compact(note_fields, include)
+        row_fields = tuple(field for field in note_fields if field != "categories") if compact else note_fields
+        # Fetch one extra row to know whether another page exists
+        rows = await self.note_repo.get_page_rows(
+            archived=archived,
+            category_id=category_id,
+            limit=limit + 1,
+            after=NoteService.decode_page_cursor(cursor),
+            fields=row_fields
+        )
+        total = None
+        if include_total:
+            total = await self.note_repo.count(archived=archived, category_id=category_id)
+        page = NoteService.list_payload(rows, row_fields, limit, archived, total)
+        if compact:
+            note_ids = [note["id"] for note in page["notes"]]
+            links = await self.note_repo.get_category_links(note_ids) if note_ids else []
+            category_ids = {category_id for _, category_id in links}
+            category_rows = await self.category_repo.get_rows_by_ids(category_ids) if category_ids else []
+            page = NoteService.compact_page(page, links, category_rows)
+        return page
+    
+    async def get_changes(self, since: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+        """
+        Get the notes created, updated or deleted since a sync token.
+        
+        Args:
+            since: Token returned as next_token by the previous call (None = full sync)
+            limit: Maximum number of notes, and of tombstones, in the batch
+            
+        Returns:
+            Batch of changes with the token to resume from, as a
+            NoteChangesResponse-shaped dict built from rows without validation
+            
+        Raises:
+            HTTPException: If the token is malformed
+        """
+        notes_after, deletions_after = NoteService.decode_since(since)
+        notes = note_payloads(await self.note_repo.get_changed_rows(notes_after, limit + 1))
+        deletions = await self.note_repo.get_deletions(deletions_after, limit + 1)
+        return NoteService.changes_payload(notes, deletions, notes_after, deletions_after, limit)
+    
+    async def get_note(self, note_id: UUID) -> NoteResponse:
+        """
+        Get a single note by ID.
+        
+        Args:
+            note_id: UUID of the note
+            
+        Returns:
+            Note data
+            
+        Raises:
+            HTTPException: If note not found
+        """
+        async def load() -> NoteResponse:
+            note = await self.note_repo.get_by_id(note_id)
+            if not note:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Note with id {note_id} not found"
+                )
+            return NoteResponse.model_validate(note)
+        
+        return await async_read_through(self.cache, note_key(note_id), NoteResponse, load)
+    
+    async def get_note_version(self, note_id: UUID, lock: bool = False) -> Optional[datetime]:
+        """
+        Get the updated_at of a note, used as its ETag source.
+        
+        Args:
+            note_id: UUID of the note
+            lock: Lock the note row until the request's transaction ends
+            
+        Returns:
+            updated_at if the note exists, None otherwise
+        """
+        return await self.note_repo.get_version(note_id, lock=lock)
+    
+    async def get_list_version(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Summarize the notes matching the list filters, used as the list ETag source.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            (number of matching notes, latest updated_at), or None while the
+            latest change is more recent than the transaction lag
+        """
+        return await self.note_repo.get_list_version(archived, category_id)
+    
+    async def update_note(self, note_id: UUID, dto: UpdateNoteDTO) -> NoteResponse:
+        """
+        Update an existing note.
+        
+        Args:
+            note_id: UUID of the note to update
+            dto: Update data
+            
+        Returns:
+            Updated note
+            
+        Raises:
+            HTTPException: If note not found
+        """
+        note = await self.note_repo.update(
+            note_id=note_id,
+            title=dto.title,
+            content=dto.content
+        )
+        self.cache.delete(note_key(note_id))
+        if not note:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with id {note_id} not found"
+            )
+        self.events.publish(ChangeEvent(type="note.updated", id=note.id))
+        return NoteResponse.model_validate(note)
+    
+    async def delete_note(self, note_id: UUID) -> None:
+        """
+        Delete a note.
+        
+        Args:
+            note_id: UUID of the note to delete
+            
+        Raises:
+            HTTPException: If note not found
+        """
+        deleted = await self.note_repo.delete(note_id)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with id {note_id} not found"
+            )
+        self.events.publish(ChangeEvent(type="note.deleted", id=note_id))
+    
+    async def archive_note(self, note_id: UUID) -> NoteResponse:
+        """
+        Archive a note.
+        
+        Args:
+            note_id: UUID of the note to archive
+            
+        Returns:
+            Archived note
+            
+        Raises:
+            HTTPException: If note not found
+        """
+        note = await self.note_repo.archive(note_id)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
+        if not note:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with id {note_id} not found"
+            )
+        self.events.publish(ChangeEvent(type="note.archived", id=note.id))
+        return NoteResponse.model_validate(note)
+    
+    async def unarchive_note(self, note_id: UUID) -> NoteResponse:
+        """
+        Unarchive a note.
+        
+        Args:
+            note_id: UUID of the note to unarchive
+            
+        Returns:
+            Unarchived note
+            
+        Raises:
+            HTTPException: If note not found
+        """
+        note = await self.note_repo.unarchive(note_id)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
+        if not note:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with id {note_id} not found"
+            )
+        self.events.publish(ChangeEvent(type="note.unarchived", id=note.id))
+        return NoteResponse.model_validate(note)
+    
+    async def add_category_to_note(self, note_id: UUID, category_id: UUID) -> NoteResponse:
+        """
+        Add a category to a note.
+        
+        Args:
+            note_id: UUID of the note
+            category_id: UUID of the category
+            
+        Returns:
+            Updated note
+            
+        Raises:
+            HTTPException: If note or category not found
+        """
+        category = await self.category_repo.get_by_id(category_id)
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Category with id {category_id} not found"
+            )
+        
+        note = await self.note_repo.add_category(note_id, category)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
+        if not note:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with id {note_id} not found"
+            )
+        
+        self.events.publish(ChangeEvent(type="note.updated", id=note.id))
+        return NoteResponse.model_validate(note)
+    
+    async def remove_category_from_note(self, note_id: UUID, category_id: UUID) -> NoteResponse:
+        """
+        Remove a category from a note.
+        
+        Args:
+            note_id: UUID of the note
+            category_id: UUID of the category
+            
+        Returns:
+            Updated note
+            
+        Raises:
+            HTTPException: If note or category not found
+        """
+        category = await self.category_repo.get_by_id(category_id)
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Category with id {category_id} not found"
+            )
+        
+        note = await self.note_repo.remove_category(note_id, category)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
+        if not note:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with id {note_id} not found"
+            )
+        
+        self.events.publish(ChangeEvent(type="note.updated", id=note.id))
+        return NoteResponse.model_validate(note)
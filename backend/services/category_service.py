@@ -1,11 +1,27 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import Iterable, List, Optional, Union
 from uuid import UUID
 from fastapi import HTTPException, status
 
 from repositories.category_repository import CategoryRepository
-from schemas.category_schemas import CreateCategoryDTO, UpdateCategoryDTO, CategoryResponse
+from schemas.category_schemas import (
+    CreateCategoryDTO,
+    UpdateCategoryDTO,
+    CategoryResponse,
+    CategoryWithNotesCount
+)
+from events import EventBroker, get_broker
+from schemas.event_schemas import ChangeEvent
+from cache import (
+    CacheBackend,
+    CATEGORY_LIST_KEY,
+    CATEGORY_COUNTS_KEY,
+    category_key,
+    get_cache,
+    note_key,
+    read_through
+)
 
 
 class CategoryService:
@@ -14,8 +30,15 @@ class CategoryService:
     Orchestrates operations between routers and repositories.
     """
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        cache: Optional[CacheBackend] = None,
+        events: Optional[EventBroker] = None
+    ):
         self.category_repo = CategoryRepository(db)
+        self.cache = cache if cache is not None else get_cache()
+        self.events = events if events is not None else get_broker()
     
     def create_category(self, dto: CreateCategoryDTO) -> CategoryResponse:
         """
@@ -40,6 +63,8 @@ class CategoryService:
         
         try:
             category = self.category_repo.create(name=dto.name, color=dto.color)
+            self.cache.delete(CATEGORY_LIST_KEY, CATEGORY_COUNTS_KEY)
+            self.events.publish(ChangeEvent(type="category.created", id=category.id))
             return CategoryResponse.model_validate(category)
         except IntegrityError:
             raise HTTPException(
@@ -47,15 +72,40 @@ class CategoryService:
                 detail=f"Category with name '{dto.name}' already exists"
             )
     
-    def get_categories(self) -> List[CategoryResponse]:
+    def get_categories(self, with_counts: bool = False) -> Union[List[CategoryResponse], List[CategoryWithNotesCount]]:
         """
         Get all categories.
         
+        Args:
+            with_counts: Include active/archived note counts per category
+            
         Returns:
             List of all categories
         """
-        categories = self.category_repo.get_all()
-        return [CategoryResponse.model_validate(cat) for cat in categories]
+        if with_counts:
+            return read_through(
+                self.cache,
+                CATEGORY_COUNTS_KEY,
+                List[CategoryWithNotesCount],
+                lambda: [self.with_counts(*row) for row in self.category_repo.get_all_with_counts()]
+            )
+        
+        return read_through(
+            self.cache,
+            CATEGORY_LIST_KEY,
+            List[CategoryResponse],
+            lambda: [CategoryResponse.model_validate(cat) for cat in self.category_repo.get_all()]
+        )
+    
+    @staticmethod
+    def with_counts(category, active: int, archived: int) -> CategoryWithNotesCount:
+        """Build a CategoryWithNotesCount from a category and its note counts"""
+        return CategoryWithNotesCount(
+            **CategoryResponse.model_validate(category).model_dump(),
+            notes_count=active + archived,
+            active_notes_count=active,
+            archived_notes_count=archived
+        )
     
     def get_category(self, category_id: UUID) -> CategoryResponse:
         """
@@ -70,13 +120,16 @@ class CategoryService:
         Raises:
             HTTPException: If category not found
         """
-        category = self.category_repo.get_by_id(category_id)
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Category with id {category_id} not found"
-            )
-        return CategoryResponse.model_validate(category)
+        def load() -> CategoryResponse:
+            category = self.category_repo.get_by_id(category_id)
+            if not category:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Category with id {category_id} not found"
+                )
+            return CategoryResponse.model_validate(category)
+        
+        return read_through(self.cache, category_key(category_id), CategoryResponse, load)
     
     def update_category(self, category_id: UUID, dto: UpdateCategoryDTO) -> CategoryResponse:
         """
@@ -111,6 +164,9 @@ class CategoryService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Category with id {category_id} not found"
             )
+        # Note responses embed the category, so its notes are stale too
+        self._invalidate(category_id, self._cached_note_ids(category_id))
+        self.events.publish(ChangeEvent(type="category.updated", id=category_id))
         return CategoryResponse.model_validate(category)
     
     def delete_category(self, category_id: UUID) -> None:
@@ -123,9 +179,25 @@ class CategoryService:
         Raises:
             HTTPException: If category not found
         """
+        note_ids = self._cached_note_ids(category_id)
         deleted = self.category_repo.delete(category_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Category with id {category_id} not found"
             )
+        self._invalidate(category_id, note_ids)
+        self.events.publish(ChangeEvent(type="category.deleted", id=category_id))
+    
+    def _cached_note_ids(self, category_id: UUID) -> List[UUID]:
+        """IDs of the category's notes, looked up only when a cache is in use"""
+        return self.category_repo.note_ids(category_id) if self.cache.enabled else []
+    
+    def _invalidate(self, category_id: UUID, note_ids: Iterable[UUID]) -> None:
+        """Drop the cached entries that embed a category"""
+        self.cache.delete(
+            category_key(category_id),
+            CATEGORY_LIST_KEY,
+            CATEGORY_COUNTS_KEY,
+            *(note_key(note_id) for note_id in note_ids)
+        )
@@ -1,11 +1,30 @@
+from collections import Counter
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import UUID
 from fastapi import HTTPException, status
 
 from repositories.note_repository import NoteRepository
 from repositories.category_repository import CategoryRepository
-from schemas.note_schemas import CreateNoteDTO, UpdateNoteDTO, NoteResponse
+from models.note_deletion import NoteDeletion
+from schemas.note_schemas import (
+    CreateNoteDTO,
+    UpdateNoteDTO,
+    NoteResponse,
+    NoteSearchResult,
+    NoteSearchResponse,
+    BulkNoteRequest,
+    BulkOperationResult,
+    BulkNoteResponse,
+    BulkCategoryRequest,
+    BulkCategoryResponse
+)
+from services.pagination import encode_cursor, decode_cursor, encode_sync_token, decode_sync_token
+from services.payloads import link_categories, note_payloads, resolve_fields
+from events import EventBroker, get_broker
+from schemas.event_schemas import ChangeEvent
+from cache import CacheBackend, CATEGORY_COUNTS_KEY, get_cache, note_key, read_through
 
 
 class NoteService:
@@ -14,9 +33,16 @@ class NoteService:
     Orchestrates operations between routers and repositories.
     """
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        cache: Optional[CacheBackend] = None,
+        events: Optional[EventBroker] = None
+    ):
         self.note_repo = NoteRepository(db)
         self.category_repo = CategoryRepository(db)
+        self.cache = cache if cache is not None else get_cache()
+        self.events = events if events is not None else get_broker()
     
     def create_note(self, dto: CreateNoteDTO) -> NoteResponse:
         """
@@ -29,25 +55,414 @@ class NoteService:
             Created note
         """
         note = self.note_repo.create(title=dto.title, content=dto.content)
+        self.events.publish(ChangeEvent(type="note.created", id=note.id))
         return NoteResponse.model_validate(note)
     
     def get_notes(
         self,
         archived: Optional[bool] = None,
-        category_id: Optional[UUID] = None
-    ) -> List[NoteResponse]:
+        category_id: Optional[UUID] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        view: str = "full",
+        fields: Optional[str] = None,
+        include: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Get all notes with optional filters.
+        Get one page of notes with optional filters.
         
         Args:
             archived: Filter by archived status
             category_id: Filter by category
+            limit: Maximum number of notes in the page
+            cursor: Cursor returned by the previous page (None = first page)
+            include_total: Whether to count all matching notes
+            view: "full" notes, or "summary" notes with a snippet instead of content
+            fields: Comma-separated note fields to return, overriding the view
+            include: "categories" to reference categories by id and send
+                each of them once (CompactNoteListResponse)
+                
+        Returns:
+            Page of notes with the cursor for the next page, as a
+            NoteListResponse-shaped (or NoteSummaryListResponse-shaped,
+            CompactNoteListResponse-shaped, or projected) dict built from
+            rows without validation
+            
+        Raises:
+            HTTPException: If the cursor, view or fields are invalid
+        """
+        note_fields = self.resolve_list_fields(view, fields)
+        compact = self.is_compact(note_fields, include)
+        row_fields = tuple(field for field in note_fields if field != "categories") if compact else note_fields
+        # Fetch one extra row to know whether another page exists
+        rows = self.note_repo.get_page_rows(
+            archived=archived,
+            category_id=category_id,
+            limit=limit + 1,
+            after=self.decode_page_cursor(cursor),
+            fields=row_fields
+        )
+        total = None
+        if include_total:
+            total = self.note_repo.count(archived=archived, category_id=category_id)
+        page = self.list_payload(rows, row_fields, limit, archived, total)
+        if compact:
+            note_ids = [note["id"] for note in page["notes"]]
+            links = self.note_repo.get_category_links(note_ids) if note_ids else []
+            category_ids = {category_id for _, category_id in links}
+            category_rows = self.category_repo.get_rows_by_ids(category_ids) if category_ids else []
+            page = self.compact_page(page, links, category_rows)
+        return page
+    
+    @staticmethod
+    def resolve_list_fields(view: str, fields: Optional[str]) -> Tuple[str, ...]:
+        """Resolve the view / fields parameters, answering 400 if they are invalid"""
+        try:
+            return resolve_fields(view, fields)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+    
+    @staticmethod
+    def is_compact(note_fields: Sequence[str], include: Optional[str]) -> bool:
+        """
+        Whether a list page references categories by id (include=categories).
+        
+        The page's links are then read with one query on note_categories and
+        its categories with another, instead of joining them to the page,
+        and each category is sent once per page.
+        """
+        return include == "categories" and "categories" in note_fields
+    
+    @staticmethod
+    def compact_page(page: Dict[str, Any], links: List[Any], category_rows: List[Any]) -> Dict[str, Any]:
+        """Turn a page built without categories into a CompactNoteListResponse-shaped dict"""
+        categories = link_categories(page["notes"], links, category_rows)
+        return {
+            "notes": page["notes"],
+            "categories": categories,
+            "total": page["total"],
+            "archived": page["archived"],
+            "next_cursor": page["next_cursor"]
+        }
+    
+    @classmethod
+    def list_payload(
+        cls,
+        rows: List[Any],
+        fields: Sequence[str],
+        limit: int,
+        archived: Optional[bool],
+        total: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build a list page holding `fields` of each note from up to limit + 1 notes' rows"""
+        # The next cursor is built from created_at, even when it was not requested
+        hide_created_at = "created_at" not in fields
+        if hide_created_at:
+            fields = (*fields, "created_at")
+        page = cls.page_payload(note_payloads(rows, fields), limit, archived, total)
+        if hide_created_at:
+            for note in page["notes"]:
+                del note["created_at"]
+        return page
+    
+    @staticmethod
+    def decode_page_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, UUID]]:
+        """Decode a list cursor, answering 400 if it is malformed"""
+        if not cursor:
+            return None
+        try:
+            return decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+    
+    @staticmethod
+    def page_payload(
+        notes: List[Dict[str, Any]],
+        limit: int,
+        archived: Optional[bool],
+        total: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build a NoteListResponse-shaped dict from up to limit + 1 note payloads"""
+        next_cursor = None
+        if len(notes) > limit:
+            notes = notes[:limit]
+            last = notes[-1]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        return {"notes": notes, "total": total, "archived": archived, "next_cursor": next_cursor}
+    
+    def get_changes(self, since: Optional[str] = None, limit: int = 500) -> Dict[str, Any]:
+        """
+        Get the notes created, updated or deleted since a sync token.
+        
+        Args:
+            since: Token returned as next_token by the previous call (None = full sync)
+            limit: Maximum number of notes, and of tombstones, in the batch
+            
+        Returns:
+            Batch of changes with the token to resume from, as a
+            NoteChangesResponse-shaped dict built from rows without validation
+            
+        Raises:
+            HTTPException: If the token is malformed
+        """
+        notes_after, deletions_after = self.decode_since(since)
+        notes = note_payloads(self.note_repo.get_changed_rows(notes_after, limit + 1))
+        deletions = self.note_repo.get_deletions(deletions_after, limit + 1)
+        return self.changes_payload(notes, deletions, notes_after, deletions_after, limit)
+    
+    @staticmethod
+    def decode_since(since: Optional[str]) -> Tuple[Optional[Tuple[datetime, UUID]], Optional[Tuple[datetime, UUID]]]:
+        """Decode a changes feed token, answering 400 if it is malformed"""
+        if not since:
+            return None, None
+        try:
+            return decode_sync_token(since)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+    
+    @staticmethod
+    def changes_payload(
+        notes: List[Dict[str, Any]],
+        deletions: List[NoteDeletion],
+        notes_after: Optional[Tuple[datetime, UUID]],
+        deletions_after: Optional[Tuple[datetime, UUID]],
+        limit: int
+    ) -> Dict[str, Any]:
+        """
+        Build a NoteChangesResponse-shaped dict from up to limit + 1 note
+        payloads and tombstones.
+        
+        The extra row tells whether more changes are waiting; each position in
+        the token only advances past the rows actually returned.
+        """
+        has_more = len(notes) > limit or len(deletions) > limit
+        notes, deletions = notes[:limit], deletions[:limit]
+        if notes:
+            notes_after = (notes[-1]["updated_at"], notes[-1]["id"])
+        if deletions:
+            deletions_after = (deletions[-1].deleted_at, deletions[-1].note_id)
+        
+        return {
+            "notes": notes,
+            "deleted": [{"id": row.note_id, "deleted_at": row.deleted_at} for row in deletions],
+            "next_token": encode_sync_token(notes_after, deletions_after),
+            "has_more": has_more,
+        }
+    
+    def search_notes(
+        self,
+        query: str,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> NoteSearchResponse:
+        """
+        Full-text search over notes, ranked by relevance.
+        
+        Args:
+            query: Search text
+            archived: Filter by archived status
+            category_id: Filter by category
+            limit: Maximum number of results in the page
+            offset: Number of results to skip
+            
+        Returns:
+            Page of ranked search results
+        """
+        # Fetch one extra row to know whether another page exists
+        matches = self.note_repo.search(
+            query,
+            archived=archived,
+            category_id=category_id,
+            limit=limit + 1,
+            offset=offset
+        )
+        next_offset = offset + limit if len(matches) > limit else None
+        
+        results = []
+        for note, rank in matches[:limit]:
+            result = NoteResponse.model_validate(note).model_dump()
+            results.append(NoteSearchResult(**result, rank=rank))
+        
+        return NoteSearchResponse(
+            results=results,
+            query=query,
+            limit=limit,
+            offset=offset,
+            next_offset=next_offset
+        )
+    
+    def export_notes(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None,
+        fmt: str = "ndjson",
+        batch_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Serialize all notes matching the filters as a stream of text chunks.
+        
+        Args:
+            archived: Filter by archived status
+            category_id: Filter by category
+            fmt: "ndjson" (one note per line) or "json" (a single JSON array)
+            batch_size: Number of notes serialized per chunk
+            
+        Yields:
+            Chunks of the export body
+        """
+        separator = "\n" if fmt == "ndjson" else ","
+        if fmt == "json":
+            yield "["
+        
+        first_chunk = True
+        batch: List[str] = []
+        for note in self.note_repo.iter_all(
+            archived=archived,
+            category_id=category_id,
+            batch_size=batch_size
+        ):
+            batch.append(NoteResponse.model_validate(note).model_dump_json())
+            if len(batch) >= batch_size:
+                yield self._export_chunk(batch, separator, fmt, first_chunk)
+                first_chunk = False
+                batch = []
+        
+        if batch:
+            yield self._export_chunk(batch, separator, fmt, first_chunk)
+        
+        if fmt == "json":
+            yield "]"
+    
+    @staticmethod
+    def _export_chunk(batch: List[str], separator: str, fmt: str, first_chunk: bool) -> str:
+        """Join serialized notes into one chunk of the export body"""
+        body = separator.join(batch)
+        if fmt == "ndjson":
+            return body + "\n"
+        return body if first_chunk else separator + body
+    
+    def bulk_notes(self, dto: BulkNoteRequest) -> BulkNoteResponse:
+        """
+        Apply a batch of create/update/archive/unarchive/delete operations.
+        
+        All writes happen in one transaction. Operations on notes that do not
+        exist are reported as not_found without aborting the rest.
+        
+        Args:
+            dto: Operations to apply
             
         Returns:
-            List of notes
+            Per-operation results, in request order
+            
+        Raises:
+            HTTPException: If a note ID appears in more than one operation
         """
-        notes = self.note_repo.get_all(archived=archived, category_id=category_id)
-        return [NoteResponse.model_validate(note) for note in notes]
+        referenced = [operation.id for operation in dto.operations if operation.op != "create"]
+        duplicates = [note_id for note_id, count in Counter(referenced).items() if count > 1]
+        if duplicates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Each note may appear in only one operation: {', '.join(sorted(map(str, duplicates)))}"
+            )
+        
+        existing = self.note_repo.existing_ids(referenced)
+        creates = []
+        updates = []
+        ids_by_op = {"archive": [], "unarchive": [], "delete": []}
+        results: List[BulkOperationResult] = []
+        
+        for index, operation in enumerate(dto.operations):
+            if operation.op == "create":
+                creates.append((operation.title, operation.content))
+                results.append(BulkOperationResult(index=index, op=operation.op, status="ok"))
+                continue
+            
+            if operation.id not in existing:
+                results.append(BulkOperationResult(
+                    index=index,
+                    op=operation.op,
+                    id=operation.id,
+                    status="not_found",
+                    detail=f"Note with id {operation.id} not found"
+                ))
+                continue
+            
+            if operation.op == "update":
+                values = operation.model_dump(include={"title", "content"}, exclude_none=True)
+                if values:
+                    updates.append({"id": operation.id, **values})
+            else:
+                ids_by_op[operation.op].append(operation.id)
+            results.append(BulkOperationResult(index=index, op=operation.op, id=operation.id, status="ok"))
+        
+        created_ids = iter(self.note_repo.bulk_apply(
+            creates=creates,
+            updates=updates,
+            archive_ids=ids_by_op["archive"],
+            unarchive_ids=ids_by_op["unarchive"],
+            delete_ids=ids_by_op["delete"]
+        ))
+        if existing:
+            self.cache.delete(CATEGORY_COUNTS_KEY, *(note_key(note_id) for note_id in existing))
+        for result in results:
+            if result.op == "create":
+                result.id = next(created_ids)
+        
+        failed = sum(result.status != "ok" for result in results)
+        if len(results) > failed:
+            # One event for the whole batch; subscribers resync from the changes feed
+            self.events.publish(ChangeEvent(type="notes.bulk", count=len(results) - failed))
+        return BulkNoteResponse(results=results, succeeded=len(results) - failed, failed=failed)
+    
+    def bulk_categories(self, dto: BulkCategoryRequest) -> BulkCategoryResponse:
+        """
+        Add, remove or replace categories across a set of notes.
+        
+        Args:
+            dto: Notes, categories and mode
+            
+        Returns:
+            Number of links added/removed and the note IDs that do not exist
+            
+        Raises:
+            HTTPException: If any category does not exist
+        """
+        note_ids = list(dict.fromkeys(dto.note_ids))
+        category_ids = list(dict.fromkeys(dto.category_ids))
+        
+        missing_categories = set(category_ids) - self.category_repo.existing_ids(category_ids)
+        if missing_categories:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Categories not found: {', '.join(sorted(map(str, missing_categories)))}"
+            )
+        
+        existing_notes = self.note_repo.existing_ids(note_ids)
+        matched = [note_id for note_id in note_ids if note_id in existing_notes]
+        added, removed = self.note_repo.set_categories(matched, category_ids, dto.mode) if matched else (0, 0)
+        if added or removed:
+            self.cache.delete(CATEGORY_COUNTS_KEY, *(note_key(note_id) for note_id in matched))
+            self.events.publish(ChangeEvent(type="notes.bulk", count=len(matched)))
+        
+        return BulkCategoryResponse(
+            mode=dto.mode,
+            notes_matched=len(matched),
+            links_added=added,
+            links_removed=removed,
+            missing_note_ids=[note_id for note_id in note_ids if note_id not in existing_notes]
+        )
     
     def get_note(self, note_id: UUID) -> NoteResponse:
         """
@@ -62,13 +477,47 @@ class NoteService:
         Raises:
             HTTPException: If note not found
         """
-        note = self.note_repo.get_by_id(note_id)
-        if not note:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Note with id {note_id} not found"
-            )
-        return NoteResponse.model_validate(note)
+        def load() -> NoteResponse:
+            note = self.note_repo.get_by_id(note_id)
+            if not note:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Note with id {note_id} not found"
+                )
+            return NoteResponse.model_validate(note)
+        
+        return read_through(self.cache, note_key(note_id), NoteResponse, load)
+    
+    def get_note_version(self, note_id: UUID, lock: bool = False) -> Optional[datetime]:
+        """
+        Get the updated_at of a note, used as its ETag source.
+        
+        Args:
+            note_id: UUID of the note
+            lock: Lock the note row until the request's transaction ends
+            
+        Returns:
+            updated_at if the note exists, None otherwise
+        """
+        return self.note_repo.get_version(note_id, lock=lock)
+    
+    def get_list_version(
+        self,
+        archived: Optional[bool] = None,
+        category_id: Optional[UUID] = None
+    ) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        Summarize the notes matching the list filters, used as the list ETag source.
+        
+        Args:
+            archived: Filter by archived status (None = all notes)
+            category_id: Filter by category ID
+            
+        Returns:
+            (number of matching notes, latest updated_at), or None while the
+            latest change is more recent than the transaction lag
+        """
+        return self.note_repo.get_list_version(archived, category_id)
     
     def update_note(self, note_id: UUID, dto: UpdateNoteDTO) -> NoteResponse:
         """
@@ -89,11 +538,13 @@ class NoteService:
             title=dto.title,
             content=dto.content
         )
+        self.cache.delete(note_key(note_id))
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Note with id {note_id} not found"
             )
+        self.events.publish(ChangeEvent(type="note.updated", id=note.id))
         return NoteResponse.model_validate(note)
     
     def delete_note(self, note_id: UUID) -> None:
@@ -107,11 +558,13 @@ class NoteService:
             HTTPException: If note not found
         """
         deleted = self.note_repo.delete(note_id)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Note with id {note_id} not found"
             )
+        self.events.publish(ChangeEvent(type="note.deleted", id=note_id))
     
     def archive_note(self, note_id: UUID) -> NoteResponse:
         """
@@ -127,11 +580,13 @@ class NoteService:
             HTTPException: If note not found
         """
         note = self.note_repo.archive(note_id)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Note with id {note_id} not found"
             )
+        self.events.publish(ChangeEvent(type="note.archived", id=note.id))
         return NoteResponse.model_validate(note)
     
     def unarchive_note(self, note_id: UUID) -> NoteResponse:
@@ -148,11 +603,13 @@ class NoteService:
             HTTPException: If note not found
         """
         note = self.note_repo.unarchive(note_id)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Note with id {note_id} not found"
             )
+        self.events.publish(ChangeEvent(type="note.unarchived", id=note.id))
         return NoteResponse.model_validate(note)
     
     def add_category_to_note(self, note_id: UUID, category_id: UUID) -> NoteResponse:
@@ -177,12 +634,14 @@ class NoteService:
             )
         
         note = self.note_repo.add_category(note_id, category)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Note with id {note_id} not found"
             )
         
+        self.events.publish(ChangeEvent(type="note.updated", id=note.id))
         return NoteResponse.model_validate(note)
     
     def remove_category_from_note(self, note_id: UUID, category_id: UUID) -> NoteResponse:
@@ -207,10 +666,12 @@ class NoteService:
             )
         
         note = self.note_repo.remove_category(note_id, category)
+        self.cache.delete(note_key(note_id), CATEGORY_COUNTS_KEY)
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Note with id {note_id} not found"
             )
         
+        self.events.publish(ChangeEvent(type="note.updated", id=note.id))
         return NoteResponse.model_validate(note)
@@ -0,0 +1,86 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, note_id: UUID) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor.
+    
+    Args:
+        created_at: Creation timestamp of the last note on the page
+        note_id: UUID of the last note on the page
+        
+    Returns:
+        Opaque cursor string
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(note_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Opaque cursor string
+        
+    Returns:
+        (created_at, note_id) keyset position
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+def encode_sync_token(
+    notes_after: Optional[Tuple[datetime, UUID]],
+    deletions_after: Optional[Tuple[datetime, UUID]]
+) -> str:
+    """
+    Encode the two positions of the changes feed into an opaque token.
+    
+    Args:
+        notes_after: (updated_at, id) of the last changed note returned, if any
+        deletions_after: (deleted_at, note_id) of the last tombstone returned, if any
+        
+    Returns:
+        Opaque sync token
+    """
+    def position(after):
+        return None if after is None else [after[0].isoformat(), str(after[1])]
+    
+    payload = json.dumps({"n": position(notes_after), "d": position(deletions_after)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[Optional[Tuple[datetime, UUID]], Optional[Tuple[datetime, UUID]]]:
+    """
+    Decode a token produced by encode_sync_token.
+    
+    Args:
+        token: Opaque sync token
+        
+    Returns:
+        (notes position, deletions position); None means "from the start"
+        
+    Raises:
+        ValueError: If the token is malformed
+    """
+    def position(value):
+        return None if value is None else (datetime.fromisoformat(value[0]), UUID(value[1]))
+    
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return position(payload["n"]), position(payload["d"])
+    except (ValueError, KeyError, TypeError, IndexError) as exc:
+        raise ValueError("Invalid sync token") from exc
@@ -0,0 +1,119 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.engine import Row
+
+from schemas.category_schemas import CategoryResponse
+from schemas.note_schemas import NoteResponse, NoteSummary
+
+
+# Serialization fast path for large note responses.
+#
+# List-style endpoints build plain dicts straight from NoteRepository's row
+# queries and return them through ORJSONResponse, skipping per-row
+# NoteResponse validation and FastAPI's second validation pass against the
+# response_model. Keys follow the schemas' field order, so the JSON matches
+# what the models would produce.
+
+NOTE_FIELDS = tuple(name for name in NoteResponse.model_fields if name != "categories")
+CATEGORY_FIELDS = tuple(CategoryResponse.model_fields)
+
+# Note fields the list endpoint can project with fields=, in output order.
+# "snippet" is the beginning of the content, cut in SQL.
+LIST_FIELDS = ("title", "content", "snippet") + NOTE_FIELDS[2:] + ("categories",)
+
+# Field sets of the list views (view=)
+NOTE_VIEWS: Dict[str, Tuple[str, ...]] = {
+    "full": tuple(NoteResponse.model_fields),
+    "summary": tuple(NoteSummary.model_fields),
+}
+
+
+def resolve_fields(view: str = "full", fields: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Work out which note fields a list request asked for.
+    
+    Args:
+        view: Name of a field set in NOTE_VIEWS
+        fields: Comma-separated LIST_FIELDS, overriding the view; "id" is
+            always included
+            
+    Returns:
+        Requested fields, in LIST_FIELDS order
+        
+    Raises:
+        ValueError: If the view or a field is unknown
+    """
+    if view not in NOTE_VIEWS:
+        raise ValueError(f"Unknown view: {view}")
+    if fields is None:
+        return NOTE_VIEWS[view]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(name for name in LIST_FIELDS if name in requested)
+
+
+def note_payloads(rows: Iterable[Row], fields: Sequence[str] = NOTE_VIEWS["full"]) -> List[Dict[str, Any]]:
+    """
+    Build NoteResponse-shaped dicts (or projections of them) from note/category rows.
+    
+    Args:
+        rows: Rows from NoteRepository.get_page_rows / get_changed_rows, one
+            per note and category, grouped by note
+        fields: Keys of each dict; "categories" requires the rows to carry
+            the category columns
+            
+    Returns:
+        One dict per note, in row order
+    """
+    note_fields = [field for field in fields if field != "categories"]
+    with_categories = "categories" in fields
+    payloads: List[Dict[str, Any]] = []
+    current = None
+    current_id = None
+    for row in rows:
+        values = row._mapping
+        if current is None or current_id != values["id"]:
+            current_id = values["id"]
+            current = {field: values[field] for field in note_fields}
+            if with_categories:
+                current["categories"] = []
+            payloads.append(current)
+        if with_categories and values["category_id"] is not None:
+            current["categories"].append({field: values[f"category_{field}"] for field in CATEGORY_FIELDS})
+    return payloads
+
+
+def link_categories(
+    notes: List[Dict[str, Any]],
+    links: Iterable[Row],
+    category_rows: Iterable[Row]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Give note payloads category_ids and collect their categories once.
+    
+    Args:
+        notes: Note payloads built without "categories"; category_ids is
+            added to each of them in place, in category name order
+        links: (note_id, category_id) rows of the notes
+        category_rows: Rows of the linked categories, in name order
+        
+    Returns:
+        CategoryResponse-shaped dicts of the linked categories, by id
+    """
+    categories: Dict[str, Dict[str, Any]] = {}
+    rank: Dict[UUID, int] = {}
+    for row in category_rows:
+        values = row._mapping
+        rank[values["id"]] = len(rank)
+        categories[str(values["id"])] = {field: values[field] for field in CATEGORY_FIELDS}
+    
+    by_note: Dict[UUID, List[UUID]] = {}
+    for note_id, category_id in links:
+        by_note.setdefault(note_id, []).append(category_id)
+    for note in notes:
+        note["category_ids"] = sorted(by_note.get(note["id"], ()), key=rank.__getitem__)
+    return categories
@@ -0,0 +1,44 @@
+"""
+Shared fixtures. The settings are read when the application modules are
+first imported, so the test environment is set up here, before any of them.
+
+Tests run against a throwaway SQLite database with the response cache and
+the transaction lag (CHANGES_MAX_TXN_LAG) off. Set TEST_DATABASE_URL to use
+another database instead (every row in it is deleted), and
+DATABASE_MODE=async to test the async stack.
+"""
+import os
+import tempfile
+
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+else:
+    _tmp_dir = tempfile.mkdtemp(prefix="notes_tests_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["DB_WARMUP"] = "false"
+# Rows written by a test are seconds old at most; tests covering the
+# transaction lag set it themselves
+os.environ["CHANGES_MAX_TXN_LAG"] = "0"
+
+import pytest
+from sqlalchemy.orm import Session
+
+from config.database import Base, SessionLocal, get_engine, init_db
+
+
+def reset_database() -> None:
+    """Create the tables if needed and delete every row"""
+    init_db()
+    with get_engine().begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def db() -> Session:
+    """Session on an empty database"""
+    reset_database()
+    with SessionLocal() as session:
+        yield session
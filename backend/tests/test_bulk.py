@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.category import Category
+from models.note import Note
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as client:
+        yield client
+
+
+def add_notes(db, *titles: str) -> list:
+    """Commit notes last written a minute ago, so a later write shows in updated_at"""
+    written_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    notes = [Note(title=title, content="text", created_at=written_at, updated_at=written_at) for title in titles]
+    db.add_all(notes)
+    db.commit()
+    return notes
+
+
+def add_categories(db, *names: str) -> list:
+    categories = [Category(name=name, color="#123456") for name in names]
+    db.add_all(categories)
+    db.commit()
+    return categories
+
+
+def get_note(client, note) -> dict:
+    return client.get(f"/api/notes/{note.id}").json()
+
+
+def parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def test_bulk_applies_mixed_operations(client, db):
+    edited, archived, deleted, untouched = add_notes(db, "edited", "archived", "deleted", "untouched")
+    missing = uuid4()
+    
+    response = client.post("/api/notes/bulk", json={"operations": [
+        {"op": "create", "title": "created", "content": "new"},
+        {"op": "update", "id": str(edited.id), "content": "changed"},
+        {"op": "archive", "id": str(archived.id)},
+        {"op": "delete", "id": str(missing)},
+        {"op": "delete", "id": str(deleted.id)},
+    ]})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (4, 1)
+    assert [(result["index"], result["op"], result["status"]) for result in body["results"]] == [
+        (0, "create", "ok"),
+        (1, "update", "ok"),
+        (2, "archive", "ok"),
+        (3, "delete", "not_found"),
+        (4, "delete", "ok"),
+    ]
+    assert body["results"][3]["id"] == str(missing)
+    assert str(missing) in body["results"][3]["detail"]
+    
+    created = client.get(f"/api/notes/{body['results'][0]['id']}").json()
+    assert (created["title"], created["content"], created["is_archived"]) == ("created", "new", False)
+    assert get_note(client, edited)["content"] == "changed"
+    assert get_note(client, archived)["is_archived"] is True
+    assert client.get(f"/api/notes/{deleted.id}").status_code == 404
+    assert get_note(client, untouched)["title"] == "untouched"
+
+
+def test_bulk_bumps_updated_at(client, db):
+    edited, archived, untouched = add_notes(db, "edited", "archived", "untouched")
+    before = {note.id: parse_time(get_note(client, note)["updated_at"]) for note in (edited, archived, untouched)}
+    
+    client.post("/api/notes/bulk", json={"operations": [
+        {"op": "update", "id": str(edited.id), "title": "renamed"},
+        {"op": "archive", "id": str(archived.id)},
+    ]})
+    
+    assert parse_time(get_note(client, edited)["updated_at"]) > before[edited.id]
+    assert parse_time(get_note(client, archived)["updated_at"]) > before[archived.id]
+    assert parse_time(get_note(client, untouched)["updated_at"]) == before[untouched.id]
+
+
+def test_bulk_rejects_a_note_in_two_operations(client, db):
+    note, = add_notes(db, "twice")
+    
+    response = client.post("/api/notes/bulk", json={"operations": [
+        {"op": "update", "id": str(note.id), "title": "renamed"},
+        {"op": "delete", "id": str(note.id)},
+    ]})
+    
+    assert response.status_code == 400
+    assert str(note.id) in response.json()["detail"]
+    assert get_note(client, note)["title"] == "twice"
+
+
+def category_names(client, note) -> list:
+    return sorted(category["name"] for category in get_note(client, note)["categories"])
+
+
+def test_bulk_categories_add_remove_replace(client, db):
+    first, second = add_notes(db, "first", "second")
+    work, home, travel = add_categories(db, "Work", "Home", "Travel")
+    missing = uuid4()
+    note_ids = [str(first.id), str(second.id), str(missing)]
+    
+    def assign(category_ids, mode):
+        response = client.post("/api/notes/bulk/categories", json={
+            "note_ids": note_ids, "category_ids": [str(category.id) for category in category_ids], "mode": mode,
+        })
+        assert response.status_code == 200
+        return response.json()
+    
+    added = assign([work, home], "add")
+    assert (added["notes_matched"], added["links_added"], added["links_removed"]) == (2, 4, 0)
+    assert added["missing_note_ids"] == [str(missing)]
+    assert category_names(client, first) == category_names(client, second) == ["Home", "Work"]
+    
+    # Adding existing links is a no-op
+    assert assign([work], "add")["links_added"] == 0
+    
+    removed = assign([home], "remove")
+    assert (removed["links_added"], removed["links_removed"]) == (0, 2)
+    assert category_names(client, first) == ["Work"]
+    
+    replaced = assign([travel], "replace")
+    assert (replaced["links_added"], replaced["links_removed"]) == (2, 2)
+    assert category_names(client, first) == category_names(client, second) == ["Travel"]
+    
+    cleared = assign([], "replace")
+    assert (cleared["links_added"], cleared["links_removed"]) == (0, 2)
+    assert category_names(client, first) == []
+
+
+def test_bulk_categories_require_existing_categories(client, db):
+    note, = add_notes(db, "note")
+    
+    response = client.post("/api/notes/bulk/categories", json={
+        "note_ids": [str(note.id)], "category_ids": [str(uuid4())], "mode": "add",
+    })
+    
+    assert response.status_code == 404
+    assert category_names(client, note) == []
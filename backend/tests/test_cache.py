@@ -0,0 +1,23 @@
+from cache import MemoryCache, read_through
+
+
+def test_load_invalidated_midway_is_not_cached():
+    cache = MemoryCache()
+    
+    def load_then_write() -> str:
+        # A write commits and invalidates the key while the old value is loaded
+        cache.delete("note:1")
+        return "old"
+    
+    assert read_through(cache, "note:1", str, load_then_write) == "old"
+    assert cache.get("note:1") is None
+    assert read_through(cache, "note:1", str, lambda: "new") == "new"
+    assert cache.get("note:1") == '"new"'
+
+
+def test_size_counts_utf8_bytes():
+    cache = MemoryCache(max_bytes=10)
+    cache.set("a", "é" * 4)
+    assert cache.stats()["bytes"] == 8
+    cache.set("b", "é" * 6)
+    assert cache.get("b") is None
@@ -0,0 +1,78 @@
+"""
+The category counters must match the links after overlapping writes.
+
+Each case starts one write in a thread and holds it after it computed its
+counter deltas, starts a second write on the same note, then lets the
+first one commit.
+"""
+import threading
+import time
+from typing import Callable
+
+import pytest
+
+from config.database import SessionLocal
+from config.settings import settings
+from models.category import Category
+from models.note import Note
+from repositories.category_repository import CategoryRepository
+from repositories.note_repository import NoteRepository
+
+# How long the first write holds its transaction open, so the second one
+# reaches its reads (or blocks on the note lock) meanwhile
+HOLD_SECONDS = 0.3
+
+Write = Callable[[NoteRepository, Note], object]
+
+OVERLAPPING_WRITES = {
+    "delete twice": (
+        lambda notes, note: notes.delete(note.id),
+        lambda notes, note: notes.delete(note.id),
+    ),
+    "archive, then bulk archive": (
+        lambda notes, note: notes.archive(note.id),
+        lambda notes, note: notes.bulk_apply(archive_ids=[note.id]),
+    ),
+    "bulk replace, then remove": (
+        lambda notes, note: notes.set_categories([note.id], [], mode="replace"),
+        lambda notes, note: notes.remove_category(note.id, note.categories[0]),
+    ),
+}
+
+
+def counts(db, from_counters: bool):
+    stmt = CategoryRepository.with_counts_statement(from_counters)
+    return {category.name: (active, archived) for category, active, archived in db.execute(stmt)}
+
+
+@pytest.mark.parametrize("first, second", OVERLAPPING_WRITES.values(), ids=list(OVERLAPPING_WRITES))
+def test_overlapping_writes_keep_counters_exact(db, monkeypatch, first: Write, second: Write):
+    monkeypatch.setattr(settings, "category_counters", True)
+    note = Note(title="shared", content="text", categories=[Category(name="Work", color="#123456")])
+    db.add(note)
+    db.commit()
+    CategoryRepository(db).rebuild_note_counts()
+    
+    counted = threading.Event()
+    flush_counters = NoteRepository._flush_counters
+    
+    def hold_first_flush(self, deltas):
+        if threading.current_thread() is not threading.main_thread() and not counted.is_set():
+            counted.set()
+            time.sleep(HOLD_SECONDS)
+        flush_counters(self, deltas)
+    
+    monkeypatch.setattr(NoteRepository, "_flush_counters", hold_first_flush)
+    
+    def run(write: Write) -> None:
+        with SessionLocal() as session:
+            write(NoteRepository(session), session.get(Note, note.id))
+    
+    thread = threading.Thread(target=run, args=(first,))
+    thread.start()
+    assert counted.wait(5)
+    run(second)
+    thread.join()
+    
+    db.expire_all()
+    assert counts(db, from_counters=True) == counts(db, from_counters=False)
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from config.settings import settings
+from models.note import Note
+from models.note_deletion import NoteDeletion
+from services.note_service import NoteService
+
+
+def add_note(db, title: str, age: float) -> Note:
+    """Commit a note whose transaction started `age` seconds ago (updated_at = its now())"""
+    written_at = datetime.utcnow() - timedelta(seconds=age)
+    note = Note(title=title, content="", created_at=written_at, updated_at=written_at)
+    db.add(note)
+    db.commit()
+    return note
+
+
+def add_tombstone(db, age: float) -> NoteDeletion:
+    tombstone = NoteDeletion(note_id=uuid4(), deleted_at=datetime.utcnow() - timedelta(seconds=age))
+    db.add(tombstone)
+    db.commit()
+    return tombstone
+
+
+def test_changes_feed_picks_up_late_commits(db, monkeypatch):
+    monkeypatch.setattr(settings, "changes_max_txn_lag", 80.0)
+    add_note(db, "old", age=120)
+    add_note(db, "recent", age=70)
+    
+    first = NoteService(db).get_changes()
+    assert [note["title"] for note in first["notes"]] == ["old"]
+    
+    # Started before "recent" was written, but committed after the first sync
+    add_note(db, "late", age=100)
+    second = NoteService(db).get_changes(since=first["next_token"])
+    assert [note["title"] for note in second["notes"]] == ["late"]
+    
+    monkeypatch.setattr(settings, "changes_max_txn_lag", 0.0)
+    third = NoteService(db).get_changes(since=second["next_token"])
+    assert [note["title"] for note in third["notes"]] == ["recent"]
+
+
+def test_changes_feed_picks_up_late_tombstones(db, monkeypatch):
+    monkeypatch.setattr(settings, "changes_max_txn_lag", 80.0)
+    old = add_tombstone(db, age=120)
+    recent = add_tombstone(db, age=70)
+    
+    first = NoteService(db).get_changes()
+    assert [row["id"] for row in first["deleted"]] == [old.note_id]
+    
+    late = add_tombstone(db, age=100)
+    second = NoteService(db).get_changes(since=first["next_token"])
+    assert [row["id"] for row in second["deleted"]] == [late.note_id]
+    
+    monkeypatch.setattr(settings, "changes_max_txn_lag", 0.0)
+    third = NoteService(db).get_changes(since=second["next_token"])
+    assert [row["id"] for row in third["deleted"]] == [recent.note_id]
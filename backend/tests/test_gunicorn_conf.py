@@ -0,0 +1,46 @@
+"""
+gunicorn.conf.py adjusts the per-process settings when it starts several
+workers. Each case loads it in a fresh interpreter, as gunicorn does.
+"""
+import os
+import subprocess
+import sys
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints the settings gunicorn would fork with
+PROBE = """
+import runpy
+from config.settings import settings
+runpy.run_path("gunicorn.conf.py")
+print(settings.cache_backend, settings.events_backend)
+"""
+
+
+def load_config(**env: str) -> subprocess.CompletedProcess:
+    child_env = {key: value for key, value in os.environ.items() if key not in ("CACHE_BACKEND", "EVENTS_BACKEND")}
+    child_env.update(env)
+    return subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=child_env, capture_output=True, text=True
+    )
+
+
+def test_several_workers_share_events_through_postgres():
+    result = load_config(WEB_WORKERS="2", DATABASE_URL="postgresql://app@db/notes")
+    assert result.stdout.split() == ["none", "postgres"]
+
+
+def test_several_workers_refuse_in_process_events():
+    for env in (
+        {"DATABASE_URL": "sqlite:///notes.db"},
+        {"DATABASE_URL": "postgresql://app@db/notes", "EVENTS_BACKEND": "memory"},
+    ):
+        result = load_config(WEB_WORKERS="2", **env)
+        assert result.returncode != 0
+        assert "EVENTS_BACKEND=memory" in result.stderr
+
+
+def test_one_worker_keeps_the_defaults():
+    result = load_config(WEB_WORKERS="1", DATABASE_URL="sqlite:///notes.db")
+    assert result.stdout.split() == ["memory", "memory"]
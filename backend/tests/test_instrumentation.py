@@ -0,0 +1,37 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from config.instrumentation import RequestStats
+from config.settings import settings
+from main import app
+from repositories.note_repository import NoteRepository
+
+
+def test_repeated_statements_skip_writes_and_chunked_lookups():
+    stats = RequestStats("request")
+    stats.statements.update({
+        "SELECT categories.id FROM categories WHERE categories.id = ?": 12,
+        "SELECT notes.id FROM notes WHERE notes.id IN (?, ?)": 12,
+        "UPDATE notes SET is_archived=? WHERE notes.id IN (?, ?)": 12,
+        "SELECT 1": 3,
+    })
+    stats.chunked.add("SELECT notes.id FROM notes WHERE notes.id IN (?, ?)")
+    
+    assert stats.repeated_statements(10) == [("SELECT categories.id FROM categories WHERE categories.id = ?", 12)]
+
+
+def test_chunked_bulk_lookups_are_not_reported(db, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "category_counters", True)
+    monkeypatch.setattr(NoteRepository, "BULK_CHUNK_SIZE", 1)
+    with TestClient(app) as client:
+        operations = [{"op": "create", "title": f"note {index}", "content": "text"} for index in range(2 * settings.n_plus_one_threshold)]
+        created = client.post("/api/notes/bulk", json={"operations": operations}).json()["results"]
+        
+        with caplog.at_level(logging.WARNING, logger="config.instrumentation"):
+            response = client.post("/api/notes/bulk", json={"operations": [
+                {"op": "archive", "id": result["id"]} for result in created
+            ]})
+    
+    assert response.json()["succeeded"] == len(created)
+    assert [record for record in caplog.records if "N+1" in record.getMessage()] == []
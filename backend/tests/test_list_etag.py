@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from main import app
+from models.note import Note
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as client:
+        yield client
+
+
+def list_etag(client, **params) -> str:
+    response = client.get("/api/notes", params=params)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+def test_list_etag_changes_with_every_write(client):
+    etag = list_etag(client)
+    note_id = client.post("/api/notes", json={"title": "first", "content": "text"}).json()["id"]
+    
+    writes = [
+        lambda: client.post("/api/notes", json={"title": "second", "content": "text"}),
+        lambda: client.put(f"/api/notes/{note_id}", json={"content": "edited"}),
+        lambda: client.patch(f"/api/notes/{note_id}/archive"),
+    ]
+    for write in writes:
+        stale = list_etag(client)
+        assert client.get("/api/notes", headers={"If-None-Match": stale}).status_code == 304
+        assert write().status_code < 300
+        assert list_etag(client) not in (stale, etag)
+        assert client.get("/api/notes", headers={"If-None-Match": stale}).status_code == 200
+
+
+def test_list_etag_waits_for_the_transaction_lag(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "changes_max_txn_lag", 60.0)
+    written_at = datetime.utcnow() - timedelta(seconds=120)
+    db.add(Note(title="settled", content="", created_at=written_at, updated_at=written_at))
+    db.commit()
+    etag = list_etag(client)
+    
+    # A transaction that started 30 seconds ago may still be followed by
+    # one that started earlier and commits later, so no ETag yet
+    written_at = datetime.utcnow() - timedelta(seconds=30)
+    db.add(Note(title="recent", content="", created_at=written_at, updated_at=written_at))
+    db.commit()
+    response = client.get("/api/notes", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert [note["title"] for note in response.json()["notes"]] == ["recent", "settled"]
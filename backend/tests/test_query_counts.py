@@ -0,0 +1,132 @@
+"""
+Exact number of SQL statements each endpoint issues, so regressions such as
+a reintroduced refresh() after commit fail the suite.
+
+Every scenario runs through the app in-process, in order, against one
+database per counters setting. The note has a category attached while it
+is archived, unarchived and deleted, so the counter maintenance runs.
+PostgreSQL counts apply when TEST_DATABASE_URL points at PostgreSQL.
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config.database import SessionLocal, get_async_engine, get_engine
+from config.instrumentation import QueryCounter
+from config.settings import settings
+from main import app
+from repositories.category_repository import CategoryRepository
+from tests.conftest import reset_database
+
+
+# Statements per endpoint. PostgreSQL wraps UPDATE ... RETURNING in a CTE so
+# categories come back in the same statement; other dialects need one
+# selectin query for them. List responses spend one extra statement on the
+# COUNT/MAX(updated_at) behind their ETag; conditional GETs stop there.
+# Deleting a note also writes its tombstone for the changes feed.
+STATEMENTS: Dict[str, Dict[str, int]] = {
+    "get note (not modified)": {"default": 1},
+    "list notes (not modified)": {"default": 1},
+    "create note": {"default": 1},
+    "get note": {"default": 1},
+    "list notes": {"default": 2},
+    "list notes (summary)": {"default": 2},
+    "list notes (compact)": {"default": 3},
+    "update note": {"postgresql": 1, "default": 2},
+    "add category to note": {"postgresql": 3, "default": 4},
+    "archive note": {"postgresql": 1, "default": 2},
+    "unarchive note": {"postgresql": 1, "default": 2},
+    "remove category from note": {"postgresql": 3, "default": 4},
+    "list categories with counts": {"default": 1},
+    "update category": {"default": 3},
+    "delete note": {"default": 2},
+    "note changes": {"default": 2},
+    "create category": {"default": 2},
+    "delete category": {"default": 2},
+}
+
+# Extra statements with CATEGORY_COUNTERS=true: the note row lock and the
+# counter upsert, plus the link count taken before a linked note is deleted
+# (archiving reuses the categories the UPDATE returned)
+COUNTER_STATEMENTS: Dict[str, int] = {
+    "add category to note": 2,
+    "archive note": 2,
+    "unarchive note": 2,
+    "remove category from note": 2,
+    "delete note": 3,
+}
+
+
+def expected(name: str, dialect: str, counters: bool) -> int:
+    statements = STATEMENTS[name]
+    count = statements.get(dialect, statements["default"])
+    if counters:
+        count += COUNTER_STATEMENTS.get(name, 0)
+    return count
+
+
+def scenarios(client: TestClient) -> List[Tuple[Optional[str], Callable]]:
+    """
+    Seed a note and a category and return the scenarios in the order they
+    must run; steps named None only prepare the next one and are not counted.
+    """
+    note = client.post("/api/notes", json={"title": "Seed", "content": "Seed note"}).json()
+    category = client.post("/api/categories", json={"name": "Seed category"}).json()
+    note_url = f"/api/notes/{note['id']}"
+    category_url = f"/api/categories/{category['id']}"
+    link_url = f"{note_url}/categories/{category['id']}"
+    note_etag = client.get(note_url).headers["ETag"]
+    list_etag = client.get("/api/notes").headers["ETag"]
+    
+    return [
+        ("get note (not modified)", lambda: client.get(note_url, headers={"If-None-Match": note_etag})),
+        ("list notes (not modified)", lambda: client.get("/api/notes", headers={"If-None-Match": list_etag})),
+        ("create note", lambda: client.post("/api/notes", json={"title": "New", "content": "Body"})),
+        ("get note", lambda: client.get(note_url)),
+        ("list notes", lambda: client.get("/api/notes")),
+        ("list notes (summary)", lambda: client.get("/api/notes", params={"view": "summary"})),
+        ("list notes (compact)", lambda: client.get("/api/notes", params={"include": "categories"})),
+        ("update note", lambda: client.put(note_url, json={"title": "Renamed"})),
+        ("add category to note", lambda: client.post(link_url)),
+        ("archive note", lambda: client.patch(f"{note_url}/archive")),
+        ("unarchive note", lambda: client.patch(f"{note_url}/unarchive")),
+        ("remove category from note", lambda: client.delete(link_url)),
+        ("list categories with counts", lambda: client.get("/api/categories", params={"with_counts": "true"})),
+        ("update category", lambda: client.put(category_url, json={"name": "Renamed category"})),
+        (None, lambda: client.post(link_url)),
+        ("delete note", lambda: client.delete(note_url)),
+        ("note changes", lambda: client.get("/api/notes/changes")),
+        ("create category", lambda: client.post("/api/categories", json={"name": "Another"})),
+        ("delete category", lambda: client.delete(category_url)),
+    ]
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["plain", "counters"])
+def statement_counts(request) -> Iterator[Tuple[str, bool, Dict[str, int]]]:
+    """(dialect, counters enabled, statements per scenario), running every scenario once"""
+    counters = request.param
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(settings, "category_counters", counters)
+    reset_database()
+    if counters:
+        with SessionLocal() as db:
+            CategoryRepository(db).rebuild_note_counts()
+    
+    client = TestClient(app)
+    engine = get_async_engine().sync_engine if settings.database_mode == "async" else get_engine()
+    counts = {}
+    for name, call in scenarios(client):
+        with QueryCounter(engine) as counter:
+            response = call()
+        assert response.status_code < 400, f"{name}: {response.status_code} {response.text}"
+        if name is not None:
+            counts[name] = counter.count
+    yield engine.dialect.name, counters, counts
+    monkeypatch.undo()
+
+
+@pytest.mark.parametrize("name", list(STATEMENTS))
+def test_statement_count(statement_counts, name):
+    dialect, counters, counts = statement_counts
+    assert counts[name] == expected(name, dialect, counters)
@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.note import Note
+from repositories.note_repository import NoteRepository
+
+
+@pytest.fixture
+def notes(db):
+    db.add_all([
+        Note(title="Grocery list", content="milk, eggs and 100% rye bread"),
+        Note(title="Meeting", content="Discuss the grocery budget"),
+        Note(title="Snake_case names", content="style guide"),
+    ])
+    db.commit()
+
+
+def titles(results):
+    return [note.title for note, _ in results]
+
+
+def test_search_without_full_text_index_matches_terms(db, notes, monkeypatch):
+    monkeypatch.setattr(NoteRepository, "_dialect_name", lambda self: "mssql")
+    repository = NoteRepository(db)
+    
+    # Title matches rank above content-only matches
+    assert titles(repository.search("GROCERY")) == ["Grocery list", "Meeting"]
+    # Every term has to match
+    assert titles(repository.search("grocery budget")) == ["Meeting"]
+    # % and _ are matched literally
+    assert titles(repository.search("100%")) == ["Grocery list"]
+    assert titles(repository.search("e_c")) == ["Snake_case names"]
+    assert titles(repository.search("e%c")) == []
+
+
+def test_search_with_full_text_index_skips_blank_queries(db, notes):
+    repository = NoteRepository(db)
+    
+    assert titles(repository.search("rye")) == ["Grocery list"]
+    assert repository.search("   ") == []
+    
+    with TestClient(app) as client:
+        assert client.get("/api/notes/search", params={"q": " "}).status_code == 422
+        assert client.get("/api/notes/search", params={"q": " rye "}).json()["results"][0]["title"] == "Grocery list"
+
+
+def test_search_without_full_text_index_skips_blank_queries(db, notes, monkeypatch):
+    monkeypatch.setattr(NoteRepository, "_dialect_name", lambda self: "mssql")
+    
+    assert NoteRepository(db).search(" \t ") == []
@@ -0,0 +1,61 @@
+"""
+Importing the app must stay cheap: no engine, no database driver, no code
+for other modes, and little import time on top of the frameworks.
+
+Each check runs in a fresh interpreter with the test environment.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from config.settings import settings
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported only once a connection is made, or for another configuration
+LAZY_MODULES = ("psycopg2", "asyncpg", "aiosqlite", "events.postgres")
+SYNC_MODE_LAZY_MODULES = ("routers.async_notes", "routers.async_categories")
+
+# Time importing the app may add on top of FastAPI, pydantic and SQLAlchemy,
+# as a multiple of their own import time in the same process, so slower CI
+# machines scale both sides (about 0.4 on a development VM)
+IMPORT_BUDGET_RATIO = float(os.environ.get("STARTUP_IMPORT_BUDGET_RATIO", "1.0"))
+
+# Runs in the child interpreter; prints what importing main did as JSON
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import fastapi, fastapi.routing, pydantic, pydantic_settings, sqlalchemy, sqlalchemy.orm, sqlalchemy.ext.asyncio
+frameworks = time.perf_counter()
+import main
+imported = time.perf_counter()
+from config import database
+print(json.dumps({
+    "frameworks_ms": (frameworks - started) * 1000,
+    "app_ms": (imported - frameworks) * 1000,
+    "engines": [name for name in ("_engine", "_async_engine") if getattr(database, name) is not None],
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def probe() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=os.environ, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_creates_no_engine_and_loads_no_driver():
+    result = probe()
+    lazy = LAZY_MODULES + (SYNC_MODE_LAZY_MODULES if settings.database_mode != "async" else ())
+    assert result["engines"] == []
+    assert [module for module in lazy if module in result["modules"]] == []
+
+
+def test_import_time_within_budget():
+    # Best of three, so one slow run on a busy machine does not fail the test
+    ratio = min(run["app_ms"] / run["frameworks_ms"] for run in (probe() for _ in range(3)))
+    assert ratio <= IMPORT_BUDGET_RATIO
@@ -1,33 +1,127 @@
-import { useState, useEffect } from 'react';
-import { notesAPI } from '../services/api';
+import { useState, useEffect, useRef } from 'react';
+import { notesAPI, eventsAPI } from '../services/api';
 
-export const useNotes = (archived = null, categoryId = null) => {
+const PAGE_SIZE = 50;
+// Largest page the API returns
+const MAX_PAGE_SIZE = 500;
+// Coalesce bursts of change events (e.g. a bulk import) into one refresh
+const REFRESH_DELAY_MS = 500;
+
+// Resolve the category_ids of a compact list page against its categories map;
+// pages requested without categories are returned as they are
+const expandCategories = ({ notes, categories }) =>
+    categories ? notes.map(({ category_ids, ...note }) => ({
+        ...note,
+        categories: category_ids.map(id => categories[id]),
+    })) : notes;
+
+// includeCategories: the view renders the notes' categories
+export const useNotes = (archived = null, categoryId = null, { includeCategories = false } = {}) => {
     const [notes, setNotes] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
+    const loadedCount = useRef(0);
+    // Bumped whenever the list is reloaded, so pages requested for an
+    // earlier list are dropped instead of appended to the new one
+    const listVersion = useRef(0);
+    // Cursor of the page being loaded, so a second click does not load it again
+    const pendingCursor = useRef(null);
+    // Latest next_cursor, read by clicks handled before the state update renders
+    const cursorRef = useRef(null);
+
+    const setCursor = (cursor) => {
+        cursorRef.current = cursor;
+        setNextCursor(cursor);
+    };
+
+    const getPage = (cursor = null, limit = PAGE_SIZE) =>
+        notesAPI.getAll(archived, categoryId, cursor, limit, { includeCategories });
+
+    useEffect(() => {
+        loadedCount.current = notes.length;
+    }, [notes]);
 
     const fetchNotes = async () => {
+        const version = ++listVersion.current;
+        pendingCursor.current = null;
         try {
             setLoading(true);
-            const response = await notesAPI.getAll(archived, categoryId);
-            setNotes(response.data);
+            const response = await getPage();
+            if (version !== listVersion.current) return;
+            setNotes(expandCategories(response.data));
+            setCursor(response.data.next_cursor);
             setError(null);
         } catch (err) {
+            if (version !== listVersion.current) return;
             setError(err.message);
             console.error('Error fetching notes:', err);
         } finally {
-            setLoading(false);
+            if (version === listVersion.current) setLoading(false);
+        }
+    };
+
+    const loadMore = async () => {
+        const cursor = cursorRef.current;
+        if (!cursor || pendingCursor.current !== null) return;
+        const version = listVersion.current;
+        pendingCursor.current = cursor;
+        try {
+            setLoading(true);
+            const response = await getPage(cursor);
+            if (version !== listVersion.current) return;
+            setNotes(prev => [...prev, ...expandCategories(response.data)]);
+            setCursor(response.data.next_cursor);
+            setError(null);
+        } catch (err) {
+            if (version !== listVersion.current) return;
+            setError(err.message);
+            console.error('Error fetching notes:', err);
+        } finally {
+            if (pendingCursor.current === cursor) pendingCursor.current = null;
+            if (version === listVersion.current) setLoading(false);
+        }
+    };
+
+    // Reload as many notes as are shown, without the loading state
+    const refresh = async () => {
+        const version = ++listVersion.current;
+        pendingCursor.current = null;
+        try {
+            const limit = Math.min(MAX_PAGE_SIZE, Math.max(PAGE_SIZE, loadedCount.current));
+            const response = await getPage(null, limit);
+            if (version !== listVersion.current) return;
+            setNotes(expandCategories(response.data));
+            setCursor(response.data.next_cursor);
+        } catch (err) {
+            console.error('Error refreshing notes:', err);
+        } finally {
+            // Settles a load this refresh superseded
+            if (version === listVersion.current) setLoading(false);
         }
     };
 
     useEffect(() => {
         fetchNotes();
-    }, [archived, categoryId]);
+    }, [archived, categoryId, includeCategories]);
+
+    // Changes made in other tabs and by other clients arrive as events
+    useEffect(() => {
+        let timer = null;
+        const unsubscribe = eventsAPI.subscribe(() => {
+            clearTimeout(timer);
+            timer = setTimeout(refresh, REFRESH_DELAY_MS);
+        });
+        return () => {
+            clearTimeout(timer);
+            unsubscribe();
+        };
+    }, [archived, categoryId, includeCategories]);
 
     const createNote = async (data) => {
         try {
             const response = await notesAPI.create(data);
-            setNotes([response.data, ...notes]);
+            setNotes(prev => [response.data, ...prev]);
             return response.data;
         } catch (err) {
             setError(err.message);
@@ -38,7 +132,7 @@ export const useNotes = (archived = null, categoryId = null) => {
     const updateNote = async (id, data) => {
         try {
             const response = await notesAPI.update(id, data);
-            setNotes(notes.map(note => note.id === id ? response.data : note));
+            setNotes(prev => prev.map(note => note.id === id ? response.data : note));
             return response.data;
         } catch (err) {
             setError(err.message);
@@ -49,7 +143,7 @@ export const useNotes = (archived = null, categoryId = null) => {
     const deleteNote = async (id) => {
         try {
             await notesAPI.delete(id);
-            setNotes(notes.filter(note => note.id !== id));
+            setNotes(prev => prev.filter(note => note.id !== id));
         } catch (err) {
             setError(err.message);
             throw err;
@@ -59,7 +153,7 @@ export const useNotes = (archived = null, categoryId = null) => {
     const archiveNote = async (id) => {
         try {
             await notesAPI.archive(id);
-            setNotes(notes.filter(note => note.id !== id));
+            setNotes(prev => prev.filter(note => note.id !== id));
         } catch (err) {
             setError(err.message);
             throw err;
@@ -69,7 +163,7 @@ export const useNotes = (archived = null, categoryId = null) => {
     const unarchiveNote = async (id) => {
         try {
             await notesAPI.unarchive(id);
-            setNotes(notes.filter(note => note.id !== id));
+            setNotes(prev => prev.filter(note => note.id !== id));
         } catch (err) {
             setError(err.message);
             throw err;
@@ -79,7 +173,7 @@ export const useNotes = (archived = null, categoryId = null) => {
     const addCategoryToNote = async (noteId, categoryId) => {
         try {
             const response = await notesAPI.addCategory(noteId, categoryId);
-            setNotes(notes.map(note => note.id === noteId ? response.data : note));
+            setNotes(prev => prev.map(note => note.id === noteId ? response.data : note));
             return response.data;
         } catch (err) {
             setError(err.message);
@@ -90,7 +184,7 @@ export const useNotes = (archived = null, categoryId = null) => {
     const removeCategoryFromNote = async (noteId, categoryId) => {
         try {
             const response = await notesAPI.removeCategory(noteId, categoryId);
-            setNotes(notes.map(note => note.id === noteId ? response.data : note));
+            setNotes(prev => prev.map(note => note.id === noteId ? response.data : note));
             return response.data;
         } catch (err) {
             setError(err.message);
@@ -102,7 +196,9 @@ export const useNotes = (archived = null, categoryId = null) => {
         notes,
         loading,
         error,
+        hasMore: nextCursor !== null,
         fetchNotes,
+        loadMore,
         createNote,
         updateNote,
         deleteNote,
@@ -11,13 +11,15 @@ export const ActiveNotes = () => {
         notes,
         loading,
         error,
+        hasMore,
+        loadMore,
         createNote,
         updateNote,
         deleteNote,
         archiveNote,
         addCategoryToNote,
         removeCategoryFromNote,
-    } = useNotes(false, selectedCategory);
+    } = useNotes(false, selectedCategory, { includeCategories: true });
 
     const {
         categories,
@@ -111,6 +113,14 @@ export const ActiveNotes = () => {
                                 onRemoveCategory={removeCategoryFromNote}
                             />
                         ))}
+                        {hasMore && !loading && (
+                            <button
+                                onClick={loadMore}
+                                className="w-full py-3 bg-white rounded-lg shadow-md text-gray-700 font-medium hover:bg-gray-50 transition-colors"
+                            >
+                                Load more
+                            </button>
+                        )}
                     </div>
                 </div>
 
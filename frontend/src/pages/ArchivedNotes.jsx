@@ -7,12 +7,14 @@ export const ArchivedNotes = () => {
         notes,
         loading,
         error,
+        hasMore,
+        loadMore,
         updateNote,
         deleteNote,
         unarchiveNote,
         addCategoryToNote,
         removeCategoryFromNote,
-    } = useNotes(true);
+    } = useNotes(true, null, { includeCategories: true });
 
     const { categories } = useCategories();
 
@@ -57,6 +59,14 @@ export const ArchivedNotes = () => {
                         onRemoveCategory={removeCategoryFromNote}
                     />
                 ))}
+                {hasMore && !loading && (
+                    <button
+                        onClick={loadMore}
+                        className="w-full py-3 bg-white rounded-lg shadow-md text-gray-700 font-medium hover:bg-gray-50 transition-colors"
+                    >
+                        Load more
+                    </button>
+                )}
             </div>
         </div>
     );
@@ -9,12 +9,21 @@ const api = axios.create({
     },
 });
 
+// Note fields of list pages requested without their categories
+const NOTE_FIELDS = 'title,content,id,is_archived,created_at,updated_at';
+
 // Notes API
 export const notesAPI = {
-    getAll: (archived = null, categoryId = null) => {
-        const params = {};
+    // Categories are opt-in: with includeCategories the page uses the compact
+    // format (notes carry category_ids, categories come once per page),
+    // without it the notes' categories are not read at all
+    getAll: (archived = null, categoryId = null, cursor = null, limit = 50, { includeCategories = false } = {}) => {
+        const params = { limit };
+        if (includeCategories) params.include = 'categories';
+        else params.fields = NOTE_FIELDS;
         if (archived !== null) params.archived = archived;
         if (categoryId) params.category_id = categoryId;
+        if (cursor) params.cursor = cursor;
         return api.get('/notes', { params });
     },
 
@@ -50,4 +59,15 @@ export const categoriesAPI = {
     delete: (id) => api.delete(`/categories/${id}`),
 };
 
+// Change events (server-sent events). onEvent receives each parsed event,
+// including "resync" after events may have been missed. Returns a function
+// that closes the stream.
+export const eventsAPI = {
+    subscribe: (onEvent) => {
+        const source = new EventSource(`${API_URL}/events`);
+        source.onmessage = (message) => onEvent(JSON.parse(message.data));
+        return () => source.close();
+    },
+};
+
 export default api;
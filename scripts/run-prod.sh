@@ -0,0 +1,29 @@
+#!/bin/bash
+
+# Notes Application - Production Server
+# Applies migrations and serves the API with gunicorn + uvicorn workers.
+# Worker count, keep-alive, recycling etc. come from the WEB_* settings
+# (see backend/gunicorn.conf.py). Expects the backend dependencies to be
+# installed (see scripts/run.sh) and the database to be reachable.
+
+set -e  # Exit on error
+
+# Colors for output
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+NC='\033[0m' # No Color
+
+# Default environment
+export ENVIRONMENT=${1:-prod}
+
+cd "$(dirname "$0")/../backend"
+
+if [ -d "venv" ]; then
+    source venv/bin/activate || source venv/Scripts/activate
+fi
+
+echo -e "${YELLOW}Running database migrations...${NC}"
+alembic upgrade head
+
+echo -e "${GREEN}Starting production server (environment: $ENVIRONMENT)...${NC}"
+exec gunicorn -c gunicorn.conf.py main:app
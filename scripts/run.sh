@@ -110,7 +110,7 @@ echo -e "${GREEN}✓ Backend setup complete${NC}"
 
 # Start backend in background
 echo -e "\n${YELLOW}Starting backend server...${NC}"
-uvicorn main:app --host 0.0.0.0 --port 8000 --reload &
+uvicorn main:app --host 0.0.0.0 --port 8000 --reload --timeout-graceful-shutdown 10 &
 BACKEND_PID=$!
 echo -e "${GREEN}✓ Backend running on http://localhost:8000${NC}"
 echo -e "${GREEN}  API Docs: http://localhost:8000/api/docs${NC}"